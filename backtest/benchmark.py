@@ -0,0 +1,112 @@
+import sys
+import os
+import argparse
+import time
+from datetime import datetime, timezone, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from core.bar_store import BarStore, STORE_DIR
+from backtest.data_loader import load_data
+from backtest.run_backtest import run_backtest
+
+
+LOOKBACK_DAYS = 6
+
+
+def compare(symbol, m5_df, h1_df, pip_size, repeat=1) -> dict:
+    """
+    Times run_backtest(columnar=True) against the iloc loop
+    (columnar=False) on the same bars. Best of `repeat` runs each;
+    raises if the two trade histories differ.
+    """
+    seconds = {}
+    trades = {}
+
+    for columnar in (True, False):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            history = run_backtest(symbol, m5_df, h1_df=h1_df, columnar=columnar, pip_size=pip_size)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        seconds[columnar] = best
+        trades[columnar] = [tuple(vars(position).items()) for position in history]
+
+    if trades[True] != trades[False]:
+        raise AssertionError("columnar and iloc loops produced different trades")
+
+    return {
+        "bars": len(m5_df),
+        "trades": len(trades[True]),
+        "columnar_seconds": seconds[True],
+        "iloc_seconds": seconds[False],
+        "speedup": seconds[False] / seconds[True] if seconds[True] else float("inf"),
+    }
+
+
+def synthetic_frames(start: datetime, days: int, seed: int = 0, price: float = 1.1):
+    """
+    Seeded random-walk M5 bars and their H1 resample, as load_data()
+    frames — same numbers on every machine. The first LOOKBACK_DAYS
+    are H1 lookback only.
+    """
+    rng = np.random.default_rng(seed)
+    count = days * 288
+
+    closes = price + np.cumsum(rng.normal(0, 0.0004, count))
+    opens = np.r_[price, closes[:-1]]
+    wicks = np.abs(rng.normal(0, 0.0003, (2, count)))
+
+    m5 = pd.DataFrame({
+        "time": pd.date_range(start, periods=count, freq="5min"),
+        "open": opens,
+        "high": np.maximum(opens, closes) + wicks[0],
+        "low": np.minimum(opens, closes) - wicks[1],
+        "close": closes,
+    })
+
+    h1 = m5.resample("1h", on="time").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last"}
+    ).reset_index()
+
+    m5 = m5[m5["time"] >= start + timedelta(days=LOOKBACK_DAYS)].reset_index(drop=True)
+    return h1, m5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar vs iloc run_backtest timing")
+    parser.add_argument("symbol", help="e.g. EURUSD")
+    parser.add_argument("start", help="YYYY-MM-DD")
+    parser.add_argument("end", help="YYYY-MM-DD")
+    parser.add_argument("--store", default=STORE_DIR, help="bar store root")
+    parser.add_argument("--synthetic", action="store_true", help="seeded random walk instead of stored bars")
+    parser.add_argument("--pip-size", type=float, default=0.0001)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc)
+    end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc)
+
+    if args.synthetic:
+        h1_df, m5_df = synthetic_frames(start - timedelta(days=LOOKBACK_DAYS), (end - start).days + LOOKBACK_DAYS)
+    else:
+        h1_df, m5_df = load_data(args.symbol, start - timedelta(days=LOOKBACK_DAYS), end, source=BarStore(args.store))
+        m5_df = m5_df[m5_df["time"] >= start].reset_index(drop=True)
+
+    result = compare(args.symbol, m5_df, h1_df, args.pip_size, args.repeat)
+
+    print(
+        f"✅ {result['bars']} M5 bars, {result['trades']} identical trades — "
+        f"columnar {result['columnar_seconds']:.2f}s, iloc {result['iloc_seconds']:.2f}s "
+        f"({result['speedup']:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,29 @@
-import MetaTrader5 as mt5
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 
-def load_data(symbol, start_date, end_date):
+from core import broker as mt5
+from core.bar_store import TIMEFRAME_H1, TIMEFRAME_M5
+
+
+def load_data(symbol, start_date, end_date, source=None):
     """
     Returns (h1_df, m5_df)
+
+    source: anything with copy_rates_range() — the active broker
+    gateway (default: MT5 terminal or simulator) or a core.bar_store.BarStore for offline runs.
     """
-    h1 = mt5.copy_rates_range(
+    source = source or mt5
+
+    h1 = source.copy_rates_range(
         symbol,
-        mt5.TIMEFRAME_H1,
+        TIMEFRAME_H1,
         start_date,
         end_date
     )
 
-    m5 = mt5.copy_rates_range(
+    m5 = source.copy_rates_range(
         symbol,
-        mt5.TIMEFRAME_M5,
+        TIMEFRAME_M5,
         start_date,
         end_date
     )
@@ -0,0 +1,41 @@
+import sys
+import os
+import argparse
+from datetime import datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.bar_store import BarStore, STORE_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import bars into the local bar store")
+    parser.add_argument("symbol")
+    parser.add_argument("timeframe", help="M1, M5, H1, ...")
+    parser.add_argument("--csv", help="CSV file to import")
+    parser.add_argument("--sep", default=",", help="CSV separator (MT5 exports use a tab)")
+    parser.add_argument("--mt5-from", help="YYYY-MM-DD, dump from a running MT5 terminal")
+    parser.add_argument("--mt5-to", help="YYYY-MM-DD")
+    parser.add_argument("--root", default=STORE_DIR)
+    args = parser.parse_args()
+
+    store = BarStore(args.root)
+
+    if args.csv:
+        count = store.import_csv(args.symbol, args.timeframe, args.csv, sep=args.sep)
+    elif args.mt5_from and args.mt5_to:
+        count = store.import_mt5(
+            args.symbol,
+            args.timeframe,
+            datetime.fromisoformat(args.mt5_from).replace(tzinfo=timezone.utc),
+            datetime.fromisoformat(args.mt5_to).replace(tzinfo=timezone.utc),
+        )
+    else:
+        parser.error("pass --csv or --mt5-from/--mt5-to")
+
+    print(f"✅ Imported {count} {args.timeframe} bars for {args.symbol}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from core.bar_store import RATES_DTYPE
+from core.h1_liquidity_builder import H1LiquidityBuilder
+from core.h1_liquidity_tracker import H1LiquidityTracker, SECONDS_PER_DAY, SECONDS_PER_HOUR, utc_day
+from core.liquidity_book import LiquidityBook
+
+
+class PointInTimeLiquidity:
+    """
+    Rolling point-in-time H1 liquidity for backtests.
+
+    at(time) returns the levels H1LiquidityBuilder.build(reference_date=time)
+    would have produced on that UTC day, using only H1 bars closed by
+    `time`. build() also reads the day's 00:00 bar, so from 00:00 until
+    that bar closes the levels are built without it. Levels are
+    maintained incrementally by H1LiquidityTracker as the H1 stream
+    advances — the builder is never re-run against the data source.
+
+    mitigate_intraday=True also lets each closed H1 bar mitigate the
+    levels it crossed, as the live tracker does.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        h1_rates,
+        builder: H1LiquidityBuilder | None = None,
+        mitigate_intraday: bool = False,
+    ):
+        self.rates = to_rates(h1_rates)
+        self.times = self.rates["time"]
+
+        self.tracker = H1LiquidityTracker(
+            symbol,
+            builder=builder,
+            mitigate_intraday=mitigate_intraday
+        )
+
+        self._next = 0
+        self._valid_until = None    # epoch of the next H1 close or UTC midnight
+
+    def at(self, time) -> LiquidityBook:
+        now = int(time.timestamp())
+
+        # Nothing closes and no day rolls before _valid_until
+        if self._valid_until is not None and now < self._valid_until:
+            return self.tracker.levels
+
+        # Feed every H1 bar that has CLOSED by `now`
+        while (
+            self._next < len(self.times)
+            and self.times[self._next] + SECONDS_PER_HOUR <= now
+        ):
+            self.tracker.on_h1_bar_closed(self.rates[self._next])
+            self._next += 1
+
+        # New UTC day with no closed bar yet → roll at midnight
+        self.tracker.roll_to(utc_day(now))
+
+        self._valid_until = (now // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY
+        if self._next < len(self.times):
+            self._valid_until = min(self._valid_until, int(self.times[self._next]) + SECONDS_PER_HOUR)
+
+        return self.tracker.levels
+
+
+def to_rates(h1):
+    """
+    Accepts a copy_rates_range array or the load_data() H1 frame.
+    """
+    if not isinstance(h1, pd.DataFrame):
+        return np.asarray(h1)
+
+    rates = np.zeros(len(h1), dtype=RATES_DTYPE)
+
+    for name in RATES_DTYPE.names:
+        if name not in h1.columns:
+            continue
+
+        column = h1[name]
+        if name == "time" and pd.api.types.is_datetime64_any_dtype(column):
+            column = (column - pd.Timestamp(0, tz=column.dt.tz)) // pd.Timedelta(seconds=1)
+
+        rates[name] = column.to_numpy()
+
+    return rates
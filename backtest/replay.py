@@ -0,0 +1,209 @@
+import sys
+import os
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core import broker, clock, event_log
+from core.bar_store import BarStore, STORE_DIR
+from core.clock import VirtualClock
+from core.liquidity_event_state import LifecycleResolved
+from core.mt5_simulator import DEAL_ENTRY_OUT, MT5Simulator
+from core.news_blackout import in_news_blackout
+
+from backtest.metrics import summarize
+from live.market_data import MarketDataGateway
+from live.scheduler import LiveScheduler
+from live.symbol_engine import SymbolEngine
+
+
+class NullJournal:
+    """
+    Replays start fresh and persist nothing.
+    """
+
+    def load(self):
+        return None
+
+    def levels_loaded(self, levels):
+        pass
+
+    def level_changed(self, level):
+        pass
+
+    def lifecycle(self, active):
+        pass
+
+    def detector(self, name, state):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ReplayRuntime:
+    """
+    The live engine on recorded data, as fast as the CPU allows.
+
+    Same components and call order as live.runtime.LiveRuntime —
+    MarketDataGateway → SymbolEngine.poll → FlipExecutor.execute →
+    LifecycleResolved — but:
+      - MT5 is an MT5Simulator over the bar store (orders fill on its ticks)
+      - time is a VirtualClock; LiveScheduler wakeups jump instead of sleeping
+      - one thread, no queues: each poll's flips execute before the next poll
+
+    skip_idle=True also jumps over wakeups with no new tick: the engine
+    would see the exact same tick and bars there, so nothing can happen.
+    """
+
+    def __init__(
+        self,
+        symbols,
+        start: datetime,
+        end: datetime,
+        store: BarStore | None = None,
+        scheduler: LiveScheduler | None = None,
+        skip_idle: bool = True,
+        notify=None,
+        **simulator_options,
+    ):
+        self.symbols = list(symbols)
+        self.start = start
+        self.end = end
+        self.skip_idle = skip_idle
+
+        self.simulator = MT5Simulator(store or BarStore(), self.symbols, start, end, **simulator_options)
+        self.clock = VirtualClock(start, on_advance=self.simulator.advance_to)
+        self.scheduler = scheduler or LiveScheduler()
+        self.market_data = MarketDataGateway(self.symbols)
+
+        self.notifications = []
+        self.flips = []
+        self.polls = 0
+
+        self.engines = {
+            symbol: SymbolEngine(
+                symbol,
+                notify=notify or self.notifications.append,
+                journal=NullJournal(),
+                submit_flip=lambda ctx, symbol=symbol: self.flips.append((symbol, ctx)),
+            )
+            for symbol in self.symbols
+        }
+
+    # ─────────────────────────────────────────────
+    # ENTRY
+    # ─────────────────────────────────────────────
+    def run(self) -> dict:
+        broker.set_gateway(self.simulator)
+        clock.set_clock(self.clock)
+
+        started = time.perf_counter()
+        try:
+            for engine in self.engines.values():
+                engine.start(self.market_data)
+
+            while self.clock.now() < self.end:
+                self._step()
+        finally:
+            broker.set_gateway(None)
+            clock.set_clock(None)
+
+        return self._results(time.perf_counter() - started)
+
+    # ─────────────────────────────────────────────
+    # LOOP (one market-task iteration of LiveRuntime)
+    # ─────────────────────────────────────────────
+    def _step(self):
+        engines = list(self.engines.values())
+        now = self.clock.now()
+
+        if not in_news_blackout():
+            h1_due = {
+                e.symbol: e.liquidity.last_bar_time
+                for e in engines if e.liquidity.next_close_due(now)
+            }
+            snapshots = self.market_data.poll(h1_due)
+            self.polls += 1
+
+            for symbol, engine in self.engines.items():
+                snapshot = snapshots.get(symbol)
+                if snapshot is not None:
+                    engine.poll(now, snapshot)
+
+            self._execute_flips()
+
+        wakeup = self.scheduler.next_wakeup(now, engines)
+
+        if self.skip_idle:
+            next_tick = self.simulator.next_tick_time()
+            if next_tick is None:
+                wakeup = self.end
+            elif next_tick > wakeup:
+                wakeup = next_tick
+
+        # Never stall the loop on a wakeup in the past
+        self.clock.advance_to(min(max(wakeup, now + timedelta(seconds=1)), self.end))
+
+    def _execute_flips(self):
+        while self.flips:
+            symbol, ctx = self.flips.pop(0)
+            engine = self.engines[symbol]
+
+            reason = engine.flip_executor.execute(ctx)
+
+            if reason:
+                engine.bus.publish(LifecycleResolved(
+                    reason=reason,
+                    time=clock.utcnow()
+                ))
+
+    def _results(self, elapsed: float) -> dict:
+        closed = [d for d in self.simulator.deals if d.entry == DEAL_ENTRY_OUT]
+
+        return {
+            **summarize([d.reason for d in closed]),
+            "profit": sum(d.profit for d in closed),
+            "balance": self.simulator.balance,
+            "deals": self.simulator.deals,
+            "polls": self.polls,
+            "seconds": elapsed,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the live engine on stored bars")
+    parser.add_argument("symbols", help="comma-separated, e.g. EURUSDm,GBPUSDm")
+    parser.add_argument("start", help="YYYY-MM-DD")
+    parser.add_argument("end", help="YYYY-MM-DD")
+    parser.add_argument("--store", default=STORE_DIR, help="bar store root")
+    parser.add_argument("--log", help="JSON-lines event log path")
+    parser.add_argument("--every-wakeup", action="store_true", help="poll on every scheduler wakeup")
+    args = parser.parse_args()
+
+    event_log.configure(path=args.log, silent=args.log is None)
+
+    replay = ReplayRuntime(
+        args.symbols.split(","),
+        datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc),
+        datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc),
+        store=BarStore(args.store),
+        skip_idle=not args.every_wakeup,
+    )
+    results = replay.run()
+
+    print(
+        f"✅ Replayed {results['polls']} polls in {results['seconds']:.1f}s — "
+        f"{results['trades']} trades, winrate {results['winrate']:.0%}, "
+        f"P/L {results['profit']:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,155 +8,342 @@ sys.path.insert(0, PROJECT_ROOT)
 import pandas as pd
 
 
-from datetime import timezone
+from datetime import timedelta
 
+from core import clock, event_log
+from core.bar_store import TIMEFRAME_H1
+from core.candles import CandleColumns
+from core.clock import VirtualClock
+from core.event_bus import EventBus
 from core.h1_liquidity_builder import H1LiquidityBuilder
-from core.failure_tracker import FailureTracker
 from core.failure_detector import FailureDetector
-from core.origin_candle_locator import OriginCandleLocator
-from core.flip_origin_candle_locator import FlipOriginCandleLocator
-from core.liquidity_event_state import LiquidityEventState
-from integration.structure_resolution_gate import StructureResolutionGate
-from integration.probe_entry_adapter import ProbeEntryAdapter
-from integration.flip_entry_adapter import FlipEntryAdapter
-
-
-from backtest.virtual_executor import VirtualExecutor
+from core.cleanup_detector import CleanupDetector
+from core.origin_candle_locator import OriginLocator
+from core.entry_engine import EntryEngine
+from core.flip_executor import FlipContext, RR_RATIO, SL_BUFFER_PIPS, flip_prices
+from core.liquidity_event_state import (
+    CleanupConfirmed,
+    FailureConfirmed,
+    LifecycleResolved,
+    OriginConfirmed,
+    ProbeTriggered,
+)
+from core.symbol_specs import get_spec
 from execution.target_resolver import TargetResolver
-from core.risk_manager import RiskManager
-
-
+from integration.structure_resolution_gate import DIRECTION_NAMES, StructureResolutionGate, structure_breaks
+from live.symbol_engine import NY_CLOSE_UTC, NY_CLOSE_SECONDS, SESSION_OPEN_SECONDS, SWEEP_DIRECTION
+
+
+from backtest.virtual_executor import M5_SECONDS, VirtualExecutor
+from backtest.liquidity_provider import PointInTimeLiquidity
+
+
+# Strategy parameters of run_backtest() — the keys a sweep grid may use
+TUNABLES = (
+    "cluster_tolerance",
+    "min_touches",
+    "rr_ratio",
+    "sl_buffer_pips",
+    "min_rr",
+    "timeout_minutes",
+)
+
+
+class BacktestEngine:
+    """
+    live.symbol_engine.SymbolEngine on closed bars instead of polls.
+
+    Same components, bus wiring and bar-close order
+    (structure → origin → probe); the differences are where the live
+    engine talks to MT5:
+      - sweeps: the bar's low / high against the point-in-time levels,
+        inside the London + NY session. The nearest crossed level is
+        the sweep and the only one mitigated; deeper ones are taken by
+        the next H1 close. Bullish bars reach their low first
+        (core.mt5_simulator.bars_to_ticks order) and only the side
+        reached first sweeps
+      - flip: market at the trigger bar's close with FlipExecutor's
+        SL / TP (flip_prices), filled and closed by VirtualExecutor
+
+    min_rr (off by default) skips a flip unless opposing liquidity lies
+    at least min_rr × risk away (TargetResolver); the lifecycle then
+    resolves as FLIP_RR_REJECTED.
+    """
+
+    def __init__(
+        self,
+        liquidity: PointInTimeLiquidity,
+        executor: VirtualExecutor,
+        pip_size: float,
+        rr_ratio: float = RR_RATIO,
+        sl_buffer_pips: float = SL_BUFFER_PIPS,
+        min_rr: float | None = None,
+        timeout_minutes: float = 120,
+    ):
+        self.liquidity = liquidity
+        self.executor = executor
+        self.pip_size = pip_size
+        self.rr_ratio = rr_ratio
+        self.sl_buffer_pips = sl_buffer_pips
+        self.resolver = TargetResolver(min_rr=min_rr) if min_rr is not None else None
+
+        self.active_lifecycle = False
+        self.flips = []
+        self.breaks = None          # precomputed (index, direction) lists, see precompute_structure
+        self._next_break = 0
+
+        self.bus = EventBus()
+
+        self.failure_detector = FailureDetector(bus=self.bus)
+        self.cleanup_detector = CleanupDetector(bus=self.bus)
+        self.origin_locator = OriginLocator(bus=self.bus)
+        self.probe_engine = EntryEngine(timeout_minutes=timeout_minutes, bus=self.bus)
+
+        self.structure_gate = StructureResolutionGate(
+            failure_detector=self.failure_detector,
+            cleanup_detector=self.cleanup_detector
+        )
 
+        # Failure → Cleanup → Origin → Probe → Flip
+        self.bus.subscribe(FailureConfirmed, self.cleanup_detector.on_failure_confirmed)
+        self.bus.subscribe(CleanupConfirmed, self.origin_locator.on_cleanup_confirmed)
+        self.bus.subscribe(OriginConfirmed, self.probe_engine.on_origin_confirmed)
+        self.bus.subscribe(ProbeTriggered, self.on_probe_triggered)
+        self.bus.subscribe(LifecycleResolved, self.on_lifecycle_resolved)
+
+    # ─────────────────────────────────────────────
+    # EVENTS
+    # ─────────────────────────────────────────────
+    def on_probe_triggered(self, event: ProbeTriggered):
+        self.flips.append(FlipContext.from_event(event))
+
+    def on_lifecycle_resolved(self, event: LifecycleResolved):
+        self.active_lifecycle = False
+
+    # ─────────────────────────────────────────────
+    # BAR
+    # ─────────────────────────────────────────────
+    def precompute_structure(self, high, low):
+        """
+        Every structure break of the whole series in one
+        structure_breaks() pass. on_bar() then hands each bar its breaks
+        (by bar index) instead of running the gate bar by bar — same
+        detector calls, same order.
+        """
+        gate = self.structure_gate
+        index, direction, gate.last_high, gate.last_low = structure_breaks(
+            high, low, gate.last_high, gate.last_low
+        )
 
-def run_backtest(symbol, m5_df):
-    # -----------------------------
-    # INIT
-    # -----------------------------
-    h1_liquidity = H1LiquidityBuilder(symbol).build()
+        self.breaks = (index.tolist(), direction.tolist())
+        self._next_break = 0
 
-    state = LiquidityEventState()
+    def on_bar(self, candle, now, i=None):
+        """
+        One closed bar; `now` is its close (the clock already reads it).
+        `i` is the bar's index in the series given to precompute_structure().
+        """
+        # -------- POSITION UPDATE --------
+        self.executor.on_candle(candle)
 
-    failure_tracker = FailureTracker()
-    failure_detector = FailureDetector(failure_tracker)
+        # -------- NY CLOSE --------
+        if self.active_lifecycle and now.time() >= NY_CLOSE_UTC:
+            self.bus.publish(LifecycleResolved(
+                reason="NY_SESSION_END",
+                time=now
+            ))
 
-    origin_locator = OriginCandleLocator()
-    flip_origin_locator = FlipOriginCandleLocator()
+        # -------- LIQUIDITY SWEEP --------
+        levels = self.liquidity.at(candle["time"])
 
-    structure_gate = StructureResolutionGate(state, lambda x: None)
+        if not self.active_lifecycle and _in_session(candle["time"]):
+            self._check_sweeps(levels, candle)
 
-    risk_manager = RiskManager(symbol)
-    probe_adapter = ProbeEntryAdapter(risk_manager)
-    flip_adapter = FlipEntryAdapter(None, risk_manager, lambda x: None)
+        # -------- STRUCTURE → ORIGIN → PROBE --------
+        if self.breaks is None:
+            self.structure_gate.on_candle(candle)
+        else:
+            self._dispatch_breaks(i, candle["time"])
+        self.origin_locator.on_candle_closed(candle)
+        self.probe_engine.on_candle_closed(candle)
 
-    executor = VirtualExecutor()
-    resolver = TargetResolver(min_rr=5.0)
+        # -------- FLIP --------
+        while self.flips:
+            self._execute_flip(self.flips.pop(0), candle, levels)
+
+    def _dispatch_breaks(self, i, time):
+        index, direction = self.breaks
+
+        while self._next_break < len(index) and index[self._next_break] == i:
+            self.structure_gate.emit(DIRECTION_NAMES[direction[self._next_break]], time)
+            self._next_break += 1
+
+    def _check_sweeps(self, levels, candle):
+        time = candle["time"]
+
+        sides = ("SELL_SIDE", "BUY_SIDE") if candle["close"] >= candle["open"] else ("BUY_SIDE", "SELL_SIDE")
+
+        for side in sides:
+            # Ascending by price: the nearest SELL_SIDE level is the last, BUY_SIDE the first
+            if side == "SELL_SIDE":
+                swept = levels.at_or_above(side, float(candle["low"]))
+                lvl = swept[-1] if swept else None
+            else:
+                swept = levels.at_or_below(side, float(candle["high"]))
+                lvl = swept[0] if swept else None
+
+            if lvl is None:
+                continue
+
+            # Only the swept level; deeper ones wait for the H1 close, as live
+            levels.mark_mitigated(side, lvl, time)
+            self.active_lifecycle = True
+            self.failure_detector.on_liquidity_swept(
+                direction=SWEEP_DIRECTION[side],
+                time=time
+            )
+            return  # one sweep per lifecycle, like the live engine
+
+    def _execute_flip(self, ctx: FlipContext, candle, levels):
+        entry = float(candle["close"])
+        stop_loss, take_profit = flip_prices(ctx, entry, self.pip_size, self.rr_ratio, self.sl_buffer_pips)
+
+        if self.resolver is not None and self.resolver.resolve(ctx.direction, entry, stop_loss, levels) is None:
+            self.bus.publish(LifecycleResolved(
+                reason="FLIP_RR_REJECTED",
+                time=clock.utcnow()
+            ))
+            return
+
+        self.executor.place_market(
+            ctx.direction,
+            entry,
+            float(stop_loss),
+            float(take_profit),
+            candle["time"]
+        )
 
-    # -----------------------------
-    # LOOP CANDLE BY CANDLE
-    # -----------------------------
-    for i in range(len(m5_df)):
-        candle = m5_df.iloc[i]
+        self.bus.publish(LifecycleResolved(
+            reason="FLIP_EXECUTED",
+            time=clock.utcnow()
+        ))
+
+
+def _in_session(time) -> bool:
+    seconds = time.hour * 3600 + time.minute * 60 + time.second
+    return SESSION_OPEN_SECONDS <= seconds < NY_CLOSE_SECONDS
+
+
+def run_backtest(
+    symbol,
+    m5_df,
+    h1_df=None,
+    columnar=True,
+    source=None,
+    cluster_tolerance=None,
+    min_touches=None,
+    rr_ratio=RR_RATIO,
+    sl_buffer_pips=SL_BUFFER_PIPS,
+    min_rr=None,
+    timeout_minutes=120,
+    pip_size=None,
+    log_path=None,
+):
+    """
+    The live pipeline (Sweep → Failure → Cleanup → Origin → Probe → Flip)
+    bar by bar through BacktestEngine, on a VirtualClock set to each
+    bar's close — the probe timeout runs on bar time.
+
+    This is the strategy the live engine trades: the probe is
+    EntryEngine's retrace trigger, and the flip fills at market on the
+    trigger bar's close with FlipExecutor's SL / TP. There is no probe
+    limit order, TargetResolver TP or flip-origin candle, as in the
+    earlier loop (which no longer ran against this tree).
+
+    columnar=True drives the loop from contiguous NumPy columns with
+    slot-based Candle views instead of building a Series per bar, and
+    finds every structure break up front (BacktestEngine.precompute_structure).
+    columnar=False keeps the original m5_df.iloc[i] loop, gate bar by
+    bar, for comparison; both produce the same trades. On a year of
+    M5 bars the columnar loop is about 7x faster end to end
+    (backtest/benchmark.py). Half of what remains is the point-in-time
+    H1 liquidity both loops share, the rest the event-driven pipeline.
+
+    H1 liquidity is point-in-time: every bar sees the levels build()
+    would have produced on that bar's UTC day. h1_df (from load_data)
+    is fetched from `source` (MT5 or a BarStore) when not given.
+    Bars touching both fill/SL/TP are resolved on `source`'s M1 bars
+    when it has them (VirtualExecutor intrabar path).
+
+    pip_size defaults to the symbol spec of the active broker gateway.
+
+    TUNABLES (cluster_tolerance, min_touches, rr_ratio, sl_buffer_pips,
+    min_rr, timeout_minutes) are what backtest.sweep may vary.
+
+    Component event logging is silent unless log_path is given
+    (JSON lines, see core.event_log) — for this run only; the caller's
+    event log configuration is back in place on return.
+    """
+    if m5_df.empty:
+        return []
+
+    with event_log.configured(path=log_path, silent=log_path is None):
+        # -----------------------------
+        # INIT
+        # -----------------------------
+        builder = H1LiquidityBuilder(
+            symbol,
+            source=source,
+            cluster_tolerance=cluster_tolerance,
+            min_touches=min_touches
+        )
 
-        # -------- LIQUIDITY SWEEP --------
-        if state.active_liquidity is None:
-            for lvl in h1_liquidity["SELL"]:
-                if candle["high"] >= lvl.price:
-                    state.mark_sweep(lvl, candle["time"])
-                    break
-
-            for lvl in h1_liquidity["BUY"]:
-                if candle["low"] <= lvl.price:
-                    state.mark_sweep(lvl, candle["time"])
-                    break
-
-        # -------- FAILURE DETECTION --------
-        if state.active_liquidity:
-            probing_sell = state.active_liquidity.type == "BUY"
-
-            failure_detector.on_candle(
-                candle=candle,
-                probing_sell=probing_sell
+        if h1_df is None:
+            h1_df = builder.source.copy_rates_range(
+                symbol,
+                TIMEFRAME_H1,
+                m5_df["time"].iloc[0] - timedelta(days=builder.LOOKBACK_DAYS + 1),
+                m5_df["time"].iloc[-1]
             )
 
-            state.update_failures(failure_tracker.get_failures())
-
-        # -------- STRUCTURE RESOLUTION --------
-        structure_gate.on_price(
-            high=candle["high"],
-            low=candle["low"]
+        if pip_size is None:
+            spec = get_spec(symbol)
+            if spec is None:
+                raise RuntimeError(f"No symbol spec for {symbol}: install a broker gateway or pass pip_size")
+            pip_size = spec.pip_size
+
+        executor = VirtualExecutor(symbol, intrabar_source=source)
+
+        engine = BacktestEngine(
+            PointInTimeLiquidity(symbol, h1_df, builder, mitigate_intraday=True),
+            executor,
+            pip_size,
+            rr_ratio=rr_ratio,
+            sl_buffer_pips=sl_buffer_pips,
+            min_rr=min_rr,
+            timeout_minutes=timeout_minutes,
         )
 
-        # -------- ORIGIN CANDLE --------
-        if state.break_count == 1 and state.origin_candle is None:
-            origin = origin_locator.locate(
-                m5_df=m5_df.iloc[: i + 1],
-                break_index=i,
-                direction=state.direction
-            )
-            state.origin_candle = origin
-
-        # -------- PROBE ENTRY --------
-        if (
-            state.structure_confirmed
-            and state.origin_candle
-            and not state.probe_placed
-        ):
-            plan = probe_adapter.build(
-                direction=state.direction,
-                origin=state.origin_candle,
-                failures=state.failures
-            )
+        # -----------------------------
+        # LOOP CANDLE BY CANDLE
+        # -----------------------------
+        bars = CandleColumns.from_frame(m5_df) if columnar else m5_df
+        closes = (m5_df["time"] + pd.Timedelta(seconds=M5_SECONDS)).tolist()
 
-            if plan:
-                tp = resolver.resolve(
-                    plan.direction,
-                    plan.entry,
-                    plan.stop_loss,
-                    h1_liquidity
-                )
-
-                if tp:
-                    executor.place_limit(
-                        plan.direction,
-                        plan.entry,
-                        plan.stop_loss,
-                        tp,
-                        candle["time"]
-                    )
-                    state.probe_placed = True
+        if columnar:
+            engine.precompute_structure(bars.high, bars.low)
 
-        # -------- POSITION UPDATE --------
-        result = executor.on_candle(candle)
+        previous = clock.get_clock()
+        virtual = VirtualClock(closes[0])
+        clock.set_clock(virtual)
 
-        # -------- FLIP --------
-        if result == "SL" and not state.flip_used:
-            flip_origin = flip_origin_locator.locate(
-                m5_df=m5_df,
-                sl_index=i,
-                direction=state.direction
-            )
+        try:
+            for i, now in enumerate(closes):
+                candle = bars[i] if columnar else m5_df.iloc[i]
+
+                virtual.advance_to(now)
+                engine.on_bar(candle, now, i)
+        finally:
+            clock.set_clock(previous)
 
-            if flip_origin:
-                tp = resolver.resolve(
-                    state.direction,
-                    flip_origin.open,
-                    flip_origin.high if state.direction == "SELL" else flip_origin.low,
-                    h1_liquidity
-                )
-
-                if tp:
-                    executor.place_limit(
-                        state.direction,
-                        flip_origin.open,
-                        flip_origin.high,
-                        tp,
-                        candle["time"]
-                    )
-                    state.flip_used = True
-
-        # -------- RESET AFTER TP OR FLIP SL --------
-        if result in ("TP", "SL") and state.flip_used:
-            state.reset_event()
-            failure_tracker.reset()
-
-    return executor.history
+        return executor.history
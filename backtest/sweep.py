@@ -0,0 +1,207 @@
+import sys
+import os
+import argparse
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone, timedelta
+from multiprocessing import shared_memory
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from core import broker
+from core.bar_store import BarStore, STORE_DIR
+from core.mt5_simulator import MT5Simulator
+from backtest.data_loader import load_data
+from backtest.liquidity_provider import to_rates
+from backtest.metrics import summarize
+from backtest.run_backtest import TUNABLES, run_backtest
+
+
+M5_COLUMNS = ("open", "high", "low", "close")
+
+
+# ─────────────────────────────────────────────
+# GRID
+# ─────────────────────────────────────────────
+def expand_grid(grid: dict) -> list[dict]:
+    """
+    {"rr_ratio": [3, 5], "min_touches": [2, 3]} → 4 parameter dicts.
+    Keys must be strategy tunables (run_backtest.TUNABLES) — not I/O
+    or data options such as log_path or source.
+    """
+    unknown = [key for key in grid if key not in TUNABLES]
+    if unknown:
+        raise ValueError(
+            f"not tunable: {', '.join(unknown)} (tunables: {', '.join(TUNABLES)})"
+        )
+
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+# ─────────────────────────────────────────────
+# SHARED MEMORY
+# ─────────────────────────────────────────────
+class SharedArrays:
+    """
+    Publishes NumPy arrays in shared memory ONCE.
+    Workers attach by name — nothing is pickled per task.
+    """
+
+    def __init__(self, arrays: dict):
+        self.blocks = []
+        self.specs = {}
+
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+
+            self.blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach(specs: dict):
+    """
+    Returns ({name: array}, blocks). Keep `blocks` alive while
+    the arrays are in use.
+    """
+    arrays = {}
+    blocks = []
+
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    return arrays, blocks
+
+
+# ─────────────────────────────────────────────
+# WORKER
+# ─────────────────────────────────────────────
+_WORKER = {}
+
+
+def _init_worker(symbol: str, specs: dict, store_root: str, start: datetime):
+    arrays, blocks = attach(specs)
+
+    # Columns are wrapped, not copied, except the Timestamp column
+    m5_df = pd.DataFrame(
+        {name: arrays[f"m5_{name}"] for name in M5_COLUMNS},
+        copy=False
+    )
+    m5_df.insert(0, "time", pd.to_datetime(arrays["m5_time"], unit="s", utc=True))
+
+    # A worker has no terminal: symbol specs (pip size) come from a
+    # simulator on the same bar store, which also serves the M1 bars
+    # for VirtualExecutor's intrabar path
+    store = BarStore(store_root)
+    broker.set_gateway(MT5Simulator(store, [symbol], start, start, lookback_days=0))
+
+    _WORKER.update(
+        symbol=symbol,
+        m5_df=m5_df,
+        h1_rates=arrays["h1"],
+        store=store,
+        blocks=blocks,
+    )
+
+
+def _run_one(params: dict) -> dict:
+    history = run_backtest(
+        _WORKER["symbol"],
+        _WORKER["m5_df"],
+        h1_df=_WORKER["h1_rates"],
+        source=_WORKER["store"],
+        **params
+    )
+
+    return {**params, **summarize([trade.result for trade in history])}
+
+
+# ─────────────────────────────────────────────
+# SWEEP
+# ─────────────────────────────────────────────
+def run_sweep(
+    symbol,
+    m5_df,
+    h1_df,
+    grid: dict,
+    workers: int | None = None,
+    store: BarStore | None = None,
+) -> pd.DataFrame:
+    """
+    Runs run_backtest() for every grid combination on a process pool.
+    M5/H1 data is shared once via shared memory.
+    Each worker installs an MT5Simulator on `store` (default: the
+    local bar store) as its broker gateway.
+    Returns one row per combination: parameters + trade stats.
+    """
+    combos = expand_grid(grid)
+    store = store or BarStore()
+
+    arrays = {
+        "m5_time": (m5_df["time"] - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1),
+        "h1": to_rates(h1_df),
+    }
+    for name in M5_COLUMNS:
+        arrays[f"m5_{name}"] = m5_df[name].to_numpy(dtype=np.float64)
+
+    shared = SharedArrays({
+        name: np.asarray(array) for name, array in arrays.items()
+    })
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(symbol, shared.specs, store.root, m5_df["time"].iloc[0].to_pydatetime()),
+        ) as pool:
+            rows = list(pool.map(_run_one, combos, chunksize=max(1, len(combos) // 256)))
+    finally:
+        shared.close()
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel backtest parameter sweep")
+    parser.add_argument("symbol")
+    parser.add_argument("start", help="YYYY-MM-DD")
+    parser.add_argument("end", help="YYYY-MM-DD")
+    parser.add_argument("grid", help='JSON, e.g. {"rr_ratio": [3, 5], "min_touches": [2, 3]}')
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--store", default=STORE_DIR, help="bar store root")
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc)
+    end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc)
+
+    # H1 needs the liquidity lookback before the first M5 bar
+    store = BarStore(args.store)
+
+    h1_df, m5_df = load_data(args.symbol, start - timedelta(days=6), end, source=store)
+    m5_df = m5_df[m5_df["time"] >= start].reset_index(drop=True)
+
+    results = run_sweep(args.symbol, m5_df, h1_df, json.loads(args.grid), args.workers, store=store)
+    results.to_csv(args.out, index=False)
+
+    print(f"✅ {len(results)} combinations → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
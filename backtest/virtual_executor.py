@@ -1,47 +1,266 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core.bar_store import TIMEFRAME_M1
+from core.mt5_simulator import bars_to_ticks
+
+
+M1_SECONDS = 60
+M5_SECONDS = 300
+
+
 class VirtualPosition:
     def __init__(self, direction, entry, sl, tp, open_time):
         self.direction = direction
         self.entry = entry
         self.sl = sl
         self.tp = tp
-        self.open_time = open_time
+        self.open_time = open_time      # order placed
+        self.fill_time = None           # limit filled (None = pending)
+        self.fill_price = None
         self.close_time = None
         self.result = None  # "TP" | "SL"
 
 
+class IntrabarPath:
+    """
+    Chronological price path inside one bar, from real ticks when given,
+    else from the bar store's M1 bars (4 ticks per M1 bar, same order as
+    core.mt5_simulator.bars_to_ticks). None when neither covers the bar.
+    """
+
+    def __init__(self, symbol: str, source=None, ticks=None):
+        self.symbol = symbol
+        self.source = source
+
+        self.ticks = None
+        if ticks is not None and len(ticks):
+            self.ticks = ticks
+            self.tick_times = np.ascontiguousarray(ticks["time_msc"])
+
+    def path(self, bar_time: int, period: int):
+        """
+        (times_msc, prices) for [bar_time, bar_time + period), or None.
+        """
+        if self.ticks is not None:
+            lo = int(np.searchsorted(self.tick_times, bar_time * 1000, side="left"))
+            hi = int(np.searchsorted(self.tick_times, (bar_time + period) * 1000, side="left"))
+            if hi > lo:
+                return self.tick_times[lo:hi], self.ticks["bid"][lo:hi]
+
+        if self.source is None:
+            return None
+
+        m1 = self.source.copy_rates_range(
+            self.symbol,
+            TIMEFRAME_M1,
+            datetime.fromtimestamp(bar_time, timezone.utc),
+            datetime.fromtimestamp(bar_time + period - M1_SECONDS, timezone.utc),
+        )
+        if m1 is None or len(m1) == 0:
+            return None
+
+        ticks = bars_to_ticks(m1, M1_SECONDS, {"spread": 0, "point": 0.0})
+        return ticks["time_msc"], ticks["bid"]
+
+
 class VirtualExecutor:
-    def __init__(self):
-        self.position = None
+    """
+    Limit / market orders + SL / TP on closed bars.
+
+    - an order placed on a bar can only fill from the NEXT bar, and only
+      once price trades through its entry
+    - fast path: a bar touching at most one of fill / SL / TP is
+      resolved from its high / low alone
+    - a bar touching several (fill + exit, or SL + TP) is replayed on the
+      intrabar path — ticks or M1 — in true chronological order
+    - without intrabar data the old conservative rule applies: SL first
+    """
+
+    def __init__(self, symbol: str | None = None, intrabar_source=None, ticks=None, bar_seconds: int = M5_SECONDS):
+        self.orders = []      # pending limits
+        self.positions = []   # filled, open
         self.history = []
+        self.bar_seconds = bar_seconds
+
+        self.intrabar = None
+        if intrabar_source is not None or ticks is not None:
+            self.intrabar = IntrabarPath(symbol, intrabar_source, ticks)
+
+        self.intrabar_bars = 0  # bars that needed the slow path
+
+    @property
+    def position(self):
+        """
+        Open position, else pending order, else None.
+        """
+        if self.positions:
+            return self.positions[0]
+        return self.orders[0] if self.orders else None
 
     def place_limit(self, direction, entry, sl, tp, time):
-        self.position = VirtualPosition(direction, entry, sl, tp, time)
+        self.orders.append(VirtualPosition(direction, entry, sl, tp, time))
+        return True
+
+    def place_market(self, direction, price, sl, tp, time):
+        """
+        Filled at `price` on the bar opened at `time` (e.g. its close);
+        exits are checked from the next bar on.
+        """
+        pos = VirtualPosition(direction, price, sl, tp, time)
+        pos.fill_time = time
+        pos.fill_price = price
+        self.positions.append(pos)
         return True
 
     def on_candle(self, candle):
-        if not self.position:
+        """
+        Returns the result of the last position closed on this bar
+        ("TP" / "SL"), or None.
+        """
+        if not self.orders and not self.positions:
             return None
 
+        bar_time = _epoch(candle["time"])
         high = candle["high"]
         low = candle["low"]
 
-        pos = self.position
+        closed = []
+
+        for pos in list(self.orders):
+            if _epoch(pos.open_time) >= bar_time:
+                continue  # placed on this bar — nothing left of it to trade
+
+            if not _touches_entry(pos, high, low):
+                continue
+
+            self.orders.remove(pos)
+            pos.fill_price = _fill_price(pos, candle["open"])
+
+            sl_hit, tp_hit = _touches_exits(pos, high, low)
+            if not (sl_hit or tp_hit):
+                pos.fill_time = candle["time"]
+                self.positions.append(pos)
+                continue
+
+            # Filled AND an exit touched: which came first?
+            if self._resolve_intrabar(pos, bar_time, pending=True):
+                if pos.result:
+                    closed.append(pos)
+                else:
+                    self.positions.append(pos)
+                continue
 
-        if pos.direction == "SELL":
-            if high >= pos.sl:
+            # No path: an SL beyond the entry can only come after the fill;
+            # a TP may have traded before it, so it is not counted
+            pos.fill_time = candle["time"]
+            if sl_hit:
                 pos.result = "SL"
-            elif low <= pos.tp:
-                pos.result = "TP"
+                pos.close_time = candle["time"]
+                closed.append(pos)
+            else:
+                self.positions.append(pos)
+
+        for pos in list(self.positions):
+            if _epoch(pos.fill_time) >= bar_time:
+                continue  # filled on this bar — already resolved above
+
+            sl_hit, tp_hit = _touches_exits(pos, high, low)
+
+            if sl_hit and tp_hit and self._resolve_intrabar(pos, bar_time, pending=False):
+                if not pos.result:
+                    continue  # the coarser path reached neither level
+            elif sl_hit or tp_hit:
+                pos.result = "SL" if sl_hit else "TP"  # SL first when ambiguous
+                pos.close_time = candle["time"]
+            else:
+                continue
+
+            self.positions.remove(pos)
+            closed.append(pos)
+
+        if not closed:
+            return None
+
+        closed.sort(key=lambda p: _epoch(p.close_time))
+        self.history.extend(closed)
+        return closed[-1].result
+
+    # ─────────────────────────────────────────────
+    # INTRABAR
+    # ─────────────────────────────────────────────
+    def _resolve_intrabar(self, pos, bar_time, pending):
+        """
+        Walk the intrabar path: fill (if pending), then first of SL / TP.
+        Sets fill_time / result / close_time. False = no intrabar data.
+        """
+        if self.intrabar is None:
+            return False
+
+        path = self.intrabar.path(bar_time, self.bar_seconds)
+        if path is None:
+            return False
+
+        self.intrabar_bars += 1
+        times, prices = path
+
+        start = 0
+        if pending:
+            crossed = prices <= pos.entry if pos.direction == "BUY" else prices >= pos.entry
+            # No crossing on a coarser path: fill at the first point
+            start = int(np.argmax(crossed)) if crossed.any() else 0
+            pos.fill_time = _from_msc(times[start])
+
+        rest = prices[start:]
+        if pos.direction == "BUY":
+            sl_mask, tp_mask = rest <= pos.sl, rest >= pos.tp
         else:
-            if low <= pos.sl:
-                pos.result = "SL"
-            elif high >= pos.tp:
-                pos.result = "TP"
+            sl_mask, tp_mask = rest >= pos.sl, rest <= pos.tp
+
+        sl_at = int(np.argmax(sl_mask)) if sl_mask.any() else None
+        tp_at = int(np.argmax(tp_mask)) if tp_mask.any() else None
+
+        if sl_at is None and tp_at is None:
+            return True
+
+        if tp_at is None or (sl_at is not None and sl_at <= tp_at):
+            pos.result, hit = "SL", sl_at
+        else:
+            pos.result, hit = "TP", tp_at
+
+        pos.close_time = _from_msc(times[start + hit])
+        return True
+
+
+def _touches_entry(pos, high, low):
+    return low <= pos.entry if pos.direction == "BUY" else high >= pos.entry
+
+
+def _fill_price(pos, bar_open):
+    # Gapped through the limit: filled at the (better) open
+    if pos.direction == "BUY":
+        return min(pos.entry, bar_open)
+    return max(pos.entry, bar_open)
+
+
+def _touches_exits(pos, high, low):
+    if pos.direction == "SELL":
+        return high >= pos.sl, low <= pos.tp
+    return low <= pos.sl, high >= pos.tp
+
+
+def _epoch(value) -> int:
+    if isinstance(value, np.datetime64):
+        return int(value.astype("datetime64[s]").astype(np.int64))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if hasattr(value, "timestamp"):
+        return int(value.timestamp())
+    return int(value)
 
-        if pos.result:
-            pos.close_time = candle["time"]
-            self.history.append(pos)
-            self.position = None
-            return pos.result
 
-        return None
+def _from_msc(time_msc) -> datetime:
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(milliseconds=int(time_msc))
@@ -1,12 +1,13 @@
 # config/settings.py
 
-import MetaTrader5 as mt5
+from core import broker as mt5
 from datetime import time
 
 # =========================
 # SYMBOL & TIMEFRAMES
 # =========================
 SYMBOL = "EURUSDm"
+SYMBOLS = [SYMBOL]   # driven by one live process
 
 HTF = mt5.TIMEFRAME_H1
 LTF = mt5.TIMEFRAME_M5
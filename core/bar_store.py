@@ -0,0 +1,312 @@
+import os
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+
+STORE_DIR = os.path.join("data", "bars")
+
+# Same layout as the arrays returned by mt5.copy_rates_*
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+
+# Values match the MetaTrader5 TIMEFRAME_* constants,
+# so either can be passed wherever a timeframe is expected.
+TIMEFRAMES = {
+    "M1": 1,
+    "M5": 5,
+    "M15": 15,
+    "M30": 30,
+    "H1": 16385,
+    "H4": 16388,
+    "D1": 16408,
+}
+TIMEFRAME_M1 = TIMEFRAMES["M1"]
+TIMEFRAME_M5 = TIMEFRAMES["M5"]
+TIMEFRAME_H1 = TIMEFRAMES["H1"]
+
+_CSV_COLUMNS = {
+    "tickvol": "tick_volume",
+    "vol": "real_volume",
+    "volume": "tick_volume",
+}
+
+
+def timeframe_name(timeframe) -> str:
+    if isinstance(timeframe, str):
+        name = timeframe.upper()
+        if name not in TIMEFRAMES:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+        return name
+
+    for name, value in TIMEFRAMES.items():
+        if value == timeframe:
+            return name
+
+    raise ValueError(f"Unknown timeframe: {timeframe}")
+
+
+class BarStore:
+    """
+    Local on-disk bar history.
+
+    Layout: <root>/<SYMBOL>/<TF>/<YYYY-MM>/<field>.npy
+    - one directory per month, one plain .npy per RATES_DTYPE field
+      (time.npy, open.npy, ...), sorted by time, unique times
+    - columns are memory-mapped on read: a range is located on
+      time.npy alone and only the requested fields are touched, so
+      repeated runs are served from the OS page cache
+    - copy_rates_range() has the same signature and return shape as
+      mt5.copy_rates_range(), so it can stand in for the terminal;
+      copy_columns() returns the fields without building records
+    - months written by the earlier one-file layout (<YYYY-MM>.npy,
+      structured) are still read and are converted on the next write
+    """
+
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+
+    # =============================
+    # READ
+    # =============================
+    def copy_rates_range(self, symbol: str, timeframe, date_from: datetime, date_to: datetime):
+        """
+        Bars with date_from <= time <= date_to, or None if nothing stored.
+        """
+        columns = self.copy_columns(symbol, timeframe, date_from, date_to)
+        if columns is None:
+            return None
+
+        rates = np.empty(len(columns["time"]), dtype=RATES_DTYPE)
+        for name in RATES_DTYPE.names:
+            rates[name] = columns[name]
+        return rates
+
+    def copy_columns(self, symbol: str, timeframe, date_from: datetime, date_to: datetime, fields=None):
+        """
+        Same range as copy_rates_range(), as {field: contiguous array}.
+        Only `fields` (default: all) are read; "time" is always included.
+        """
+        fields = _fields(fields)
+
+        start = _epoch(date_from)
+        end = _epoch(date_to)
+
+        parts = {name: [] for name in fields}
+
+        for month in _months(start, end):
+            columns = self._load(symbol, timeframe, month)
+            if columns is None:
+                continue
+
+            times = columns["time"]
+
+            lo = np.searchsorted(times, start, side="left")
+            hi = np.searchsorted(times, end, side="right")
+
+            if hi > lo:
+                for name in fields:
+                    parts[name].append(columns[name][lo:hi])
+
+        if not parts["time"]:
+            return None
+
+        return {name: np.concatenate(chunks) for name, chunks in parts.items()}
+
+    def months(self, symbol: str, timeframe) -> list[str]:
+        folder = os.path.join(self.root, symbol, timeframe_name(timeframe))
+        if not os.path.isdir(folder):
+            return []
+
+        months = set()
+        for name in os.listdir(folder):
+            if os.path.isfile(os.path.join(folder, name, "time.npy")):
+                months.add(name)
+            elif name.endswith(".npy"):
+                months.add(name[:-4])
+
+        return sorted(months)
+
+    # =============================
+    # WRITE
+    # =============================
+    def write(self, symbol: str, timeframe, rates) -> int:
+        """
+        Merge bars into the store (newer values win on equal time).
+        Returns the number of bars written.
+        """
+        rates = _as_rates(rates)
+        if len(rates) == 0:
+            return 0
+
+        month_keys = _month_keys(rates["time"])
+
+        for month in np.unique(month_keys):
+            chunk = rates[month_keys == month]
+            label = _month_label(int(month))
+
+            stored = self._load(symbol, timeframe, label)
+            if stored is not None:
+                chunk = np.concatenate([_as_rates(stored), chunk])
+
+            # Keep LAST occurrence per time, sorted
+            _, last = np.unique(chunk["time"][::-1], return_index=True)
+            chunk = chunk[len(chunk) - 1 - last]
+
+            self._save(self._path(symbol, timeframe, label), chunk)
+
+        return len(rates)
+
+    def import_csv(self, symbol: str, timeframe, csv_path: str, sep: str = ",") -> int:
+        """
+        Imports a CSV of bars. Accepts either
+        - time,open,high,low,close[,tick_volume,spread,real_volume]
+          with time as epoch seconds or a parseable UTC datetime, or
+        - an MT5 history export (<DATE> <TIME> <OPEN> ... <SPREAD>),
+          usually tab separated (sep="\\t")
+        """
+        df = pd.read_csv(csv_path, sep=sep, float_precision="round_trip")
+        df.columns = [c.strip().strip("<>").lower() for c in df.columns]
+        df = df.rename(columns=_CSV_COLUMNS)
+
+        if "time" in df.columns and "date" in df.columns:
+            stamp = pd.to_datetime(df["date"] + " " + df["time"], utc=True, format="mixed")
+        elif "date" in df.columns:
+            stamp = pd.to_datetime(df["date"], utc=True, format="mixed")
+        elif pd.api.types.is_numeric_dtype(df["time"]):
+            stamp = None
+        else:
+            stamp = pd.to_datetime(df["time"], utc=True, format="mixed")
+
+        if stamp is not None:
+            df["time"] = (stamp - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+
+        return self.write(symbol, timeframe, df)
+
+    def import_mt5(self, symbol: str, timeframe, date_from: datetime, date_to: datetime) -> int:
+        """
+        Dumps history from a running MT5 terminal into the store.
+        """
+        from core import broker as mt5  # broker imports this module
+
+        rates = mt5.copy_rates_range(symbol, TIMEFRAMES[timeframe_name(timeframe)], date_from, date_to)
+        if rates is None:
+            raise RuntimeError(f"MT5 returned no {timeframe_name(timeframe)} bars for {symbol}")
+
+        return self.write(symbol, timeframe, rates)
+
+    # =============================
+    # INTERNAL
+    # =============================
+    def _path(self, symbol, timeframe, month: str):
+        return os.path.join(self.root, symbol, timeframe_name(timeframe), month)
+
+    def _load(self, symbol, timeframe, month: str):
+        """
+        {field: memory-mapped column} for one month, or None.
+        """
+        path = self._path(symbol, timeframe, month)
+
+        if os.path.isdir(path):
+            return {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                for name in RATES_DTYPE.names
+            }
+
+        # One structured file per month (earlier layout)
+        if os.path.exists(path + ".npy"):
+            rates = np.load(path + ".npy", mmap_mode="r")
+            return {name: rates[name] for name in RATES_DTYPE.names}
+
+        return None
+
+    @staticmethod
+    def _save(path, rates):
+        """
+        Writes every column into a sibling directory, then swaps it in,
+        so readers never see columns of different lengths.
+        """
+        tmp = path + ".tmp"
+        old = path + ".old"
+
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        for name in RATES_DTYPE.names:
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(rates[name], dtype=RATES_DTYPE[name]))
+
+        if os.path.isdir(path):
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(path, old)
+
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+
+        if os.path.exists(path + ".npy"):
+            os.remove(path + ".npy")
+
+
+def _as_rates(rates) -> np.ndarray:
+    if isinstance(rates, dict):
+        out = np.zeros(len(rates["time"]), dtype=RATES_DTYPE)
+        for name in RATES_DTYPE.names:
+            if name in rates:
+                out[name] = rates[name]
+        return out
+
+    if isinstance(rates, pd.DataFrame):
+        out = np.zeros(len(rates), dtype=RATES_DTYPE)
+        for name in RATES_DTYPE.names:
+            if name in rates.columns:
+                out[name] = rates[name].to_numpy()
+        return out
+
+    rates = np.asarray(rates)
+    out = np.zeros(len(rates), dtype=RATES_DTYPE)
+    for name in RATES_DTYPE.names:
+        if name in rates.dtype.names:
+            out[name] = rates[name]
+    return out
+
+
+def _fields(fields) -> list[str]:
+    if fields is None:
+        return list(RATES_DTYPE.names)
+
+    unknown = set(fields) - set(RATES_DTYPE.names)
+    if unknown:
+        raise ValueError(f"Unknown bar fields: {', '.join(sorted(unknown))}")
+
+    return ["time"] + [name for name in fields if name != "time"]
+
+
+def _epoch(value) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _month_keys(times):
+    months = times.astype("datetime64[s]").astype("datetime64[M]")
+    return months.astype(np.int64)
+
+
+def _month_label(month_key: int) -> str:
+    return str(np.datetime64(month_key, "M"))
+
+
+def _months(start: int, end: int):
+    first, last = _month_keys(np.array([start, end], dtype=np.int64))
+    return [_month_label(m) for m in range(int(first), int(last) + 1)]
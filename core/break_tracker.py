@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional, List
+import numpy as np
 import pandas as pd
 
 from core.failure_tracker import Failure
@@ -78,17 +79,17 @@ class BreakTracker:
         # BUY cleanup (breaking UP)
         # -----------------------------
         if target_failure.direction == "BUY":
-            if cur["close"] > target_failure.level:
+            if cur["close"] > target_failure.defensive_level:
                 self.break_count += 1
                 return BreakEvent(
                     break_number=self.break_count,
-                    level=target_failure.level,
+                    level=target_failure.defensive_level,
                     candle_index=len(df) - 1,
                     candle_time=cur["time"],
                 )
 
             # ❌ Invalidation: breaks down before 2nd break
-            if self.break_count == 1 and cur["close"] < self.failures[1].level:
+            if self.break_count == 1 and cur["close"] < self.failures[1].defensive_level:
                 self.reset()
                 return None
 
@@ -96,22 +97,83 @@ class BreakTracker:
         # SELL cleanup (breaking DOWN)
         # -----------------------------
         if target_failure.direction == "SELL":
-            if cur["close"] < target_failure.level:
+            if cur["close"] < target_failure.defensive_level:
                 self.break_count += 1
                 return BreakEvent(
                     break_number=self.break_count,
-                    level=target_failure.level,
+                    level=target_failure.defensive_level,
                     candle_index=len(df) - 1,
                     candle_time=cur["time"],
                 )
 
             # ❌ Invalidation: breaks up before 2nd break
-            if self.break_count == 1 and cur["close"] > self.failures[1].level:
+            if self.break_count == 1 and cur["close"] > self.failures[1].defensive_level:
                 self.reset()
                 return None
 
         return None
 
+    def update_batch(self, df: pd.DataFrame, start: int = 1) -> List[BreakEvent]:
+        """
+        Same events and end state as calling update(df.iloc[: i + 1])
+        for every i >= start, in a few vectorized passes over the closes.
+        """
+        if not self.active or len(self.failures) != 2:
+            return []
+
+        start = max(start, 1)
+        closes = df["close"].to_numpy(dtype=np.float64)[start:]
+        times = df["time"]
+
+        newer, older = self.failures[1], self.failures[0]
+        events = []
+        offset = 0
+
+        # 1st break: nothing else can happen before it
+        if self.break_count == 0:
+            first = _first(_crossed(closes, newer))
+            if first is None:
+                return events
+
+            self._emit(events, start + first, times)
+            offset = first + 1
+
+        rest = closes[offset:]
+        breaks = _crossed(rest, older)
+
+        # 2nd break, unless price invalidates first (a break wins a tie)
+        if self.break_count == 1:
+            if older.direction == "BUY":
+                invalid = rest < newer.defensive_level
+            else:
+                invalid = rest > newer.defensive_level
+
+            second = _first(breaks)
+            stop = _first(invalid & ~breaks)
+
+            if stop is not None and (second is None or stop < second):
+                self.reset()
+                return events
+            if second is None:
+                return events
+
+        # From the 2nd break on, every crossing close is another event
+        for i in np.flatnonzero(breaks).tolist():
+            self._emit(events, start + offset + i, times)
+
+        return events
+
+    def _emit(self, events, index, times):
+        target = self.failures[1] if self.break_count == 0 else self.failures[0]
+        self.break_count += 1
+
+        events.append(BreakEvent(
+            break_number=self.break_count,
+            level=target.defensive_level,
+            candle_index=index,
+            candle_time=times.iloc[index],
+        ))
+
     # =============================
     # ACCESSORS
     # =============================
@@ -120,3 +182,15 @@ class BreakTracker:
         True when both breaks are confirmed.
         """
         return self.break_count == 2
+
+
+def _crossed(closes, failure):
+    if failure.direction == "BUY":
+        return closes > failure.defensive_level
+    return closes < failure.defensive_level
+
+
+def _first(mask) -> int | None:
+    if not mask.any():
+        return None
+    return int(np.argmax(mask))
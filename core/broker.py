@@ -0,0 +1,218 @@
+"""
+Broker gateway.
+
+Import this module instead of MetaTrader5:
+
+    from core import broker as mt5
+
+Constants (TIMEFRAME_*, ORDER_TYPE_*, TRADE_RETCODE_* ...) are defined
+here with the MetaTrader5 values, so they import on any platform.
+Every other attribute (symbol_info, order_send, copy_rates_range ...)
+is forwarded to the active gateway: the real terminal by default, or
+whatever set_gateway() installed (e.g. core.mt5_simulator.MT5Simulator).
+"""
+
+from abc import ABC, abstractmethod
+
+from core.bar_store import TIMEFRAMES
+
+
+# =============================
+# CONSTANTS (MetaTrader5 values)
+# =============================
+TIMEFRAME_M1 = TIMEFRAMES["M1"]
+TIMEFRAME_M5 = TIMEFRAMES["M5"]
+TIMEFRAME_M15 = TIMEFRAMES["M15"]
+TIMEFRAME_M30 = TIMEFRAMES["M30"]
+TIMEFRAME_H1 = TIMEFRAMES["H1"]
+TIMEFRAME_H4 = TIMEFRAMES["H4"]
+TIMEFRAME_D1 = TIMEFRAMES["D1"]
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TYPE_BUY_LIMIT = 2
+ORDER_TYPE_SELL_LIMIT = 3
+ORDER_TYPE_BUY_STOP = 4
+ORDER_TYPE_SELL_STOP = 5
+
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_PENDING = 5
+TRADE_ACTION_SLTP = 6
+TRADE_ACTION_MODIFY = 7
+TRADE_ACTION_REMOVE = 8
+
+ORDER_TIME_GTC = 0
+
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_INVALID_STOPS = 10016
+TRADE_RETCODE_MARKET_CLOSED = 10018
+
+COPY_TICKS_ALL = -1
+COPY_TICKS_INFO = 1
+COPY_TICKS_TRADE = 2
+
+
+# =============================
+# GATEWAY INTERFACE
+# =============================
+class BrokerGateway(ABC):
+    """
+    What the bot needs from a broker — same names, arguments and
+    return shapes as the MetaTrader5 module functions. A gateway that
+    misses one of them fails at construction, not on first call.
+    """
+
+    @abstractmethod
+    def initialize(self, *args, **kwargs) -> bool:
+        ...
+
+    @abstractmethod
+    def shutdown(self):
+        ...
+
+    @abstractmethod
+    def last_error(self):
+        ...
+
+    @abstractmethod
+    def account_info(self):
+        ...
+
+    @abstractmethod
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        ...
+
+    @abstractmethod
+    def symbol_info(self, symbol: str):
+        ...
+
+    @abstractmethod
+    def symbol_info_tick(self, symbol: str):
+        ...
+
+    @abstractmethod
+    def copy_rates_from_pos(self, symbol: str, timeframe, start_pos: int, count: int):
+        ...
+
+    @abstractmethod
+    def copy_rates_range(self, symbol: str, timeframe, date_from, date_to):
+        ...
+
+    @abstractmethod
+    def copy_ticks_from(self, symbol: str, date_from, count: int, flags):
+        ...
+
+    @abstractmethod
+    def copy_ticks_range(self, symbol: str, date_from, date_to, flags):
+        ...
+
+    @abstractmethod
+    def positions_get(self, symbol: str | None = None, ticket: int | None = None):
+        ...
+
+    @abstractmethod
+    def orders_get(self, symbol: str | None = None, ticket: int | None = None):
+        ...
+
+    @abstractmethod
+    def order_send(self, request: dict):
+        ...
+
+
+class MT5Gateway(BrokerGateway):
+    """
+    The real terminal (Windows only). Thin pass-through to MetaTrader5;
+    calls outside the interface (terminal_info, history_deals_get ...)
+    are forwarded as well.
+    """
+
+    def __init__(self):
+        import MetaTrader5
+
+        self.module = MetaTrader5
+
+    def __getattr__(self, name):
+        # Only reached for names the class does not define
+        if name.startswith("_") or name == "module":
+            raise AttributeError(name)
+        return getattr(self.module, name)
+
+    def initialize(self, *args, **kwargs):
+        return self.module.initialize(*args, **kwargs)
+
+    def shutdown(self):
+        return self.module.shutdown()
+
+    def last_error(self):
+        return self.module.last_error()
+
+    def account_info(self):
+        return self.module.account_info()
+
+    def symbol_select(self, *args, **kwargs):
+        return self.module.symbol_select(*args, **kwargs)
+
+    def symbol_info(self, *args, **kwargs):
+        return self.module.symbol_info(*args, **kwargs)
+
+    def symbol_info_tick(self, *args, **kwargs):
+        return self.module.symbol_info_tick(*args, **kwargs)
+
+    def copy_rates_from_pos(self, *args, **kwargs):
+        return self.module.copy_rates_from_pos(*args, **kwargs)
+
+    def copy_rates_range(self, *args, **kwargs):
+        return self.module.copy_rates_range(*args, **kwargs)
+
+    def copy_ticks_from(self, *args, **kwargs):
+        return self.module.copy_ticks_from(*args, **kwargs)
+
+    def copy_ticks_range(self, *args, **kwargs):
+        return self.module.copy_ticks_range(*args, **kwargs)
+
+    def positions_get(self, *args, **kwargs):
+        return self.module.positions_get(*args, **kwargs)
+
+    def orders_get(self, *args, **kwargs):
+        return self.module.orders_get(*args, **kwargs)
+
+    def order_send(self, *args, **kwargs):
+        return self.module.order_send(*args, **kwargs)
+
+
+_gateway: BrokerGateway | None = None
+
+
+def set_gateway(gateway: BrokerGateway | None):
+    """
+    Install the broker every `mt5.*` call goes to (None = real terminal).
+    """
+    global _gateway
+    _gateway = gateway
+
+
+def get_gateway() -> BrokerGateway:
+    global _gateway
+
+    if _gateway is None:
+        _gateway = MT5Gateway()  # ImportError without a terminal
+
+    return _gateway
+
+
+def __getattr__(name):
+    # Module attribute lookup only lands here for non-constants
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return getattr(get_gateway(), name)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+FIELDS = ("time", "open", "high", "low", "close")
+
+
+class Candle:
+    """
+    Lightweight view of ONE bar inside CandleColumns.
+    Reads like a DataFrame row: candle["high"].
+    """
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns: "CandleColumns", index: int):
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, field):
+        return getattr(self.columns, field)[self.index]
+
+    def __repr__(self):
+        values = " ".join(f"{f}={self[f]}" for f in FIELDS)
+        return f"Candle({self.index}: {values})"
+
+
+class CandleColumns:
+    """
+    Contiguous NumPy columns for a bar series.
+
+    - time is an object array of the ORIGINAL pd.Timestamp values,
+      so views compare and record exactly like df.iloc[i]
+    - slicing returns views (no copies)
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close")
+
+    def __init__(self, time, open, high, low, close):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CandleColumns":
+        return cls(
+            time=df["time"].to_numpy(dtype=object),
+            open=np.ascontiguousarray(df["open"].to_numpy(dtype=np.float64)),
+            high=np.ascontiguousarray(df["high"].to_numpy(dtype=np.float64)),
+            low=np.ascontiguousarray(df["low"].to_numpy(dtype=np.float64)),
+            close=np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64)),
+        )
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return CandleColumns(*(getattr(self, f)[key] for f in FIELDS))
+
+        if key < 0:
+            key += len(self)
+        return Candle(self, key)
@@ -1,5 +1,13 @@
+import struct
 from datetime import datetime
+from core.event_bus import EventBus
+from core.event_log import get_logger
 from core.liquidity_event_state import CleanupConfirmed
+from core.snapshot_codec import pack_time, unpack_time
+
+DIRECTIONS = (None, "BUY", "SELL")
+
+log = get_logger("cleanup_detector")
 
 
 class CleanupDetector:
@@ -8,7 +16,11 @@ class CleanupDetector:
     in the OPPOSITE direction of the failed attempt.
     """
 
-    def __init__(self):
+    # failure_direction, cleaned, failure_time
+    STATE = struct.Struct("<BBbq")
+
+    def __init__(self, bus: EventBus | None = None):
+        self.bus = bus or EventBus()
         self.failure_direction = None
         self.failure_time = None
         self.cleaned = False
@@ -38,15 +50,39 @@ class CleanupDetector:
         if direction != self.failure_direction:
             self.cleaned = True
 
-            CleanupConfirmed.emit(
+            log.info(
+                "cleanup_confirmed",
                 failure_direction=self.failure_direction,
                 failure_time=self.failure_time,
-                cleanup_time=time
+                cleanup_time=time,
             )
 
+            self.bus.publish(CleanupConfirmed(
+                failure_direction=self.failure_direction,
+                failure_time=self.failure_time,
+                cleanup_time=time
+            ))
+
             # lock
             self._reset()
 
+    # ─────────────────────────────────────────────
+    # SNAPSHOT / RESTORE
+    # ─────────────────────────────────────────────
+    def snapshot(self) -> bytes:
+        return self.STATE.pack(
+            DIRECTIONS.index(self.failure_direction),
+            self.cleaned,
+            *pack_time(self.failure_time),
+        )
+
+    def restore(self, data: bytes):
+        direction, cleaned, *failure_time = self.STATE.unpack(data)
+
+        self.failure_direction = DIRECTIONS[direction]
+        self.failure_time = unpack_time(*failure_time)
+        self.cleaned = bool(cleaned)
+
     # ─────────────────────────────────────────────
     # INTERNAL
     # ─────────────────────────────────────────────
@@ -0,0 +1,88 @@
+"""
+Clock used by the live engine.
+
+Live code asks this module for the time instead of datetime.now() /
+datetime.utcnow() / time.sleep(), so a replay can swap in a
+VirtualClock and run the exact same components as fast as the CPU
+allows.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class SystemClock:
+    """
+    Wall clock (default).
+    """
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Time only moves when told to. sleep() jumps instead of waiting.
+
+    on_advance(target) is called before the clock moves — e.g.
+    MT5Simulator.advance_to, so fills happen on the way.
+    """
+
+    def __init__(self, start: datetime, on_advance=None):
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+
+        self._now = start
+        self.on_advance = on_advance
+
+    def now(self) -> datetime:
+        return self._now
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self.advance_to(self._now + timedelta(seconds=seconds))
+
+    def advance_to(self, target: datetime):
+        if target <= self._now:
+            return
+
+        if self.on_advance is not None:
+            self.on_advance(target)
+        self._now = target
+
+
+_clock = SystemClock()
+
+
+def set_clock(clock):
+    """
+    Install the clock every live component reads (None = wall clock).
+    """
+    global _clock
+    _clock = clock or SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def now() -> datetime:
+    """
+    Aware UTC — replaces datetime.now(timezone.utc).
+    """
+    return _clock.now()
+
+
+def utcnow() -> datetime:
+    """
+    Naive UTC — replaces datetime.utcnow().
+    """
+    return _clock.now().replace(tzinfo=None)
+
+
+def sleep(seconds: float):
+    _clock.sleep(seconds)
@@ -1,10 +1,17 @@
+import struct
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 
-from core.liquidity_event_state import OriginConfirmed, ProbeTriggered
+from core import clock
+from core.event_bus import EventBus
+from core.event_log import get_logger
+from core.liquidity_event_state import OriginConfirmed, ProbeTriggered, LifecycleResolved
+from core.snapshot_codec import (
+    pack_enum, pack_float, pack_time, unpack_enum, unpack_float, unpack_time
+)
 
-from core.liquidity_event_state import ProbeTriggered, LifecycleResolved
+log = get_logger("entry_engine")
 
 
 class Direction(Enum):
@@ -29,7 +36,12 @@ class EntryEngine:
     Triggers exactly once.
     """
 
-    def __init__(self, timeout_minutes=120):
+    # direction (0 = no context), triggered, origin_high, origin_low,
+    # origin_time, armed_time
+    STATE = struct.Struct("<BBddbqbq")
+
+    def __init__(self, timeout_minutes=120, bus: EventBus | None = None):
+        self.bus = bus or EventBus()
         self.context: ProbeContext | None = None
         self.timeout = timedelta(minutes=timeout_minutes)
 
@@ -47,7 +59,7 @@ class EntryEngine:
             origin_high=candle["high"],
             origin_low=candle["low"],
             origin_time=candle["time"],
-            armed_time=datetime.utcnow()
+            armed_time=clock.utcnow()
         )
 
     # ─────────────────────────────────────────────
@@ -58,7 +70,7 @@ class EntryEngine:
             return
 
         # Timeout
-        if datetime.utcnow() - self.context.armed_time > self.timeout:
+        if clock.utcnow() - self.context.armed_time > self.timeout:
             self._cancel("TIMEOUT")
             return
 
@@ -66,6 +78,34 @@ class EntryEngine:
         if self._inside_origin_range(candle):
             self._trigger(candle)
 
+    # ─────────────────────────────────────────────
+    # SNAPSHOT / RESTORE
+    # ─────────────────────────────────────────────
+    def snapshot(self) -> bytes:
+        ctx = self.context
+        return self.STATE.pack(
+            pack_enum(ctx.direction if ctx else None, Direction),
+            ctx.triggered if ctx else False,
+            pack_float(ctx.origin_high if ctx else None),
+            pack_float(ctx.origin_low if ctx else None),
+            *pack_time(ctx.origin_time if ctx else None),
+            *pack_time(ctx.armed_time if ctx else None),
+        )
+
+    def restore(self, data: bytes):
+        direction, triggered, high, low, *times = self.STATE.unpack(data)
+
+        self.context = None
+        if direction:
+            self.context = ProbeContext(
+                direction=unpack_enum(direction, Direction),
+                origin_high=unpack_float(high),
+                origin_low=unpack_float(low),
+                origin_time=unpack_time(*times[:2]),
+                armed_time=unpack_time(*times[2:]),
+                triggered=bool(triggered)
+            )
+
     # ─────────────────────────────────────────────
     # Rules
     # ─────────────────────────────────────────────
@@ -81,22 +121,30 @@ class EntryEngine:
     def _trigger(self, candle):
         self.context.triggered = True
 
-        ProbeTriggered.emit(
+        log.info(
+            "probe_triggered",
+            direction=self.context.direction.value,
+            origin_high=self.context.origin_high,
+            origin_low=self.context.origin_low,
+            trigger_time=candle["time"],
+        )
+
+        self.bus.publish(ProbeTriggered(
             direction=self.context.direction.value,
             origin_high=self.context.origin_high,
             origin_low=self.context.origin_low,
             origin_time=self.context.origin_time,
             trigger_time=candle["time"]
-        )
+        ))
 
         self.context = None  # 🔒 LOCK
 
     def _cancel(self, reason):
-        print(f"🚫 PROBE CANCELLED — {reason}")
+        log.info("probe_cancelled", reason=reason)
 
-        LifecycleResolved.emit(
+        self.bus.publish(LifecycleResolved(
             reason=f"PROBE_{reason}",
-            time=datetime.utcnow()
-        )
+            time=clock.utcnow()
+        ))
 
         self.context = None
@@ -0,0 +1,83 @@
+import time
+from collections import defaultdict, deque
+
+
+class Event:
+    """
+    Base for typed events. Subclasses declare __slots__ and are plain
+    value objects — no behaviour, no I/O.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class EventBus:
+    """
+    In-process publish / subscribe, one bus per engine (per symbol).
+
+    - any number of subscribers per event type, called in subscription order
+    - mode="sync":   publish() delivers immediately (nested publishes
+                     are delivered depth-first, like direct calls)
+    - mode="queued": publish() only enqueues; drain() delivers FIFO
+    - published / dispatch_ns count events and time spent in handlers
+      per type (timing only when timed=True)
+    """
+
+    SYNC = "sync"
+    QUEUED = "queued"
+
+    def __init__(self, mode: str = SYNC, timed: bool = False):
+        if mode not in (self.SYNC, self.QUEUED):
+            raise ValueError(f"Unknown delivery mode: {mode}")
+
+        self.mode = mode
+        self.timed = timed
+
+        self._subscribers = defaultdict(list)
+        self._queue = deque()
+
+        self.published = defaultdict(int)
+        self.dispatch_ns = defaultdict(int)
+
+    def subscribe(self, event_type: type, handler):
+        self._subscribers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: type, handler):
+        self._subscribers[event_type].remove(handler)
+
+    def publish(self, event: Event):
+        self.published[type(event)] += 1
+
+        if self.mode == self.QUEUED:
+            self._queue.append(event)
+        else:
+            self._deliver(event)
+
+    def drain(self) -> int:
+        """
+        Deliver queued events (including ones published while draining).
+        """
+        delivered = 0
+        while self._queue:
+            self._deliver(self._queue.popleft())
+            delivered += 1
+        return delivered
+
+    def _deliver(self, event: Event):
+        handlers = self._subscribers.get(type(event))
+        if not handlers:
+            return
+
+        if not self.timed:
+            for handler in handlers:
+                handler(event)
+            return
+
+        start = time.perf_counter_ns()
+        for handler in handlers:
+            handler(event)
+        self.dispatch_ns[type(event)] += time.perf_counter_ns() - start
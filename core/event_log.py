@@ -0,0 +1,267 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# =============================
+# LEVELS
+# =============================
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+FLUSH_INTERVAL = 1.0    # seconds between background flushes
+FLUSH_RECORDS = 1024    # flush early once this many records are buffered
+DATE_FORMAT = "%Y%m%d"  # {date} in a log path
+
+
+def _noop(event, **fields):
+    pass
+
+
+class ComponentLog:
+    """
+    Logger handle for ONE component.
+
+    debug / info / warning / error are rebound on configuration:
+    below the level, or with the component switched off, they are a
+    no-op — no formatting, no locking, no I/O at the call site.
+    """
+
+    __slots__ = ("name", "debug", "info", "warning", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._bind(None)
+
+    def _bind(self, sink):
+        for level, attr in ((DEBUG, "debug"), (INFO, "info"), (WARNING, "warning"), (ERROR, "error")):
+            if sink is None or not sink.wants(self.name, level):
+                setattr(self, attr, _noop)
+            else:
+                setattr(self, attr, sink.writer(self.name, level))
+
+
+class JsonLinesSink:
+    """
+    Buffered JSON-lines file. Call sites only append a tuple to a deque;
+    a daemon thread serializes and writes in batches.
+
+    A path containing {date} rolls over on the UTC date of each record
+    (e.g. logs/live_{date}.jsonl → logs/live_20250101.jsonl, ...).
+    """
+
+    def __init__(self, path: str, level: int = INFO, components: dict | None = None):
+        self.pattern = path
+        self.path = None
+        self.level = level
+        self.components = dict(components or {})
+
+        self._records = deque()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+
+        self._rolling = "{date}" in path
+        self._date = None
+        self._file = None
+        if not self._rolling:
+            self._open(path)
+
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def wants(self, component: str, level: int) -> bool:
+        return level >= self.level and self.components.get(component, True)
+
+    def writer(self, component: str, level: int):
+        records = self._records
+        wake = self._wake
+
+        def write(event, **fields):
+            records.append((time.time(), level, component, event, fields))
+            if len(records) >= FLUSH_RECORDS:
+                wake.set()
+
+        return write
+
+    def flush(self):
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        records = self._records
+        lines = []
+
+        while records:
+            ts, level, component, event, fields = records.popleft()
+
+            if self._rolling:
+                date = time.strftime(DATE_FORMAT, time.gmtime(ts))
+                if date != self._date:
+                    self._write(lines)
+                    lines = []
+                    self._date = date
+                    self._open(self.pattern.format(date=date))
+
+            lines.append(json.dumps(
+                {
+                    "ts": ts,
+                    "level": LEVEL_NAMES[level],
+                    "component": component,
+                    "event": event,
+                    **fields,
+                },
+                default=str,
+                separators=(",", ":"),
+            ))
+
+        self._write(lines)
+
+    def _write(self, lines):
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+
+    def _open(self, path: str):
+        if self._file is not None:
+            self._file.close()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._file = open(path, "a", buffering=1 << 16)
+
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+
+# =============================
+# GLOBAL CONFIGURATION
+# =============================
+_loggers: dict[str, ComponentLog] = {}
+_sink: JsonLinesSink | None = None
+_lock = threading.Lock()
+
+
+def get_logger(component: str) -> ComponentLog:
+    """
+    Shared handle per component name; follows every configure().
+    """
+    with _lock:
+        log = _loggers.get(component)
+        if log is None:
+            log = _loggers[component] = ComponentLog(component)
+            log._bind(_sink)
+        return log
+
+
+def configure(
+    path: str | None = None,
+    level: int = INFO,
+    components: dict | None = None,
+    silent: bool = False,
+):
+    """
+    path=None or silent=True → everything off (the default until configured,
+    and what backtests use). A {date} in path rolls the file on the UTC
+    date. components={"flip_executor": False, ...} switches single
+    components off.
+    """
+    global _sink
+
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+
+        _sink = _new_sink(path, level, components, silent)
+        _rebind()
+
+
+@contextmanager
+def configured(
+    path: str | None = None,
+    level: int = INFO,
+    components: dict | None = None,
+    silent: bool = False,
+):
+    """
+    configure() for the duration of a with-block only. The caller's
+    sink stays open and is bound again on exit — a backtest inside a
+    live or test process does not switch its logging off for good.
+    """
+    global _sink
+
+    with _lock:
+        previous = _sink
+        _sink = _new_sink(path, level, components, silent)
+        _rebind()
+
+    try:
+        yield
+    finally:
+        with _lock:
+            scoped, _sink = _sink, previous
+            _rebind()
+
+        if scoped is not None and scoped is not previous:
+            scoped.close()
+
+
+def _new_sink(path, level, components, silent) -> JsonLinesSink | None:
+    if path is None or silent:
+        return None
+    return JsonLinesSink(path, level, components)
+
+
+def _rebind():
+    for log in _loggers.values():
+        log._bind(_sink)
+
+
+def set_component(component: str, enabled: bool):
+    with _lock:
+        if _sink is None:
+            return
+
+        _sink.components[component] = enabled
+
+        log = _loggers.get(component)
+        if log is not None:
+            log._bind(_sink)
+
+
+def flush():
+    if _sink is not None:
+        _sink.flush()
+
+
+def shutdown():
+    configure(silent=True)
+
+
+atexit.register(shutdown)
@@ -1,8 +1,14 @@
+import struct
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from core.event_bus import EventBus
+from core.event_log import get_logger
 from core.liquidity_event_state import FailureConfirmed
+from core.snapshot_codec import pack_enum, pack_time, unpack_enum, unpack_time
+
+log = get_logger("failure_detector")
 
 
 class Direction(Enum):
@@ -22,7 +28,11 @@ class FailureDetector:
     Declares failure ONLY on structural contradiction.
     """
 
-    def __init__(self):
+    # direction (0 = no attempt), failed, sweep_time, last_sweep_time
+    STATE = struct.Struct("<BBbqbq")
+
+    def __init__(self, bus: EventBus | None = None):
+        self.bus = bus or EventBus()
         self.attempt: LiquidityAttempt | None = None
         self.last_sweep_time: datetime | None = None
 
@@ -46,10 +56,41 @@ class FailureDetector:
         if direction != self.attempt.direction.value:
             self.attempt.failed = True
 
-            FailureConfirmed.emit(
+            log.info(
+                "failure_confirmed",
                 direction=self.attempt.direction.value,
                 sweep_time=self.attempt.sweep_time,
-                failure_time=time
+                failure_time=time,
             )
 
+            self.bus.publish(FailureConfirmed(
+                direction=self.attempt.direction.value,
+                sweep_time=self.attempt.sweep_time,
+                failure_time=time
+            ))
+
             self.attempt = None  # lock
+
+    # ─────────────────────────────────────────────
+    # SNAPSHOT / RESTORE
+    # ─────────────────────────────────────────────
+    def snapshot(self) -> bytes:
+        attempt = self.attempt
+        return self.STATE.pack(
+            pack_enum(attempt.direction if attempt else None, Direction),
+            attempt.failed if attempt else False,
+            *pack_time(attempt.sweep_time if attempt else None),
+            *pack_time(self.last_sweep_time),
+        )
+
+    def restore(self, data: bytes):
+        direction, failed, *times = self.STATE.unpack(data)
+
+        self.attempt = None
+        if direction:
+            self.attempt = LiquidityAttempt(
+                direction=unpack_enum(direction, Direction),
+                sweep_time=unpack_time(*times[:2]),
+                failed=bool(failed)
+            )
+        self.last_sweep_time = unpack_time(*times[2:])
@@ -1,8 +1,12 @@
-import MetaTrader5 as mt5
+from core import broker as mt5
 from datetime import datetime
 from dataclasses import dataclass
 
-from core.liquidity_event_state import LifecycleResolved
+from core import clock
+from core.event_bus import EventBus
+from core.event_log import get_logger
+from core.liquidity_event_state import LifecycleResolved, ProbeTriggered
+from core.symbol_specs import get_spec, lot_size
 
 
 # ─────────────────────────────────────────────
@@ -11,7 +15,8 @@ from core.liquidity_event_state import LifecycleResolved
 RISK_USD = 3000          # fixed risk for now
 RR_RATIO = 3.0           # risk : reward
 SL_BUFFER_PIPS = 2       # buffer beyond origin
-PIP = 0.0001             # EURUSD
+
+log = get_logger("flip_executor")
 
 
 @dataclass
@@ -21,6 +26,15 @@ class FlipContext:
     origin_low: float
     trigger_time: datetime
 
+    @classmethod
+    def from_event(cls, event: ProbeTriggered):
+        return cls(
+            direction=event.direction,
+            origin_high=event.origin_high,
+            origin_low=event.origin_low,
+            trigger_time=event.trigger_time
+        )
+
 
 class FlipExecutor:
     """
@@ -28,44 +42,66 @@ class FlipExecutor:
     Pure execution layer.
     """
 
-    def __init__(self, symbol: str):
+    def __init__(
+        self,
+        symbol: str,
+        rr_ratio: float = RR_RATIO,
+        sl_buffer_pips: float = SL_BUFFER_PIPS,
+        bus: EventBus | None = None,
+    ):
+        self.bus = bus or EventBus()
         self.symbol = symbol
+        self.rr_ratio = rr_ratio
+        self.sl_buffer_pips = sl_buffer_pips
 
     # ─────────────────────────────────────────────
     # EVENT: Probe triggered
     # ─────────────────────────────────────────────
-    def on_probe_triggered(self, event):
-        ctx = FlipContext(
-            direction=event.direction,
-            origin_high=event.origin_high,
-            origin_low=event.origin_low,
-            trigger_time=event.trigger_time
-        )
+    def on_probe_triggered(self, event: ProbeTriggered):
+        self.run(FlipContext.from_event(event))
+
+    def run(self, ctx: FlipContext):
+        """
+        Execute + resolve the lifecycle (same thread).
+        """
+        reason = self.execute(ctx)
 
-        self._execute(ctx)
+        if reason:
+            self.bus.publish(LifecycleResolved(
+                reason=reason,
+                time=clock.utcnow()
+            ))
 
     # ─────────────────────────────────────────────
     # EXECUTION
     # ─────────────────────────────────────────────
-    def _execute(self, ctx: FlipContext):
+    def execute(self, ctx: FlipContext) -> str | None:
+        """
+        Blocking MT5 submission — safe to run on the MT5 thread.
+        Returns the lifecycle resolution reason (None = no tick, nothing sent).
+        """
         tick = mt5.symbol_info_tick(self.symbol)
         if not tick:
-            return
+            return None
+
+        spec = get_spec(self.symbol)
+        if spec is None:
+            log.error("flip_failed", symbol=self.symbol, direction=ctx.direction, reason="no_symbol_spec")
+            return "FLIP_FAILED"
 
         if ctx.direction == "BUY":
             entry = tick.ask
-            stop_loss = ctx.origin_low - SL_BUFFER_PIPS * PIP
-            risk_per_lot = abs(entry - stop_loss)
-            take_profit = entry + RR_RATIO * risk_per_lot
             order_type = mt5.ORDER_TYPE_BUY
         else:
             entry = tick.bid
-            stop_loss = ctx.origin_high + SL_BUFFER_PIPS * PIP
-            risk_per_lot = abs(stop_loss - entry)
-            take_profit = entry - RR_RATIO * risk_per_lot
             order_type = mt5.ORDER_TYPE_SELL
 
-        volume = self._calculate_lot_size(risk_per_lot)
+        stop_loss, take_profit = flip_prices(
+            ctx, entry, spec.pip_size, self.rr_ratio, self.sl_buffer_pips
+        )
+        risk_per_lot = abs(entry - stop_loss)
+
+        volume = lot_size(spec, RISK_USD, risk_per_lot)
 
         request = {
             "action": mt5.TRADE_ACTION_DEAL,
@@ -85,37 +121,45 @@ class FlipExecutor:
         result = mt5.order_send(request)
 
         if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            print("🟢 FLIP EXECUTED")
-            print(f"Ticket: {result.order}")
-            print(f"Direction: {ctx.direction}")
-            print(f"Entry: {entry}")
-            print(f"SL: {stop_loss}")
-            print(f"TP: {take_profit}")
-
-            LifecycleResolved.emit(
-                reason="FLIP_EXECUTED",
-                time=datetime.utcnow()
+            log.info(
+                "flip_executed",
+                symbol=self.symbol,
+                ticket=result.order,
+                direction=ctx.direction,
+                entry=entry,
+                sl=stop_loss,
+                tp=take_profit,
             )
-        else:
-            print("❌ FLIP EXECUTION FAILED")
-            print(result)
 
-            LifecycleResolved.emit(
-                reason="FLIP_FAILED",
-                time=datetime.utcnow()
-            )
+            return "FLIP_EXECUTED"
 
-    # ─────────────────────────────────────────────
-    # RISK
-    # ─────────────────────────────────────────────
-    def _calculate_lot_size(self, risk_per_lot):
-        symbol_info = mt5.symbol_info(self.symbol)
-        if not symbol_info:
-            return 0.01
+        log.error(
+            "flip_failed",
+            symbol=self.symbol,
+            direction=ctx.direction,
+            retcode=getattr(result, "retcode", None),
+            result=result,
+        )
+
+        return "FLIP_FAILED"
+
+
+def flip_prices(
+    ctx: FlipContext,
+    entry: float,
+    pip_size: float,
+    rr_ratio: float = RR_RATIO,
+    sl_buffer_pips: float = SL_BUFFER_PIPS,
+) -> tuple[float, float]:
+    """
+    (stop_loss, take_profit): SL beyond the origin by the pip buffer,
+    TP at rr_ratio × risk. Shared with the bar-driven backtest.
+    """
+    buffer = sl_buffer_pips * pip_size
 
-        tick_value = symbol_info.trade_tick_value
-        lot = RISK_USD / (risk_per_lot / PIP * tick_value)
+    if ctx.direction == "BUY":
+        stop_loss = ctx.origin_low - buffer
+        return stop_loss, entry + rr_ratio * abs(entry - stop_loss)
 
-        lot = max(symbol_info.volume_min, lot)
-        lot = min(symbol_info.volume_max, lot)
-        return round(lot, 2)
+    stop_loss = ctx.origin_high + buffer
+    return stop_loss, entry - rr_ratio * abs(stop_loss - entry)
@@ -1,7 +1,16 @@
-import MetaTrader5 as mt5
-from datetime import datetime, timedelta, timezone
+import numpy as np
+from datetime import date, datetime, timedelta, timezone
 from dataclasses import dataclass
-from collections import defaultdict
+
+from core import broker as mt5
+from core import clock
+from core.bar_store import TIMEFRAME_H1
+from core.liquidity_clustering import cluster_levels
+from core.liquidity_mitigation import first_crossings
+
+
+EPOCH_DATE = date(1970, 1, 1)
+SECONDS_PER_DAY = 86400
 
 
 # =============================
@@ -14,6 +23,7 @@ class LiquidityLevel:
     timestamp: datetime
     mitigated: bool = False
     day_tag: str | None = None
+    mitigated_at: datetime | None = None
 
 
 class H1LiquidityBuilder:
@@ -27,53 +37,103 @@ class H1LiquidityBuilder:
 
     CLUSTER_TOLERANCE = 0.0005   # 5 pips
     MIN_TOUCHES = 2
-
-    def __init__(self, symbol: str, reference_date: datetime | None = None):
+    CLUSTER_FIRST_FIT = False    # True = original first-fit clustering
+    LOOKBACK_DAYS = 5
+
+    def __init__(
+        self,
+        symbol: str,
+        reference_date: datetime | None = None,
+        source=None,
+        cluster_tolerance: float | None = None,
+        min_touches: int | None = None,
+    ):
+        """
+        source: anything with copy_rates_range() — the broker gateway
+        (default) or a core.bar_store.BarStore for offline builds.
+        cluster_tolerance / min_touches override the class defaults.
+        """
         self.symbol = symbol
         self.reference_date = reference_date
-
-    def build(self):
+        self.source = source or mt5
+
+        if cluster_tolerance is not None:
+            self.CLUSTER_TOLERANCE = cluster_tolerance
+        if min_touches is not None:
+            self.MIN_TOUCHES = min_touches
+
+    def build(self, include_mitigated: bool = False):
+        """
+        include_mitigated=True also returns levels that were already
+        mitigated inside the window (with mitigated_at), for analysis.
+        """
         today = (
             self.reference_date.date()
             if self.reference_date
-            else datetime.now(timezone.utc).date()
+            else clock.now().date()
         )
 
-        start_day = today - timedelta(days=5)
+        rates = self.fetch_rates(today)
+
+        return self.build_from_rates(rates, today, include_mitigated)
+
+    # =============================
+    # WINDOW
+    # =============================
+    def window(self, today: date):
+        """
+        (start, end) of the lookback window for a trading day.
+        """
+        start_day = today - timedelta(days=self.LOOKBACK_DAYS)
         start = datetime.combine(start_day, datetime.min.time(), tzinfo=timezone.utc)
         end = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+        return start, end
+
+    def fetch_rates(self, today: date):
+        start, end = self.window(today)
 
-        rates = mt5.copy_rates_range(
+        return self.source.copy_rates_range(
             self.symbol,
-            mt5.TIMEFRAME_H1,
+            TIMEFRAME_H1,
             start,
             end
         )
 
+    # =============================
+    # CORE LOGIC
+    # =============================
+    def build_from_rates(self, rates, today: date, include_mitigated: bool = False):
+        """
+        Builds liquidity for `today` from an H1 structured array
+        (copy_rates_range shape) covering the lookback window.
+        """
+        start, _ = self.window(today)
+
         if rates is None or len(rates) < 50:
             return {"BUY_SIDE": [], "SELL_SIDE": []}
 
-        rates = list(rates)
-
         liquidity = {"BUY_SIDE": [], "SELL_SIDE": []}
 
+        times = rates["time"].astype(np.int64)
+        highs = rates["high"].astype(np.float64)
+        lows = rates["low"].astype(np.float64)
+
         # -----------------------------
         # 1️⃣ PRIOR DAY HIGH / LOW
         # -----------------------------
-        by_day = defaultdict(list)
+        day_index = times // SECONDS_PER_DAY
+        days, day_starts = np.unique(day_index, return_index=True)
+
+        day_highs = np.maximum.reduceat(highs, day_starts)
+        day_lows = np.minimum.reduceat(lows, day_starts)
 
-        for candle in rates:
-            ts = datetime.fromtimestamp(candle["time"], tz=timezone.utc)
-            by_day[ts.date()].append(candle)
+        for day_number, high, low in zip(days.tolist(), day_highs, day_lows):
+            day = EPOCH_DATE + timedelta(days=day_number)
 
-        for day, candles in by_day.items():
             day_diff = (today - day).days
-            if day_diff <= 0 or day_diff > 5:
+            if day_diff <= 0 or day_diff > self.LOOKBACK_DAYS:
                 continue
 
-            high = max(c["high"] for c in candles)
-            low = min(c["low"] for c in candles)
-
             tag = f"D-{day_diff}"
 
             # Prior Day High = BUY-SIDE liquidity (upside stops)
@@ -99,51 +159,18 @@ class H1LiquidityBuilder:
         # -----------------------------
         # 2️⃣ MULTI-TOUCH CLUSTERS
         # -----------------------------
-        highs = []
-        lows = []
-
-        for candle in rates:
-            highs.append(candle["high"])
-            lows.append(candle["low"])
-
-        def cluster_levels(prices):
-            clusters = []
-
-            for p in prices:
-                found = False
-                for cluster in clusters:
-                    if abs(cluster[0] - p) <= self.CLUSTER_TOLERANCE:
-                        cluster.append(p)
-                        found = True
-                        break
-
-                if not found:
-                    clusters.append([p])
-
-            return clusters
-
-        high_clusters = cluster_levels(highs)
-        low_clusters = cluster_levels(lows)
-
-        for cluster in high_clusters:
-            if len(cluster) >= self.MIN_TOUCHES:
-                price = sum(cluster) / len(cluster)
-                liquidity["BUY_SIDE"].append(
-                    LiquidityLevel(
-                        price=float(price),
-                        type="BUY_SIDE",
-                        timestamp=start,
-                        day_tag="CLUSTER",
-                    )
-                )
+        for side, prices in (("BUY_SIDE", highs), ("SELL_SIDE", lows)):
+            means, counts = cluster_levels(
+                prices,
+                self.CLUSTER_TOLERANCE,
+                first_fit=self.CLUSTER_FIRST_FIT
+            )
 
-        for cluster in low_clusters:
-            if len(cluster) >= self.MIN_TOUCHES:
-                price = sum(cluster) / len(cluster)
-                liquidity["SELL_SIDE"].append(
+            for price in means[counts >= self.MIN_TOUCHES]:
+                liquidity[side].append(
                     LiquidityLevel(
                         price=float(price),
-                        type="SELL_SIDE",
+                        type=side,
                         timestamp=start,
                         day_tag="CLUSTER",
                     )
@@ -152,18 +179,21 @@ class H1LiquidityBuilder:
         # -----------------------------
         # 3️⃣ MITIGATION CHECK
         # -----------------------------
-        for candle in rates:
-            candle_time = datetime.fromtimestamp(candle["time"], tz=timezone.utc)
-
-            for lvl in liquidity["BUY_SIDE"]:
-                if not lvl.mitigated and candle_time > lvl.timestamp:
-                    if candle["high"] >= lvl.price:
-                        lvl.mitigated = True
+        for side, extremes in (("BUY_SIDE", highs), ("SELL_SIDE", lows)):
+            levels = liquidity[side]
+
+            hits = first_crossings(
+                times,
+                extremes,
+                [int(lvl.timestamp.timestamp()) for lvl in levels],
+                [lvl.price for lvl in levels],
+                side
+            )
 
-            for lvl in liquidity["SELL_SIDE"]:
-                if not lvl.mitigated and candle_time > lvl.timestamp:
-                    if candle["low"] <= lvl.price:
-                        lvl.mitigated = True
+            for lvl, hit in zip(levels, hits.tolist()):
+                if hit >= 0:
+                    lvl.mitigated = True
+                    lvl.mitigated_at = datetime.fromtimestamp(int(times[hit]), tz=timezone.utc)
 
         # -----------------------------
         # 4️⃣ DEDUPE (KEEP MOST RECENT)
@@ -176,7 +206,12 @@ class H1LiquidityBuilder:
                 key = round(lvl.price, 4)
                 if key not in by_bucket or lvl.timestamp > by_bucket[key].timestamp:
                     by_bucket[key] = lvl
-            return list(by_bucket.values())
+            kept = list(by_bucket.values())
+
+            if include_mitigated:
+                kept.extend(lvl for lvl in levels if lvl.mitigated)
+
+            return kept
 
         return {
             "BUY_SIDE": dedupe(liquidity["BUY_SIDE"]),
@@ -0,0 +1,228 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from core import clock
+from core.bar_store import RATES_DTYPE, TIMEFRAME_H1
+from core.h1_liquidity_builder import H1LiquidityBuilder, LiquidityLevel
+from core.liquidity_book import LiquidityBook
+
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+
+class H1LiquidityTracker:
+    """
+    Keeps H1 liquidity current from the stream of CLOSED H1 bars.
+
+    Rules:
+    - Levels for a UTC day are exactly what H1LiquidityBuilder.build()
+      returns for that day (same window, clusters, mitigation, dedupe)
+    - Every new closed bar mitigates crossed levels (LiquidityBook, O(log n))
+    - On the first bar of a new UTC day the lookback window rolls
+      forward in memory and levels are rebuilt from it — no re-fetch
+
+    mitigate_intraday=False keeps each day's levels exactly as build()
+    produced them (point-in-time backtests handle sweeps themselves).
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        builder: H1LiquidityBuilder | None = None,
+        mitigate_intraday: bool = True,
+    ):
+        self.builder = builder or H1LiquidityBuilder(symbol)
+        self.mitigate_intraday = mitigate_intraday
+
+        self.today: date | None = None
+        self.window_rates = None          # structured array, lookback window
+        self.day_bars = []                # closed bars of `today`
+        self.last_bar_time: int | None = None
+        self._rolled_early = False        # roll_to() ran before today's 00:00 bar closed
+
+        self.levels = LiquidityBook({"BUY_SIDE": [], "SELL_SIDE": []})
+
+    # =============================
+    # LIFECYCLE
+    # =============================
+    def seed(self, today: date | None = None, levels: dict | None = None):
+        """
+        Fetch the lookback window ONCE and build today's levels, then
+        ingest today's bars closed so far — a mid-day start ends up in
+        the same state as a tracker running since 00:00.
+        Persisted levels (same day) replace the fresh build BEFORE the
+        bars are ingested: intraday mitigation survives a restart, and
+        bars closed while we were down still mitigate what they crossed.
+        """
+        now = clock.now()
+        today = today or now.date()
+
+        rates = self.builder.fetch_rates(today)
+        self._roll(today, rates)
+
+        if levels is not None:
+            self._load_levels(levels)
+
+        if today == now.date():
+            _, day_start = self.builder.window(today)
+            self.ingest(self.fetch_closed(day_start, now))
+
+    def next_close_due(self, now: datetime) -> bool:
+        """
+        True once a bar newer than the last ingested one has closed.
+        """
+        if self.last_bar_time is None:
+            return True
+
+        return now.timestamp() >= self.last_bar_time + 2 * SECONDS_PER_HOUR
+
+    def fetch_closed(self, since: datetime, now: datetime):
+        """
+        Every H1 bar opened at or after `since` and closed by `now`.
+        """
+        rates = self.builder.source.copy_rates_range(
+            self.builder.symbol, TIMEFRAME_H1, since, now
+        )
+        if rates is None or len(rates) == 0:
+            return rates
+
+        return rates[rates["time"] + SECONDS_PER_HOUR <= int(now.timestamp())]
+
+    # =============================
+    # CORE LOGIC
+    # =============================
+    def ingest(self, bars) -> list[LiquidityLevel]:
+        """
+        Feed closed H1 bars (copy_rates_* rows, oldest → newest).
+        Already-seen bars are ignored.
+
+        Returns the levels that changed (new or mitigated) — the delta
+        the caller needs to persist.
+        """
+        changed = []
+
+        if bars is None:
+            return changed
+
+        for bar in bars:
+            bar_time = int(bar["time"])
+
+            if self.last_bar_time is not None and bar_time <= self.last_bar_time:
+                continue
+
+            changed.extend(self.on_h1_bar_closed(bar))
+
+        return changed
+
+    def on_h1_bar_closed(self, bar) -> list[LiquidityLevel]:
+        bar_time = int(bar["time"])
+        bar_day = utc_day(bar_time)
+
+        changed = []
+        boundary = []
+
+        # build() includes the bar opening exactly at 00:00
+        day_start = bar_day.toordinal() - _EPOCH_ORDINAL
+        if bar_time == day_start * SECONDS_PER_DAY:
+            boundary = [bar]
+
+        # A day rolled at 00:00 is rebuilt once its 00:00 bar has closed
+        rebuild = self._rolled_early and bar_day == self.today and boundary
+        self._rolled_early = False
+
+        if self.today is None or bar_day > self.today or rebuild:
+            rates = self._concat(self.window_rates, self.day_bars + boundary)
+
+            self._roll(bar_day, rates)
+            changed.extend(lvl for side in self.levels.values() for lvl in side)
+
+        if not boundary:
+            self.day_bars.append(bar)
+        self.last_bar_time = bar_time
+
+        if self.mitigate_intraday:
+            changed.extend(self._mitigate(bar))
+        return changed
+
+    def roll_to(self, today: date) -> list[LiquidityLevel]:
+        """
+        Roll to a new UTC day at 00:00, before any of its bars closed.
+        The still-forming 00:00 bar is NOT part of the window until it
+        closes; on_h1_bar_closed() then rebuilds the day with it, as
+        build() has it.
+        """
+        if self.today is not None and today <= self.today:
+            return []
+
+        self._roll(today, self._concat(self.window_rates, self.day_bars))
+        self._rolled_early = True
+        return [lvl for side in self.levels.values() for lvl in side]
+
+    def mark_mitigated(self, level: LiquidityLevel, time: datetime):
+        """
+        External mitigation (e.g. live tick sweep).
+        """
+        self.levels.mark_mitigated(level.type, level, time)
+
+    # =============================
+    # INTERNAL
+    # =============================
+    def _roll(self, today: date, rates):
+        start, end = self.builder.window(today)
+
+        if rates is not None and len(rates):
+            times = rates["time"]
+            keep = (times >= int(start.timestamp())) & (times <= int(end.timestamp()))
+            rates = rates[keep]
+
+        self.today = today
+        self.window_rates = rates
+        self.day_bars = []
+
+        if rates is not None and len(rates):
+            self.last_bar_time = max(self.last_bar_time or 0, int(rates["time"][-1]))
+
+        self._load_levels(self.builder.build_from_rates(rates, today))
+
+    def _load_levels(self, levels: dict):
+        self.levels = LiquidityBook({
+            "BUY_SIDE": levels.get("BUY_SIDE", []),
+            "SELL_SIDE": levels.get("SELL_SIDE", []),
+        })
+
+    def _mitigate(self, bar) -> list[LiquidityLevel]:
+        bar_time = datetime.fromtimestamp(int(bar["time"]), tz=timezone.utc)
+
+        # BUY_SIDE: every level at or below the high is taken
+        # SELL_SIDE: every level at or above the low is taken
+        return (
+            self.levels.take_at_or_below("BUY_SIDE", float(bar["high"]), bar_time)
+            + self.levels.take_at_or_above("SELL_SIDE", float(bar["low"]), bar_time)
+        )
+
+    @staticmethod
+    def _concat(window_rates, bars):
+        if window_rates is not None:
+            dtype = window_rates.dtype
+        else:
+            dtype = bars[0].dtype if bars else RATES_DTYPE
+        parts = []
+
+        if window_rates is not None and len(window_rates):
+            parts.append(window_rates)
+        if bars:
+            parts.append(np.array(bars, dtype=dtype))
+
+        if not parts:
+            return np.empty(0, dtype=dtype)
+
+        return np.concatenate(parts)
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def utc_day(epoch_seconds: int) -> date:
+    return date.fromordinal(_EPOCH_ORDINAL + epoch_seconds // SECONDS_PER_DAY)
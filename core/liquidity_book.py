@@ -0,0 +1,176 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+class LiquidityBook:
+    """
+    Price-indexed liquidity levels.
+
+    - Keeps EVERY level per side (persistence, telemetry)
+    - Keeps UNMITIGATED levels sorted by price per side (bisect)
+    - Keeps ALL levels sorted by price per side too (include_mitigated
+      queries, e.g. TP targets)
+    - All queries are O(log n); sweep checks are O(1) when nothing
+      is crossed (compare against the extreme of the index)
+
+    Behaves like the plain {"BUY_SIDE": [...], "SELL_SIDE": [...]}
+    map for reads: book["BUY_SIDE"], book.items().
+    """
+
+    def __init__(self, liquidity_map: dict | None = None):
+        self.levels = {}
+        self._prices = {}
+        self._index = {}
+        self._all_prices = {}
+        self._all_index = {}
+
+        for side, levels in (liquidity_map or {}).items():
+            self.load(side, levels)
+
+    # =============================
+    # MAP INTERFACE
+    # =============================
+    def __getitem__(self, side):
+        return self.levels[side]
+
+    def __contains__(self, side):
+        return side in self.levels
+
+    def items(self):
+        return self.levels.items()
+
+    def keys(self):
+        return self.levels.keys()
+
+    def values(self):
+        return self.levels.values()
+
+    # =============================
+    # MUTATION
+    # =============================
+    def load(self, side: str, levels):
+        self.levels[side] = list(levels)
+
+        live = sorted(
+            (lvl for lvl in self.levels[side] if not lvl.mitigated),
+            key=lambda lvl: lvl.price
+        )
+        self._prices[side] = [lvl.price for lvl in live]
+        self._index[side] = live
+
+        every = sorted(self.levels[side], key=lambda lvl: lvl.price)
+        self._all_prices[side] = [lvl.price for lvl in every]
+        self._all_index[side] = every
+
+    def add(self, side: str, level):
+        self.levels.setdefault(side, []).append(level)
+
+        prices = self._all_prices.setdefault(side, [])
+        i = bisect_right(prices, level.price)
+        prices.insert(i, level.price)
+        self._all_index.setdefault(side, []).insert(i, level)
+
+        if level.mitigated:
+            return
+
+        prices = self._prices.setdefault(side, [])
+        index = self._index.setdefault(side, [])
+
+        i = bisect_right(prices, level.price)
+        prices.insert(i, level.price)
+        index.insert(i, level)
+
+    def mark_mitigated(self, side: str, level, time: datetime | None = None):
+        level.mitigated = True
+        level.mitigated_at = time
+
+        prices = self._prices.get(side, [])
+        index = self._index.get(side, [])
+
+        i = bisect_left(prices, level.price)
+        while i < len(prices) and prices[i] == level.price:
+            if index[i] is level:
+                del prices[i]
+                del index[i]
+                return
+            i += 1
+
+    def take_at_or_below(self, side: str, price: float, time: datetime | None = None):
+        """
+        Mitigates and returns every unmitigated level with level.price <= price.
+        """
+        prices = self._prices.get(side, [])
+        if not prices or prices[0] > price:
+            return []
+
+        cut = bisect_right(prices, price)
+        taken = self._index[side][:cut]
+        del prices[:cut]
+        del self._index[side][:cut]
+
+        for lvl in taken:
+            lvl.mitigated = True
+            lvl.mitigated_at = time
+
+        return taken
+
+    def take_at_or_above(self, side: str, price: float, time: datetime | None = None):
+        """
+        Mitigates and returns every unmitigated level with level.price >= price.
+        """
+        prices = self._prices.get(side, [])
+        if not prices or prices[-1] < price:
+            return []
+
+        cut = bisect_left(prices, price)
+        taken = self._index[side][cut:]
+        del prices[cut:]
+        del self._index[side][cut:]
+
+        for lvl in taken:
+            lvl.mitigated = True
+            lvl.mitigated_at = time
+
+        return taken
+
+    # =============================
+    # QUERIES
+    # =============================
+    def unmitigated(self, side: str):
+        """
+        Unmitigated levels, ascending by price.
+        """
+        return list(self._index.get(side, []))
+
+    def at_or_below(self, side: str, price: float):
+        """
+        Unmitigated levels with level.price <= price, ascending.
+        """
+        prices = self._prices.get(side, [])
+        if not prices or prices[0] > price:
+            return []
+        return self._index[side][:bisect_right(prices, price)]
+
+    def at_or_above(self, side: str, price: float):
+        """
+        Unmitigated levels with level.price >= price, ascending.
+        """
+        prices = self._prices.get(side, [])
+        if not prices or prices[-1] < price:
+            return []
+        return self._index[side][bisect_left(prices, price):]
+
+    def nearest_above(self, side: str, price: float, inclusive: bool = True, include_mitigated: bool = False):
+        prices, index = self._sorted(side, include_mitigated)
+        i = bisect_left(prices, price) if inclusive else bisect_right(prices, price)
+        return index[i] if i < len(prices) else None
+
+    def nearest_below(self, side: str, price: float, inclusive: bool = True, include_mitigated: bool = False):
+        prices, index = self._sorted(side, include_mitigated)
+        i = bisect_right(prices, price) if inclusive else bisect_left(prices, price)
+        return index[i - 1] if i > 0 else None
+
+    def _sorted(self, side: str, include_mitigated: bool):
+        if include_mitigated:
+            return self._all_prices.get(side, []), self._all_index.get(side, [])
+        return self._prices.get(side, []), self._index.get(side, [])
@@ -0,0 +1,94 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+def cluster_levels(prices, tolerance: float, first_fit: bool = False):
+    """
+    Groups prices into tolerance clusters.
+
+    Returns (means, counts) as NumPy arrays, one entry per cluster.
+
+    Default mode sorts once and sweeps linearly: each cluster is
+    anchored at its lowest price and absorbs every price within
+    tolerance of that anchor. Clusters come out ordered by price.
+
+    first_fit=True reproduces the original behaviour exactly:
+    prices are visited in input order and join the FIRST created
+    cluster whose anchor (first member) is within tolerance.
+    Clusters come out in creation order.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+
+    if len(prices) == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+
+    if first_fit:
+        return _cluster_first_fit(prices, tolerance)
+
+    return _cluster_sorted(prices, tolerance)
+
+
+# ─────────────────────────────────────────────
+# SORTED SWEEP
+# ─────────────────────────────────────────────
+def _cluster_sorted(prices, tolerance):
+    ordered = np.sort(prices)
+    n = len(ordered)
+
+    starts = []
+    start = 0
+
+    # Jump from anchor to the first price outside its tolerance band
+    while start < n:
+        starts.append(start)
+        start = int(np.searchsorted(ordered, ordered[start] + tolerance, side="right"))
+
+    starts = np.asarray(starts, dtype=np.int64)
+    counts = np.diff(np.append(starts, n))
+    sums = np.add.reduceat(ordered, starts)
+
+    return sums / counts, counts
+
+
+# ─────────────────────────────────────────────
+# FIRST-FIT (COMPATIBILITY)
+# ─────────────────────────────────────────────
+def _cluster_first_fit(prices, tolerance):
+    # A new anchor is only created when no existing anchor is within
+    # tolerance, so anchors are always more than `tolerance` apart and
+    # at most a couple of them can match any price.
+    anchors = []        # anchor prices, sorted
+    anchor_ids = []     # creation index of each sorted anchor
+    sums = []
+    counts = []
+
+    for p in prices.tolist():
+        j = max(bisect_left(anchors, p - tolerance) - 1, 0)
+        match = None
+
+        while j < len(anchors):
+            a = anchors[j]
+            if a - p > tolerance:
+                break
+            if abs(a - p) <= tolerance:
+                cid = anchor_ids[j]
+                if match is None or cid < match:
+                    match = cid
+            j += 1
+
+        if match is None:
+            cid = len(sums)
+            pos = bisect_left(anchors, p)
+            anchors.insert(pos, p)
+            anchor_ids.insert(pos, cid)
+            sums.append(p)
+            counts.append(1)
+        else:
+            sums[match] += p
+            counts[match] += 1
+
+    counts = np.asarray(counts, dtype=np.int64)
+    means = np.asarray([s / c for s, c in zip(sums, counts.tolist())], dtype=np.float64)
+
+    return means, counts
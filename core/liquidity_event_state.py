@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
+from core.event_bus import Event
 from core.failure_tracker import Failure
 
 
@@ -102,78 +103,51 @@ class LiquidityEventState:
         self.flip_used = True
 
 
-# core/liquidity_event_state.py
-
-class FailureConfirmed:
-    @staticmethod
-    def emit(direction, sweep_time, failure_time):
-        print("❌ FAILURE CONFIRMED")
-        print(f"Direction: {direction}")
-        print(f"Swept at: {sweep_time}")
-        print(f"Failed at: {failure_time}")
-
-
-class OriginConfirmed:
-    @staticmethod
-    def emit(direction, candle):
-        print("🎯 ORIGIN CONFIRMED")
-        print(f"Direction: {direction}")
-        print(f"Time: {candle['time']}")
-        print(
-            f"O:{candle['open']} H:{candle['high']} "
-            f"L:{candle['low']} C:{candle['close']}"
-        )
-
-
-class ProbeTriggered:
-    @staticmethod
-    def emit(direction, origin_high, origin_low, origin_time, trigger_time):
-        print("🎯 PROBE TRIGGERED")
-        print(f"Direction: {direction}")
-        print(f"Origin range: {origin_low} → {origin_high}")
-        print(f"Origin time: {origin_time}")
-        print(f"Trigger time: {trigger_time}")
-
-class CleanupConfirmed:
-    @staticmethod
-    def emit(failure_direction, cleanup_time):
-        print("🧹 CLEANUP CONFIRMED")
-        print(f"Failure Direction: {failure_direction}")
-        print(f"Cleanup Time: {cleanup_time}")
-
-class LifecycleResolved:
-    @staticmethod
-    def emit(reason: str, time):
-        print("🔓 LIFECYCLE RESOLVED")
-        print(f"Reason: {reason}")
-        print(f"Time: {time}")
-
-class LifecycleResolved:
-    _handler = None
-
-    @staticmethod
-    def emit(reason: str, time):
-        print("🔓 LIFECYCLE RESOLVED")
-        print(f"Reason: {reason}")
-        print(f"Time: {time}")
-
-        if LifecycleResolved._handler:
-            LifecycleResolved._handler(reason, time)
-
-
-class ProbeTriggered:
-    _handler = None
-
-    @staticmethod
-    def emit(direction, origin_high, origin_low, origin_time, trigger_time):
-        print("🎯 PROBE TRIGGERED")
-        print(f"Direction: {direction}")
-        print(f"Origin range: {origin_low} → {origin_high}")
-
-        if ProbeTriggered._handler:
-            ProbeTriggered._handler(
-                direction,
-                origin_high,
-                origin_low,
-                trigger_time
-            )
+# ─────────────────────────────────────────────
+# PIPELINE EVENTS (published on the engine's EventBus)
+# ─────────────────────────────────────────────
+
+class FailureConfirmed(Event):
+    __slots__ = ("direction", "sweep_time", "failure_time")
+
+    def __init__(self, direction, sweep_time, failure_time):
+        self.direction = direction
+        self.sweep_time = sweep_time
+        self.failure_time = failure_time
+
+
+class CleanupConfirmed(Event):
+    __slots__ = ("failure_direction", "failure_time", "cleanup_time")
+
+    def __init__(self, failure_direction, failure_time, cleanup_time):
+        self.failure_direction = failure_direction
+        self.failure_time = failure_time
+        self.cleanup_time = cleanup_time
+
+
+class OriginConfirmed(Event):
+    __slots__ = ("direction", "candle", "cleanup_time")
+
+    def __init__(self, direction, candle, cleanup_time):
+        self.direction = direction
+        self.candle = candle
+        self.cleanup_time = cleanup_time
+
+
+class ProbeTriggered(Event):
+    __slots__ = ("direction", "origin_high", "origin_low", "origin_time", "trigger_time")
+
+    def __init__(self, direction, origin_high, origin_low, origin_time, trigger_time):
+        self.direction = direction
+        self.origin_high = origin_high
+        self.origin_low = origin_low
+        self.origin_time = origin_time
+        self.trigger_time = trigger_time
+
+
+class LifecycleResolved(Event):
+    __slots__ = ("reason", "time")
+
+    def __init__(self, reason: str, time):
+        self.reason = reason
+        self.time = time
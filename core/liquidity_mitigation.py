@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def first_crossings(times, extremes, start_times, prices, side: str):
+    """
+    Vectorized mitigation search.
+
+    For every level (start_time, price) returns the index of the FIRST
+    bar with time > start_time whose extreme crosses the level, or -1.
+
+    side "BUY_SIDE":  extremes are highs, crossed when high >= price
+    side "SELL_SIDE": extremes are lows,  crossed when low  <= price
+
+    times must be ascending epoch seconds. Levels are grouped by start
+    time; each group costs one running max/min plus one searchsorted.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    extremes = np.asarray(extremes, dtype=np.float64)
+    start_times = np.asarray(start_times, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+
+    hits = np.full(len(prices), -1, dtype=np.int64)
+
+    if len(prices) == 0 or len(times) == 0:
+        return hits
+
+    for start_time in np.unique(start_times):
+        members = np.flatnonzero(start_times == start_time)
+        first = int(np.searchsorted(times, start_time, side="right"))
+
+        if first >= len(times):
+            continue
+
+        # Monotone running extreme → first crossing is a binary search
+        if side == "BUY_SIDE":
+            running = np.maximum.accumulate(extremes[first:])
+            idx = np.searchsorted(running, prices[members], side="left")
+        else:
+            running = np.minimum.accumulate(extremes[first:])
+            idx = np.searchsorted(-running, -prices[members], side="left")
+
+        found = idx < len(running)
+        hits[members[found]] = first + idx[found]
+
+    return hits
@@ -1,22 +1,35 @@
 # core/mt5_connector.py
 
-import MetaTrader5 as mt5
+from core import broker as mt5
+from core import symbol_specs
 import sys
 
-def connect(symbol: str):
+def connect(symbols):
+    """
+    One MT5 connection for one symbol or a list of symbols.
+    """
+    if isinstance(symbols, str):
+        symbols = [symbols]
+
     if not mt5.initialize():
         print("❌ MT5 initialization failed")
         sys.exit(1)
 
-    if not mt5.symbol_select(symbol, True):
-        print(f"❌ Failed to select symbol: {symbol}")
-        sys.exit(1)
+    for symbol in symbols:
+        if not mt5.symbol_select(symbol, True):
+            print(f"❌ Failed to select symbol: {symbol}")
+            sys.exit(1)
 
     account = mt5.account_info()
     if account is None:
         print("❌ Failed to fetch account info")
         sys.exit(1)
 
+    # Fresh session: re-read every contract now, not on the first order
+    symbol_specs.invalidate()
+    for symbol in symbols:
+        symbol_specs.get_spec(symbol)
+
     print("✅ MT5 CONNECTED")
     print(f"Account: {account.login}")
     print(f"Broker : {account.company}")
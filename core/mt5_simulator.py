@@ -0,0 +1,735 @@
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core import broker as mt5
+from core.bar_store import RATES_DTYPE, TIMEFRAMES, BarStore
+
+
+# Same layout as mt5.copy_ticks_*
+TICK_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("last", "<f8"),
+    ("volume", "<u8"),
+    ("time_msc", "<i8"),
+    ("flags", "<u4"),
+    ("volume_real", "<f8"),
+])
+
+PERIODS = {
+    TIMEFRAMES["M1"]: 60,
+    TIMEFRAMES["M5"]: 300,
+    TIMEFRAMES["M15"]: 900,
+    TIMEFRAMES["M30"]: 1800,
+    TIMEFRAMES["H1"]: 3600,
+    TIMEFRAMES["H4"]: 14400,
+    TIMEFRAMES["D1"]: 86400,
+}
+
+# Return shapes of the MetaTrader5 functions (attribute access + _asdict())
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+SymbolInfo = namedtuple(
+    "SymbolInfo",
+    "name visible digits point spread trade_tick_size trade_tick_value "
+    "trade_contract_size volume_min volume_max volume_step trade_stops_level bid ask",
+)
+AccountInfo = namedtuple("AccountInfo", "login company server currency leverage balance equity profit")
+TradePosition = namedtuple(
+    "TradePosition",
+    "ticket time time_msc type magic identifier volume price_open sl tp "
+    "price_current profit symbol comment",
+)
+TradeOrder = namedtuple(
+    "TradeOrder",
+    "ticket time_setup type magic volume_initial volume_current price_open sl tp symbol comment",
+)
+TradeDeal = namedtuple(
+    "TradeDeal",
+    "ticket order time time_msc type entry magic position_id reason volume price profit symbol comment",
+)
+OrderSendResult = namedtuple(
+    "OrderSendResult",
+    "retcode deal order volume price bid ask comment request_id retcode_external request",
+)
+
+DEFAULT_SPEC = {
+    "digits": 5,
+    "point": 0.00001,
+    "spread": 10,
+    "trade_tick_size": 0.00001,
+    "trade_tick_value": 1.0,
+    "trade_contract_size": 100000.0,
+    "volume_min": 0.01,
+    "volume_max": 100.0,
+    "volume_step": 0.01,
+    "trade_stops_level": 0,
+}
+
+DEAL_ENTRY_IN, DEAL_ENTRY_OUT = 0, 1
+
+
+@dataclass
+class _Position:
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    sl: float
+    tp: float
+    time_msc: int
+    magic: int
+    comment: str
+
+
+@dataclass
+class _Order:
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price: float
+    sl: float
+    tp: float
+    time_msc: int
+    magic: int
+    comment: str
+
+
+class MT5Simulator(mt5.BrokerGateway):
+    """
+    Deterministic local MT5 terminal for Linux / CI.
+
+    - replays stored bars (BarStore) on a virtual clock: nothing after
+      `now` is ever visible; bars still forming are built from ticks
+    - ticks come from `ticks` if given, else 4 per base bar
+      (open → first extreme → second extreme → close, fixed order)
+    - market, limit and stop orders fill against those ticks;
+      SL / TP are checked on every tick (SL first on the same tick)
+    - answers with the MetaTrader5 shapes (namedtuples, structured arrays)
+
+    Install with core.broker.set_gateway(sim); drive with advance_to().
+    """
+
+    def __init__(
+        self,
+        store: BarStore,
+        symbols,
+        start: datetime,
+        end: datetime,
+        lookback_days: int = 7,
+        base_timeframe=None,
+        specs: dict | None = None,
+        ticks: dict | None = None,
+        balance: float = 100_000.0,
+    ):
+        self.store = store
+        self.symbols = list(symbols)
+        self.range = (start - timedelta(days=lookback_days), end)
+
+        self.specs = {
+            symbol: {**DEFAULT_SPEC, **(specs or {}).get(symbol, {})}
+            for symbol in self.symbols
+        }
+
+        self._rates = {}
+        self.ticks = {}
+        for symbol in self.symbols:
+            if ticks and symbol in ticks:
+                self.ticks[symbol] = np.asarray(ticks[symbol], dtype=TICK_DTYPE)
+            else:
+                self.ticks[symbol] = self._synthesize_ticks(symbol, base_timeframe)
+
+        # Contiguous copies: searchsorted on a strided field view copies it per call
+        self.tick_times = {symbol: np.ascontiguousarray(t["time_msc"]) for symbol, t in self.ticks.items()}
+
+        self.now_msc = int(start.timestamp() * 1000)
+
+        self.balance = balance
+        self.positions: dict[int, _Position] = {}
+        self.orders: dict[int, _Order] = {}
+        self.deals: list[TradeDeal] = []
+        self._next_ticket = 1
+
+    # ─────────────────────────────────────────────
+    # CLOCK
+    # ─────────────────────────────────────────────
+    @property
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.now_msc / 1000, timezone.utc)
+
+    def advance_to(self, when):
+        """
+        Move the clock forward (datetime or epoch seconds), filling
+        orders and SL / TP on every tick passed on the way.
+        """
+        target = int((when.timestamp() if isinstance(when, datetime) else when) * 1000)
+        if target <= self.now_msc:
+            return
+
+        for symbol in self.symbols:
+            if any(p.symbol == symbol for p in self.positions.values()) or any(
+                o.symbol == symbol for o in self.orders.values()
+            ):
+                self._process(symbol, self.now_msc, target)
+
+        self.now_msc = target
+
+    def next_tick_time(self) -> datetime | None:
+        """
+        Earliest tick after now, any symbol (None = data exhausted).
+        """
+        upcoming = []
+        for times in self.tick_times.values():
+            i = int(np.searchsorted(times, self.now_msc, side="right"))
+            if i < len(times):
+                upcoming.append(int(times[i]))
+
+        if not upcoming:
+            return None
+        return datetime.fromtimestamp(min(upcoming) / 1000, timezone.utc)
+
+    # ─────────────────────────────────────────────
+    # TERMINAL
+    # ─────────────────────────────────────────────
+    def initialize(self, *args, **kwargs) -> bool:
+        return True
+
+    def shutdown(self):
+        return None
+
+    def last_error(self):
+        return (1, "Success")
+
+    def account_info(self):
+        profit = sum((self._profit(p, *self._exit_prices(p.symbol)) for p in self.positions.values()), 0.0)
+        return AccountInfo(
+            login=0,
+            company="MT5 Simulator",
+            server="local",
+            currency="USD",
+            leverage=100,
+            balance=self.balance,
+            equity=self.balance + profit,
+            profit=profit,
+        )
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        return symbol in self.specs
+
+    def symbol_info(self, symbol: str):
+        if symbol not in self.specs:
+            return None
+
+        tick = self.symbol_info_tick(symbol)
+        return SymbolInfo(
+            name=symbol,
+            visible=True,
+            bid=tick.bid if tick else 0.0,
+            ask=tick.ask if tick else 0.0,
+            **self.specs[symbol],
+        )
+
+    # ─────────────────────────────────────────────
+    # MARKET DATA
+    # ─────────────────────────────────────────────
+    def symbol_info_tick(self, symbol: str):
+        ticks = self.ticks.get(symbol)
+        if ticks is None:
+            return None
+
+        i = int(np.searchsorted(self.tick_times[symbol], self.now_msc, side="right")) - 1
+        if i < 0:
+            return None
+
+        return Tick(*ticks[i].tolist())
+
+    def copy_ticks_from(self, symbol: str, date_from, count: int, flags=mt5.COPY_TICKS_ALL):
+        ticks = self.ticks.get(symbol)
+        if ticks is None:
+            return None
+
+        times = self.tick_times[symbol]
+        lo = int(np.searchsorted(times, _msc(date_from), side="left"))
+        hi = int(np.searchsorted(times, self.now_msc, side="right"))
+        return ticks[lo:min(hi, lo + count)].copy()
+
+    def copy_ticks_range(self, symbol: str, date_from, date_to, flags=mt5.COPY_TICKS_ALL):
+        ticks = self.ticks.get(symbol)
+        if ticks is None:
+            return None
+
+        times = self.tick_times[symbol]
+        lo = int(np.searchsorted(times, _msc(date_from), side="left"))
+        hi = int(np.searchsorted(times, min(_msc(date_to), self.now_msc), side="right"))
+        return ticks[lo:hi].copy()
+
+    def copy_rates_from_pos(self, symbol: str, timeframe, start_pos: int, count: int):
+        closed, forming = self._visible_rates(symbol, timeframe)
+        end = len(closed) + len(forming) - start_pos
+        if end <= 0:
+            return np.empty(0, dtype=RATES_DTYPE)
+
+        # Slice first — never copy the whole history per call
+        bars = closed[max(0, end - count):end]
+        if end > len(closed):
+            bars = np.concatenate([bars, forming])
+        return bars
+
+    def copy_rates_range(self, symbol: str, timeframe, date_from, date_to):
+        closed, forming = self._visible_rates(symbol, timeframe)
+        first, last = _msc(date_from) // 1000, _msc(date_to) // 1000
+
+        times = self._stored_rates(symbol, timeframe)[1][:len(closed)]
+        lo = int(np.searchsorted(times, first, side="left"))
+        hi = int(np.searchsorted(times, last, side="right"))
+
+        bars = closed[lo:hi]
+        if len(forming) and first <= forming["time"][0] <= last:
+            bars = np.concatenate([bars, forming])
+        return bars
+
+    # ─────────────────────────────────────────────
+    # TRADING
+    # ─────────────────────────────────────────────
+    def positions_get(self, symbol: str | None = None, ticket: int | None = None, group=None):
+        return tuple(
+            self._position_view(p)
+            for p in self.positions.values()
+            if (symbol is None or p.symbol == symbol) and (ticket is None or p.ticket == ticket)
+        )
+
+    def orders_get(self, symbol: str | None = None, ticket: int | None = None, group=None):
+        return tuple(
+            TradeOrder(
+                ticket=o.ticket,
+                time_setup=o.time_msc // 1000,
+                type=o.type,
+                magic=o.magic,
+                volume_initial=o.volume,
+                volume_current=o.volume,
+                price_open=o.price,
+                sl=o.sl,
+                tp=o.tp,
+                symbol=o.symbol,
+                comment=o.comment,
+            )
+            for o in self.orders.values()
+            if (symbol is None or o.symbol == symbol) and (ticket is None or o.ticket == ticket)
+        )
+
+    def history_deals_get(self, *args, **kwargs):
+        return tuple(self.deals)
+
+    def order_send(self, request: dict):
+        symbol = request.get("symbol")
+        action = request.get("action")
+
+        tick = self.symbol_info_tick(symbol) if symbol else None
+        if symbol not in self.specs or tick is None:
+            return self._result(mt5.TRADE_RETCODE_INVALID, request, tick)
+
+        if action == mt5.TRADE_ACTION_DEAL:
+            if request.get("position"):
+                return self._close_by_request(request, tick)
+            return self._market(request, tick)
+
+        if action == mt5.TRADE_ACTION_PENDING:
+            return self._pending(request, tick)
+
+        if action == mt5.TRADE_ACTION_REMOVE:
+            order = self.orders.pop(request.get("order"), None)
+            code = mt5.TRADE_RETCODE_DONE if order else mt5.TRADE_RETCODE_INVALID
+            return self._result(code, request, tick, order=request.get("order", 0))
+
+        if action == mt5.TRADE_ACTION_SLTP:
+            position = self.positions.get(request.get("position"))
+            if position is None:
+                return self._result(mt5.TRADE_RETCODE_INVALID, request, tick)
+            position.sl = request.get("sl", position.sl) or 0.0
+            position.tp = request.get("tp", position.tp) or 0.0
+            return self._result(mt5.TRADE_RETCODE_DONE, request, tick)
+
+        return self._result(mt5.TRADE_RETCODE_INVALID, request, tick)
+
+    # ─────────────────────────────────────────────
+    # ORDER HANDLING
+    # ─────────────────────────────────────────────
+    def _market(self, request, tick):
+        order_type = request.get("type")
+        if order_type not in (mt5.ORDER_TYPE_BUY, mt5.ORDER_TYPE_SELL):
+            return self._result(mt5.TRADE_RETCODE_INVALID, request, tick)
+
+        volume = request.get("volume", 0.0)
+        if not self._valid_volume(request["symbol"], volume):
+            return self._result(mt5.TRADE_RETCODE_INVALID_VOLUME, request, tick)
+
+        price = tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid
+        sl, tp = request.get("sl") or 0.0, request.get("tp") or 0.0
+        if not _valid_stops(order_type, price, sl, tp):
+            return self._result(mt5.TRADE_RETCODE_INVALID_STOPS, request, tick)
+
+        ticket = self._ticket()
+        deal = self._open(ticket, request, order_type, volume, price, sl, tp, self.now_msc)
+        return self._result(mt5.TRADE_RETCODE_DONE, request, tick, deal=deal, order=ticket, volume=volume, price=price)
+
+    def _pending(self, request, tick):
+        order_type = request.get("type")
+        price = request.get("price", 0.0)
+
+        valid = {
+            mt5.ORDER_TYPE_BUY_LIMIT: price < tick.ask,
+            mt5.ORDER_TYPE_SELL_LIMIT: price > tick.bid,
+            mt5.ORDER_TYPE_BUY_STOP: price > tick.ask,
+            mt5.ORDER_TYPE_SELL_STOP: price < tick.bid,
+        }
+        if not valid.get(order_type, False):
+            return self._result(mt5.TRADE_RETCODE_INVALID_PRICE, request, tick)
+
+        volume = request.get("volume", 0.0)
+        if not self._valid_volume(request["symbol"], volume):
+            return self._result(mt5.TRADE_RETCODE_INVALID_VOLUME, request, tick)
+
+        sl, tp = request.get("sl") or 0.0, request.get("tp") or 0.0
+        side = mt5.ORDER_TYPE_BUY if order_type in (mt5.ORDER_TYPE_BUY_LIMIT, mt5.ORDER_TYPE_BUY_STOP) else mt5.ORDER_TYPE_SELL
+        if not _valid_stops(side, price, sl, tp):
+            return self._result(mt5.TRADE_RETCODE_INVALID_STOPS, request, tick)
+
+        ticket = self._ticket()
+        self.orders[ticket] = _Order(
+            ticket=ticket,
+            symbol=request["symbol"],
+            type=order_type,
+            volume=volume,
+            price=price,
+            sl=sl,
+            tp=tp,
+            time_msc=self.now_msc,
+            magic=request.get("magic", 0),
+            comment=request.get("comment", ""),
+        )
+        return self._result(mt5.TRADE_RETCODE_DONE, request, tick, order=ticket, volume=volume, price=price)
+
+    def _close_by_request(self, request, tick):
+        position = self.positions.get(request["position"])
+        if position is None:
+            return self._result(mt5.TRADE_RETCODE_INVALID, request, tick)
+
+        bid, ask = tick.bid, tick.ask
+        price = bid if position.type == mt5.POSITION_TYPE_BUY else ask
+        deal = self._close(position, price, self.now_msc, "CLIENT")
+        return self._result(mt5.TRADE_RETCODE_DONE, request, tick, deal=deal, volume=position.volume, price=price)
+
+    def _open(self, ticket, request, order_type, volume, price, sl, tp, time_msc):
+        self.positions[ticket] = _Position(
+            ticket=ticket,
+            symbol=request["symbol"] if isinstance(request, dict) else request.symbol,
+            type=order_type,
+            volume=volume,
+            price_open=price,
+            sl=sl,
+            tp=tp,
+            time_msc=time_msc,
+            magic=request.get("magic", 0) if isinstance(request, dict) else request.magic,
+            comment=request.get("comment", "") if isinstance(request, dict) else request.comment,
+        )
+        return self._deal(self.positions[ticket], DEAL_ENTRY_IN, price, 0.0, time_msc, "CLIENT")
+
+    def _close(self, position, price, time_msc, reason):
+        profit = self._profit(position, price, price)
+        self.balance += profit
+
+        del self.positions[position.ticket]
+        return self._deal(position, DEAL_ENTRY_OUT, price, profit, time_msc, reason)
+
+    def _deal(self, position, entry, price, profit, time_msc, reason):
+        ticket = self._ticket()
+        self.deals.append(TradeDeal(
+            ticket=ticket,
+            order=position.ticket,
+            time=time_msc // 1000,
+            time_msc=time_msc,
+            type=position.type if entry == DEAL_ENTRY_IN else 1 - position.type,
+            entry=entry,
+            magic=position.magic,
+            position_id=position.ticket,
+            reason=reason,
+            volume=position.volume,
+            price=price,
+            profit=profit,
+            symbol=position.symbol,
+            comment=position.comment,
+        ))
+        return ticket
+
+    # ─────────────────────────────────────────────
+    # TICK PROCESSING
+    # ─────────────────────────────────────────────
+    def _process(self, symbol, start_msc, end_msc):
+        ticks = self.ticks[symbol]
+        times = self.tick_times[symbol]
+
+        lo = int(np.searchsorted(times, start_msc, side="right"))
+        hi = int(np.searchsorted(times, end_msc, side="right"))
+        window = ticks[lo:hi]
+        if len(window) == 0:
+            return
+
+        bid, ask, when = window["bid"], window["ask"], window["time_msc"]
+
+        while True:
+            # Earliest pending event: (tick index, priority, kind, ticket)
+            best = None
+
+            for position in self.positions.values():
+                if position.symbol != symbol:
+                    continue
+
+                active = when > position.time_msc
+                exit_price = bid if position.type == mt5.POSITION_TYPE_BUY else ask
+                up = position.type == mt5.POSITION_TYPE_BUY
+
+                if position.sl:
+                    hit = _first(active & ((exit_price <= position.sl) if up else (exit_price >= position.sl)))
+                    if hit is not None and (best is None or (hit, 0) < best[:2]):
+                        best = (hit, 0, "SL", position.ticket)
+                if position.tp:
+                    hit = _first(active & ((exit_price >= position.tp) if up else (exit_price <= position.tp)))
+                    if hit is not None and (best is None or (hit, 1) < best[:2]):
+                        best = (hit, 1, "TP", position.ticket)
+
+            for order in self.orders.values():
+                if order.symbol != symbol:
+                    continue
+
+                active = when > order.time_msc
+                trigger = {
+                    mt5.ORDER_TYPE_BUY_LIMIT: ask <= order.price,
+                    mt5.ORDER_TYPE_SELL_LIMIT: bid >= order.price,
+                    mt5.ORDER_TYPE_BUY_STOP: ask >= order.price,
+                    mt5.ORDER_TYPE_SELL_STOP: bid <= order.price,
+                }[order.type]
+
+                hit = _first(active & trigger)
+                if hit is not None and (best is None or (hit, 2) < best[:2]):
+                    best = (hit, 2, "FILL", order.ticket)
+
+            if best is None:
+                return
+
+            i, _, kind, ticket = best
+            tick_time = int(when[i])
+
+            if kind == "FILL":
+                order = self.orders.pop(ticket)
+                side = (
+                    mt5.ORDER_TYPE_BUY
+                    if order.type in (mt5.ORDER_TYPE_BUY_LIMIT, mt5.ORDER_TYPE_BUY_STOP)
+                    else mt5.ORDER_TYPE_SELL
+                )
+                is_limit = order.type in (mt5.ORDER_TYPE_BUY_LIMIT, mt5.ORDER_TYPE_SELL_LIMIT)
+                market = float(ask[i] if side == mt5.ORDER_TYPE_BUY else bid[i])
+                price = order.price if is_limit else market
+
+                self._open(ticket, order, side, order.volume, price, order.sl, order.tp, tick_time)
+                continue
+
+            position = self.positions[ticket]
+            market = float(bid[i] if position.type == mt5.POSITION_TYPE_BUY else ask[i])
+            # TP is a limit (level price), SL a stop (market price, gaps included)
+            price = float(position.tp) if kind == "TP" else market
+            self._close(position, price, tick_time, kind)
+
+    # ─────────────────────────────────────────────
+    # INTERNAL
+    # ─────────────────────────────────────────────
+    def _ticket(self) -> int:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        return ticket
+
+    def _valid_volume(self, symbol, volume) -> bool:
+        spec = self.specs[symbol]
+        if not spec["volume_min"] <= volume <= spec["volume_max"]:
+            return False
+
+        steps = (volume - spec["volume_min"]) / spec["volume_step"]
+        return abs(steps - round(steps)) < 1e-6
+
+    def _exit_prices(self, symbol):
+        tick = self.symbol_info_tick(symbol)
+        return (tick.bid, tick.ask) if tick else (0.0, 0.0)
+
+    def _profit(self, position, bid, ask):
+        spec = self.specs[position.symbol]
+        if position.type == mt5.POSITION_TYPE_BUY:
+            diff = bid - position.price_open
+        else:
+            diff = position.price_open - ask
+        return float(diff / spec["trade_tick_size"] * spec["trade_tick_value"] * position.volume)
+
+    def _position_view(self, p):
+        bid, ask = self._exit_prices(p.symbol)
+        return TradePosition(
+            ticket=p.ticket,
+            time=p.time_msc // 1000,
+            time_msc=p.time_msc,
+            type=p.type,
+            magic=p.magic,
+            identifier=p.ticket,
+            volume=p.volume,
+            price_open=p.price_open,
+            sl=p.sl,
+            tp=p.tp,
+            price_current=bid if p.type == mt5.POSITION_TYPE_BUY else ask,
+            profit=self._profit(p, bid, ask),
+            symbol=p.symbol,
+            comment=p.comment,
+        )
+
+    def _result(self, retcode, request, tick, deal=0, order=0, volume=0.0, price=0.0):
+        return OrderSendResult(
+            retcode=retcode,
+            deal=deal,
+            order=order,
+            volume=volume,
+            price=price,
+            bid=tick.bid if tick else 0.0,
+            ask=tick.ask if tick else 0.0,
+            comment="Request executed" if retcode == mt5.TRADE_RETCODE_DONE else "Rejected",
+            request_id=0,
+            retcode_external=0,
+            request=request,
+        )
+
+    def _stored_rates(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        if key not in self._rates:
+            rates = self.store.copy_rates_range(symbol, timeframe, *self.range)
+            if rates is None or len(rates) == 0:
+                rates = self._aggregate(symbol, timeframe)
+            self._rates[key] = (rates, np.ascontiguousarray(rates["time"]))
+        return self._rates[key]
+
+    def _aggregate(self, symbol, timeframe):
+        """
+        Higher timeframe built from the finest stored one.
+        """
+        period = PERIODS[timeframe]
+
+        for base_tf in sorted(PERIODS, key=PERIODS.get):
+            if PERIODS[base_tf] >= period:
+                break
+            base = self.store.copy_rates_range(symbol, base_tf, *self.range)
+            if base is not None and len(base):
+                return _resample(base, period)
+
+        return np.empty(0, dtype=RATES_DTYPE)
+
+    def _visible_rates(self, symbol, timeframe):
+        """
+        (closed bars up to now, forming bar built from ticks — 0 or 1 row)
+        """
+        period = PERIODS[timeframe]
+        now = self.now_msc // 1000
+        bar_open = now - now % period
+
+        rates, times = self._stored_rates(symbol, timeframe)
+        closed = rates[: int(np.searchsorted(times, bar_open, side="left"))]
+        forming = np.zeros(0, dtype=RATES_DTYPE)
+
+        ticks = self.ticks.get(symbol)
+        if ticks is None:
+            return closed, forming
+
+        times = self.tick_times[symbol]
+        lo = int(np.searchsorted(times, bar_open * 1000, side="left"))
+        hi = int(np.searchsorted(times, self.now_msc, side="right"))
+        if hi <= lo:
+            return closed, forming
+
+        bids = ticks["bid"][lo:hi]
+        forming = np.zeros(1, dtype=RATES_DTYPE)
+        forming["time"] = bar_open
+        forming["open"] = bids[0]
+        forming["high"] = bids.max()
+        forming["low"] = bids.min()
+        forming["close"] = bids[-1]
+        forming["tick_volume"] = hi - lo
+
+        return closed, forming
+
+    def _synthesize_ticks(self, symbol, base_timeframe):
+        candidates = [base_timeframe] if base_timeframe else [mt5.TIMEFRAME_M1, mt5.TIMEFRAME_M5]
+
+        for timeframe in candidates:
+            bars, _ = self._stored_rates(symbol, timeframe)
+            if len(bars):
+                return bars_to_ticks(bars, PERIODS[timeframe], self.specs[symbol])
+
+        return np.empty(0, dtype=TICK_DTYPE)
+
+
+def bars_to_ticks(bars, period: int, spec: dict):
+    """
+    4 ticks per bar: open, first extreme, second extreme, close.
+    Bullish bars visit the low first, bearish bars the high first.
+    """
+    n = len(bars)
+    ticks = np.zeros(n * 4, dtype=TICK_DTYPE)
+
+    bullish = bars["close"] >= bars["open"]
+    first = np.where(bullish, bars["low"], bars["high"])
+    second = np.where(bullish, bars["high"], bars["low"])
+
+    prices = np.stack([bars["open"], first, second, bars["close"]], axis=1).reshape(-1)
+    offsets = np.array([0, period * 250, period * 500, period * 750], dtype=np.int64)
+    time_msc = (bars["time"].astype(np.int64)[:, None] * 1000 + offsets).reshape(-1)
+
+    spread = np.where(bars["spread"] > 0, bars["spread"], spec["spread"]).astype(np.float64)
+    spread = np.repeat(spread, 4) * spec["point"]
+
+    ticks["time_msc"] = time_msc
+    ticks["time"] = time_msc // 1000
+    ticks["bid"] = prices
+    ticks["ask"] = prices + spread
+    ticks["volume"] = 1
+    return ticks
+
+
+def _resample(base, period: int):
+    keys = base["time"] - base["time"] % period
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    out = np.zeros(len(starts), dtype=RATES_DTYPE)
+    out["time"] = keys[starts]
+    out["open"] = base["open"][starts]
+    out["high"] = np.maximum.reduceat(base["high"], starts)
+    out["low"] = np.minimum.reduceat(base["low"], starts)
+    out["close"] = base["close"][np.r_[starts[1:] - 1, len(base) - 1]]
+    out["tick_volume"] = np.add.reduceat(base["tick_volume"], starts)
+    out["spread"] = base["spread"][starts]
+    return out
+
+
+def _first(mask):
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if len(hits) else None
+
+
+def _msc(value) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value * 1000)
+
+
+def _valid_stops(order_type, price, sl, tp) -> bool:
+    if order_type == mt5.ORDER_TYPE_BUY:
+        return (not sl or sl < price) and (not tp or tp > price)
+    return (not sl or sl > price) and (not tp or tp < price)
@@ -6,3 +6,11 @@ def in_news_blackout():
     Stubbed for now — will be replaced with real feed.
     """
     return False
+
+
+def news_blackout_until(now):
+    """
+    End (UTC) of the blackout active at `now`, or None if unknown.
+    Stubbed for now — will be replaced with real feed.
+    """
+    return None
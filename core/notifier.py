@@ -1,9 +1,21 @@
 # core/notifier.py
 
+import atexit
 import os
+import queue
+import threading
+import time
+import traceback
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from config.env import env
+from core.event_log import get_logger
+
+
+log = get_logger("notifier")
 
-from config.env import env 
 # =============================
 # TELEGRAM CONFIG
 # =============================
@@ -11,29 +23,212 @@ from config.env import env
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+QUEUE_SIZE = 256            # pending messages before new ones are dropped
+COALESCE_SECONDS = 0.5      # burst window merged into one post
+MAX_MESSAGE_CHARS = 4096    # Telegram hard limit per message
+SEPARATOR = "\n\n"
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 5
+
+
+# =============================
+# BACKGROUND NOTIFIER
+# =============================
+
+class TelegramNotifier:
+    """
+    Background Telegram sender.
+
+    - enqueue() never touches the network (bounded queue, put_nowait)
+    - one pooled keep-alive session for every post
+    - messages arriving within COALESCE_SECONDS are merged into one post
+    - 429 → waits Telegram's retry_after, other errors → exponential backoff
+    - other 4xx (mostly Markdown Telegram can't parse) → the batch is
+      re-sent message by message, rejected ones again as plain text
+    - overflow / give-ups are counted in `dropped` / `failed`
+    - an unexpected error is logged and the worker carries on
+    """
+
+    def __init__(self, bot_token, chat_id, queue_size: int = QUEUE_SIZE):
+        self.url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.chat_id = chat_id
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.failed = 0
+        self.sent = 0
+
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+        self._thread = threading.Thread(target=self._run, name="telegram", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 10.0):
+        """
+        Wait (bounded) until everything queued so far has been handled.
+        """
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    # ─────────────────────────────────────────────
+    # WORKER
+    # ─────────────────────────────────────────────
+    def _run(self):
+        while True:
+            batch = []
+
+            try:
+                batch.append(self.queue.get())
+                size = len(batch[0])
+
+                # Coalesce the burst that follows
+                deadline = time.monotonic() + COALESCE_SECONDS
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        message = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                    if size + len(SEPARATOR) + len(message) > MAX_MESSAGE_CHARS:
+                        self._send(batch)
+                        self._done(len(batch))
+                        batch, size = [], -len(SEPARATOR)
+
+                    batch.append(message)
+                    size += len(SEPARATOR) + len(message)
+
+                self._send(batch)
+
+            except Exception as e:
+                self.failed += 1
+                log.error("worker_error", error=repr(e), traceback=traceback.format_exc())
+
+            finally:
+                self._done(len(batch))
+
+    def _done(self, count: int):
+        for _ in range(count):
+            self.queue.task_done()
+
+    def _send(self, batch: list[str]):
+        """
+        One post for the whole batch. If Telegram rejects it, every
+        message is re-sent on its own, as plain text if rejected again.
+        """
+        if self._post(SEPARATOR.join(batch)) is not False:
+            return
+
+        for message in batch:
+            if len(batch) > 1 and self._post(message) is not False:
+                continue
+
+            if self._post(message, parse_mode=None) is False:
+                self.failed += 1
+
+    def _post(self, text: str, parse_mode: str | None = "Markdown"):
+        """
+        True = sent, False = rejected (4xx other than 429),
+        None = gave up after MAX_RETRIES (counted in `failed`).
+        """
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text[:MAX_MESSAGE_CHARS],
+            "disable_web_page_preview": True,
+        }
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+
+        backoff = 1.0
+        for _ in range(MAX_RETRIES):
+            try:
+                response = self.session.post(self.url, json=payload, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException:
+                time.sleep(backoff)
+                backoff *= 2
+                continue
+
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json()["parameters"]["retry_after"]
+                except (ValueError, KeyError, TypeError):
+                    retry_after = backoff
+                time.sleep(retry_after)
+                backoff *= 2
+                continue
+
+            if response.status_code >= 500:
+                time.sleep(backoff)
+                backoff *= 2
+                continue
+
+            if response.ok:
+                self.sent += 1
+                return True
+
+            log.warning(
+                "message_rejected",
+                status=response.status_code,
+                parse_mode=parse_mode,
+                description=_description(response)
+            )
+            return False  # retrying the same payload won't help
+
+        self.failed += 1
+        return None
+
+
+def _description(response) -> str | None:
+    try:
+        return response.json().get("description")
+    except (ValueError, AttributeError):
+        return None
+
+
+_notifier = None
+_lock = threading.Lock()
+
+
+def get_notifier():
+    """
+    Shared notifier (started on first use), or None if not configured.
+    """
+    global _notifier
+
+    if not BOT_TOKEN or not CHAT_ID:
+        return None
+
+    if _notifier is None:
+        with _lock:
+            if _notifier is None:
+                _notifier = TelegramNotifier(BOT_TOKEN, CHAT_ID)
+                atexit.register(_notifier.flush)
+
+    return _notifier
+
+
 # =============================
 # SEND FUNCTION
 # =============================
 
 def send(message: str):
     """
-    Sends a Telegram message.
+    Queues a Telegram message — returns immediately.
     Safe to call from anywhere in the bot.
     Fails silently if Telegram is not configured.
     """
-    if not BOT_TOKEN or not CHAT_ID:
+    notifier = get_notifier()
+    if notifier is None:
         return  # Telegram not configured
 
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-
-    payload = {
-        "chat_id": CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown",
-        "disable_web_page_preview": True,
-    }
-
-    try:
-        requests.post(url, json=payload, timeout=5)
-    except Exception:
-        pass
+    notifier.enqueue(message)
@@ -1,8 +1,14 @@
+import struct
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from core.event_bus import EventBus
+from core.event_log import get_logger
 from core.liquidity_event_state import CleanupConfirmed, OriginConfirmed
+from core.snapshot_codec import pack_enum, pack_time, unpack_enum, unpack_time
+
+log = get_logger("origin_locator")
 
 
 class Direction(Enum):
@@ -22,7 +28,12 @@ class OriginLocator:
     Locates exactly ONE origin candle AFTER cleanup.
     """
 
-    def __init__(self):
+    # origin_direction (0 = no context), cleanup_time
+    # (origin_candle is never held: the context is dropped once found)
+    STATE = struct.Struct("<Bbq")
+
+    def __init__(self, bus: EventBus | None = None):
+        self.bus = bus or EventBus()
         self.context: OriginContext | None = None
 
     # ─────────────────────────────────────────────
@@ -33,7 +44,7 @@ class OriginLocator:
             return
 
         origin_direction = (
-            Direction.BUY if event.failure_direction == Direction.SELL
+            Direction.BUY if event.failure_direction == Direction.SELL.value
             else Direction.SELL
         )
 
@@ -57,6 +68,26 @@ class OriginLocator:
             self._emit_origin(candle)
             self.context = None  # 🔒 LOCK
 
+    # ─────────────────────────────────────────────
+    # SNAPSHOT / RESTORE
+    # ─────────────────────────────────────────────
+    def snapshot(self) -> bytes:
+        ctx = self.context
+        return self.STATE.pack(
+            pack_enum(ctx.origin_direction if ctx else None, Direction),
+            *pack_time(ctx.cleanup_time if ctx else None),
+        )
+
+    def restore(self, data: bytes):
+        direction, *cleanup_time = self.STATE.unpack(data)
+
+        self.context = None
+        if direction:
+            self.context = OriginContext(
+                origin_direction=unpack_enum(direction, Direction),
+                cleanup_time=unpack_time(*cleanup_time)
+            )
+
     # ─────────────────────────────────────────────
     # Rules
     # ─────────────────────────────────────────────
@@ -70,8 +101,18 @@ class OriginLocator:
         return self.context is not None and self.context.origin_candle is None
 
     def _emit_origin(self, candle):
-        OriginConfirmed.emit(
+        log.info(
+            "origin_confirmed",
+            direction=self.context.origin_direction.value,
+            time=candle["time"],
+            open=candle["open"],
+            high=candle["high"],
+            low=candle["low"],
+            close=candle["close"],
+        )
+
+        self.bus.publish(OriginConfirmed(
             direction=self.context.origin_direction.value,
             candle=candle,
             cleanup_time=self.context.cleanup_time
-        )
+        ))
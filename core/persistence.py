@@ -1,6 +1,4 @@
-import json
 import os
-from datetime import datetime
 
 STATE_DIR = "state"
 STATE_FILE = os.path.join(STATE_DIR, "runtime_state.json")
@@ -11,43 +9,40 @@ def _ensure_dir():
         os.makedirs(STATE_DIR)
 
 
-def save_state(liquidity_levels, active_lifecycle):
+def state_file(symbol=None):
     """
-    Persist liquidity levels + lifecycle lock.
+    One state file per symbol; no symbol = legacy single-symbol file.
     """
-    _ensure_dir()
-
-    data = {
-        "active_lifecycle": active_lifecycle,
-        "liquidity": {
-            side: [
-                {
-                    "price": lvl.price,
-                    "type": lvl.type,
-                    "timestamp": lvl.timestamp.isoformat(),
-                    "mitigated": lvl.mitigated,
-                    "day_tag": lvl.day_tag,
-                }
-                for lvl in levels
-            ]
-            for side, levels in liquidity_levels.items()
-        },
-        "saved_at": datetime.utcnow().isoformat(),
+    if symbol is None:
+        return STATE_FILE
+    return os.path.join(STATE_DIR, f"runtime_state_{symbol}.json")
+
+
+def level_payload(lvl):
+    return {
+        "price": lvl.price,
+        "type": lvl.type,
+        "timestamp": lvl.timestamp.isoformat(),
+        "mitigated": lvl.mitigated,
+        "day_tag": lvl.day_tag,
+        "mitigated_at": (
+            lvl.mitigated_at.isoformat() if lvl.mitigated_at else None
+        ),
     }
 
-    with open(STATE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-
 
-def load_state():
+def atomic_write(path, text: str):
     """
-    Load persisted state.
-    Returns (liquidity_data, active_lifecycle) or (None, False)
+    Write-to-temp + fsync + rename: readers see the old file or the
+    new one, never a torn write.
     """
-    if not os.path.exists(STATE_FILE):
-        return None, False
+    _ensure_dir()
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
 
-    with open(STATE_FILE, "r") as f:
-        data = json.load(f)
+    os.replace(tmp, path)
 
-    return data, data.get("active_lifecycle", False)
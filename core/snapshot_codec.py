@@ -0,0 +1,75 @@
+import struct
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+# ─────────────────────────────────────────────
+# SNAPSHOT / RESTORE PROTOCOL
+# ─────────────────────────────────────────────
+# Every pipeline component implements:
+#
+#   snapshot() -> bytes      compact fixed-layout struct encoding
+#   restore(data: bytes)     inverse of snapshot()
+#
+# Helpers below encode the few value kinds the components hold.
+
+TIME = struct.Struct("<bq")  # kind, microseconds since epoch
+
+_NONE, _DATETIME64, _NAIVE, _AWARE = 0, 1, 2, 3
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def pack_time(value) -> tuple[int, int]:
+    """
+    None / np.datetime64 / naive datetime (UTC) / aware datetime
+    → (kind, microseconds). The kind brings the type back on restore.
+    """
+    if value is None:
+        return _NONE, 0
+
+    if isinstance(value, np.datetime64):
+        return _DATETIME64, int(value.astype("datetime64[us]").astype(np.int64))
+
+    if value.tzinfo is None:
+        return _NAIVE, _micros(value.replace(tzinfo=timezone.utc))
+
+    return _AWARE, _micros(value)
+
+
+def unpack_time(kind: int, micros: int):
+    if kind == _NONE:
+        return None
+
+    if kind == _DATETIME64:
+        return np.datetime64(micros, "us")
+
+    value = datetime.fromtimestamp(micros // 1_000_000, timezone.utc).replace(
+        microsecond=micros % 1_000_000
+    )
+    return value.replace(tzinfo=None) if kind == _NAIVE else value
+
+
+def pack_enum(value, enum) -> int:
+    """
+    Enum member → 1-based index, None → 0.
+    """
+    return 0 if value is None else list(enum).index(value) + 1
+
+
+def unpack_enum(index: int, enum):
+    return None if index == 0 else list(enum)[index - 1]
+
+
+def pack_float(value) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def unpack_float(value: float):
+    return None if value != value else value
+
+
+def _micros(value: datetime) -> int:
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
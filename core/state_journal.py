@@ -0,0 +1,217 @@
+import json
+import os
+from collections import deque
+
+from core import clock
+from core.persistence import (
+    STATE_DIR,
+    _ensure_dir,
+    atomic_write,
+    level_payload,
+    state_file,
+)
+
+
+COMPACT_EVERY = 200  # journal records between compacted snapshots
+
+
+def journal_file(symbol=None):
+    if symbol is None:
+        return os.path.join(STATE_DIR, "runtime_state.journal")
+    return os.path.join(STATE_DIR, f"runtime_state_{symbol}.journal")
+
+
+class StateJournal:
+    """
+    Append-only write-ahead journal of runtime state changes.
+
+    Records (one JSON line each, numbered by `seq`):
+      levels    — full level set loaded (seed / new UTC day)
+      level     — one level added or mitigated (upsert)
+      lifecycle — lifecycle lock / unlock
+      detector  — opaque state of a named pipeline component
+
+    Every COMPACT_EVERY records the replayed state is written as a
+    snapshot (the regular state file, atomic rename) and the journal
+    is truncated. load() = snapshot + journal records newer than it;
+    a torn last line from a crash is ignored.
+
+    Recording only touches memory. With write_through=False the disk
+    work is left to flush(), which may run on another thread
+    (`on_pending` is called whenever there is something to flush).
+    flush() fsyncs the journal: every record it wrote survives a
+    crash or power loss once it returns.
+    """
+
+    def __init__(
+        self,
+        symbol=None,
+        compact_every: int = COMPACT_EVERY,
+        write_through: bool = True,
+        on_pending=None,
+    ):
+        self.symbol = symbol
+        self.compact_every = compact_every
+        self.write_through = write_through
+        self.on_pending = on_pending
+
+        self.state = _empty_state()
+        self.seq = 0
+        self.snapshot_seq = 0
+
+        self._pending = deque()
+        self._file = None
+
+    # ─────────────────────────────────────────────
+    # RECORDING
+    # ─────────────────────────────────────────────
+    def levels_loaded(self, liquidity_levels):
+        self._record("levels", liquidity={
+            side: [level_payload(lvl) for lvl in levels]
+            for side, levels in liquidity_levels.items()
+        })
+
+    def level_changed(self, level):
+        self._record("level", level=level_payload(level))
+
+    def lifecycle(self, active: bool):
+        self._record("lifecycle", active=active)
+
+    def detector(self, name: str, state):
+        self._record("detector", name=name, state=state)
+
+    # ─────────────────────────────────────────────
+    # I/O
+    # ─────────────────────────────────────────────
+    def flush(self):
+        """
+        Write every pending record / snapshot, in order, then fsync.
+        """
+        if not self._pending:
+            return
+
+        while self._pending:
+            kind, payload = self._pending.popleft()
+
+            if kind == "append":
+                if self._file is None:
+                    _ensure_dir()
+                    self._file = open(journal_file(self.symbol), "a")
+                self._file.write(payload)
+                continue
+
+            # Snapshot first, THEN truncate: a crash in between only
+            # leaves records the snapshot already covers (seq <= snapshot)
+            if self._file is not None:
+                self._file.flush()
+            atomic_write(state_file(self.symbol), payload)
+            self._truncate()
+
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def load(self):
+        """
+        Replay snapshot + journal. Returns the state dict
+        (active_lifecycle, liquidity, detectors, saved_at) or None.
+        """
+        path = state_file(self.symbol)
+        self.state = _empty_state()
+
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self.state.update(json.load(f))
+
+        self.seq = self.snapshot_seq = self.state.get("seq", 0)
+
+        path = journal_file(self.symbol)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn tail from a crash mid-write
+
+                    if record["seq"] <= self.snapshot_seq:
+                        continue
+
+                    _apply(self.state, record)
+                    self.seq = record["seq"]
+
+        # Start from a clean compacted file (drops any torn tail)
+        self._compact()
+        self.flush()
+
+        return self.state if self.state["saved_at"] else None
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ─────────────────────────────────────────────
+    # INTERNAL
+    # ─────────────────────────────────────────────
+    def _record(self, op, **fields):
+        self.seq += 1
+        record = {"seq": self.seq, "op": op, "at": clock.utcnow().isoformat(), **fields}
+
+        _apply(self.state, record)
+        self._pending.append(("append", json.dumps(record, separators=(",", ":")) + "\n"))
+
+        if self.seq - self.snapshot_seq >= self.compact_every:
+            self._compact()
+
+        if self.write_through:
+            self.flush()
+        elif self.on_pending:
+            self.on_pending()
+
+    def _compact(self):
+        self.state["seq"] = self.seq
+        self.snapshot_seq = self.seq
+        self._pending.append(("snapshot", json.dumps(self.state, indent=2)))
+
+    def _truncate(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(journal_file(self.symbol), "w")
+
+
+def _empty_state():
+    return {
+        "active_lifecycle": False,
+        "liquidity": {"BUY_SIDE": [], "SELL_SIDE": []},
+        "detectors": {},
+        "saved_at": None,
+    }
+
+
+def _apply(state, record):
+    op = record["op"]
+
+    if op == "levels":
+        state["liquidity"] = record["liquidity"]
+
+    elif op == "level":
+        level = record["level"]
+        side = state["liquidity"].setdefault(level["type"], [])
+        key = (level["price"], level["timestamp"])
+
+        for i, existing in enumerate(side):
+            if (existing["price"], existing["timestamp"]) == key:
+                side[i] = level
+                break
+        else:
+            side.append(level)
+
+    elif op == "lifecycle":
+        state["active_lifecycle"] = record["active"]
+
+    elif op == "detector":
+        state["detectors"][record["name"]] = record["state"]
+
+    state["saved_at"] = record["at"]
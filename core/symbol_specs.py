@@ -0,0 +1,161 @@
+"""
+Symbol specifications, cached.
+
+Sizing needs the contract (tick size / value, volume limits, digits)
+on every order, but it almost never changes — so it is fetched once per
+symbol and refreshed after TTL_SECONDS instead of asking the broker on
+the order path.
+
+The whole cache is dropped when the account currency changes (tick
+values are quoted in it) or a different broker gateway is installed;
+invalidate() drops it explicitly, e.g. after a reconnect.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from core import broker as mt5
+from core import clock
+from core.event_log import get_logger
+
+log = get_logger("symbol_specs")
+
+TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    symbol: str
+    digits: int
+    point: float
+    tick_size: float
+    tick_value: float        # account currency per tick per lot
+    contract_size: float
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    currency: str | None     # account currency tick_value is quoted in
+
+    @property
+    def pip_size(self) -> float:
+        # Fractional pricing (EURUSD 1.23456, USDJPY 123.456): pip = 10 points
+        return self.point * 10 if self.digits in (3, 5) else self.point
+
+    @classmethod
+    def from_info(cls, info, currency: str | None = None) -> "SymbolSpec":
+        return cls(
+            symbol=info.name,
+            digits=int(info.digits),
+            point=float(info.point),
+            tick_size=float(info.trade_tick_size),
+            tick_value=float(info.trade_tick_value),
+            contract_size=float(info.trade_contract_size),
+            volume_min=float(info.volume_min),
+            volume_max=float(info.volume_max),
+            volume_step=float(info.volume_step),
+            currency=currency,
+        )
+
+
+class SymbolSpecCache:
+    """
+    symbol → (SymbolSpec, fetched_at). Time comes from core.clock, so a
+    replay refreshes on virtual time.
+    """
+
+    def __init__(self, ttl_seconds: float = TTL_SECONDS):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.specs: dict[str, tuple[SymbolSpec, datetime]] = {}
+        self.gateway = None
+
+    def get(self, symbol: str) -> SymbolSpec | None:
+        """
+        Cached spec, refreshed when older than the TTL.
+        None when the broker does not know the symbol.
+        """
+        gateway = mt5.get_gateway()
+        if gateway is not self.gateway:
+            self.invalidate()
+            self.gateway = gateway
+
+        now = clock.now()
+        cached = self.specs.get(symbol)
+        if cached is not None and now - cached[1] < self.ttl:
+            return cached[0]
+
+        return self._refresh(symbol, now)
+
+    def invalidate(self, symbol: str | None = None):
+        """
+        Drop one symbol, or everything (symbol=None).
+        """
+        if symbol is None:
+            self.specs.clear()
+        else:
+            self.specs.pop(symbol, None)
+
+    def _refresh(self, symbol: str, now: datetime) -> SymbolSpec | None:
+        info = mt5.symbol_info(symbol)
+        if not info:
+            self.specs.pop(symbol, None)
+            return None
+
+        account = mt5.account_info()
+        currency = account.currency if account else None
+
+        # Tick values of every symbol are quoted in the old currency
+        if any(spec.currency != currency for spec, _ in self.specs.values()):
+            log.warning("account_currency_changed", currency=currency)
+            self.invalidate()
+
+        spec = SymbolSpec.from_info(info, currency)
+
+        previous = self.specs.get(symbol)
+        if previous is not None and previous[0] != spec:
+            log.info("symbol_spec_changed", symbol=symbol)
+
+        self.specs[symbol] = (spec, now)
+        return spec
+
+
+_cache = SymbolSpecCache()
+
+
+def get_spec(symbol: str) -> SymbolSpec | None:
+    return _cache.get(symbol)
+
+
+def invalidate(symbol: str | None = None):
+    _cache.invalidate(symbol)
+
+
+# ─────────────────────────────────────────────
+# SIZING
+# ─────────────────────────────────────────────
+def lot_size(spec: SymbolSpec, risk: float, stop_distance: float) -> float:
+    """
+    Lots risking `risk` (account currency) over `stop_distance` (price).
+
+    Rounded DOWN to volume_step so the risk is never exceeded, then
+    clamped to the broker's volume_min / volume_max.
+    """
+    if stop_distance <= 0 or spec.tick_size <= 0 or spec.tick_value <= 0:
+        return 0.0
+
+    risk_per_lot = stop_distance / spec.tick_size * spec.tick_value
+    lots = risk / risk_per_lot
+
+    step = spec.volume_step
+    if step > 0:
+        lots = math.floor(lots / step + 1e-9) * step
+
+    lots = max(spec.volume_min, min(lots, spec.volume_max))
+    return round(lots, _decimals(step))
+
+
+def _decimals(step: float) -> int:
+    # 0.01 → 2, 0.25 → 2, 1.0 → 0 (no step: the old 2-decimal rounding)
+    if step <= 0:
+        return 2
+    return len(f"{step:.8f}".rstrip("0").split(".")[1])
@@ -1,9 +1,12 @@
 # execution/orders.py
 
-import MetaTrader5 as mt5
+from core import broker as mt5
 from typing import Optional
 
 from config.settings import PRIMARY_MAGIC, FLIP_MAGIC, SLIPPAGE, MAX_OPEN_TRADES
+from core.event_log import get_logger
+
+log = get_logger("orders")
 
 
 class OrderExecutor:
@@ -27,7 +30,7 @@ class OrderExecutor:
     ) -> Optional[int]:
 
         if self._has_open_trade():
-            print("⛔ Open trade exists. Skipping execution.")
+            log.warning("open_trade_exists", symbol=self.symbol)
             return None
 
         order_type = (
@@ -56,12 +59,22 @@ class OrderExecutor:
         result = mt5.order_send(request)
 
         if result is None:
-            print("❌ order_send returned None")
+            log.error("order_send_none", symbol=self.symbol, last_error=mt5.last_error())
             return None
 
         if result.retcode != mt5.TRADE_RETCODE_DONE:
-            print(f"❌ Order failed: {result.retcode}")
+            log.error("order_failed", symbol=self.symbol, retcode=result.retcode)
             return None
 
-        print(f"✅ LIMIT ORDER ACCEPTED | Ticket: {result.order}")
+        log.info(
+            "limit_accepted",
+            symbol=self.symbol,
+            ticket=result.order,
+            direction=direction,
+            lot=lot,
+            entry=entry,
+            sl=sl,
+            tp=tp,
+            is_flip=is_flip,
+        )
         return result.order
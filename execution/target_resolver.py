@@ -1,9 +1,19 @@
 from typing import Optional
 
+from core.liquidity_book import LiquidityBook
+
+
+# A SELL runs into the downside stops below entry, a BUY into the upside stops above
+TARGET_SIDE = {"SELL": "SELL_SIDE", "BUY": "BUY_SIDE"}
+
 
 class TargetResolver:
     """
     Resolves TP using opposing liquidity and enforces RR constraint.
+
+    Every level on the target side counts, mitigated or not (the
+    original list scan did not filter either). A map without that side
+    raises KeyError instead of silently finding no target.
     """
 
     def __init__(self, min_rr: float = 5.0):
@@ -14,28 +24,31 @@ class TargetResolver:
         direction: str,
         entry: float,
         stop_loss: float,
-        liquidity_map: dict,
+        liquidity_map: dict | LiquidityBook,
     ) -> Optional[float]:
 
-        opposing = liquidity_map["BUY"] if direction == "SELL" else liquidity_map["SELL"]
+        if direction not in TARGET_SIDE:
+            raise ValueError(f"Unknown direction: {direction}")
 
-        if not opposing:
-            return None
+        if not isinstance(liquidity_map, LiquidityBook):
+            liquidity_map = LiquidityBook(liquidity_map)
+
+        side = TARGET_SIDE[direction]
+        if side not in liquidity_map:
+            raise KeyError(f"liquidity map has no {side} levels (keys: {', '.join(liquidity_map.keys())})")
 
         # -------------------------
         # Select nearest opposing
         # -------------------------
         if direction == "SELL":
-            candidates = [l for l in opposing if l.price < entry]
-            if not candidates:
-                return None
-            tp = max(l.price for l in candidates)
-
+            target = liquidity_map.nearest_below(side, entry, inclusive=False, include_mitigated=True)
         else:  # BUY
-            candidates = [l for l in opposing if l.price > entry]
-            if not candidates:
-                return None
-            tp = min(l.price for l in candidates)
+            target = liquidity_map.nearest_above(side, entry, inclusive=False, include_mitigated=True)
+
+        if target is None:
+            return None
+
+        tp = target.price
 
         # -------------------------
         # RR check
@@ -1,20 +1,31 @@
 from typing import Optional
 
+from core.flip_executor import SL_BUFFER_PIPS
 from core.flip_origin_candle_locator import FlipOriginCandle
+from core.symbol_specs import get_spec
 from execution.target_resolver import TargetResolver
 
-PIP = 0.00010
-
 
 class FlipEntryAdapter:
     """
     Executes ONE flip using last pullback candle before probe SL.
+    The SL buffer is sl_buffer_pips in pips of the symbol (default: the
+    risk manager's symbol, FlipExecutor's buffer).
     """
 
-    def __init__(self, executor, risk_manager, notifier):
+    def __init__(
+        self,
+        executor,
+        risk_manager,
+        notifier,
+        symbol: str | None = None,
+        sl_buffer_pips: float = SL_BUFFER_PIPS,
+    ):
         self.executor = executor
         self.risk_manager = risk_manager
         self.notifier = notifier
+        self.symbol = symbol or risk_manager.symbol
+        self.sl_buffer_pips = sl_buffer_pips
         self.used = False
 
     def execute(
@@ -27,15 +38,23 @@ class FlipEntryAdapter:
         if self.used:
             return None
 
+        spec = get_spec(self.symbol)
+        if spec is None:
+            self.notifier(f"❌ Flip cancelled — no symbol spec for {self.symbol}")
+            self.used = True
+            return None
+
+        buffer = self.sl_buffer_pips * spec.pip_size
+
         # -------------------------
         # Entry = body of flip origin
         # -------------------------
         if direction == "SELL":
             entry = max(flip_origin.open, flip_origin.close)
-            sl = flip_origin.high + 2 * PIP
+            sl = flip_origin.high + buffer
         else:
             entry = min(flip_origin.open, flip_origin.close)
-            sl = flip_origin.low - 2 * PIP
+            sl = flip_origin.low - buffer
 
         # -------------------------
         # Resolve TP (unchanged rule)
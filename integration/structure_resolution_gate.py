@@ -1,11 +1,26 @@
 # integration/structure_resolution_gate.py
 
+import struct
+
+import numpy as np
+
+from core.snapshot_codec import pack_float, unpack_float
+
+
+BUY = 1
+SELL = -1
+DIRECTION_NAMES = {BUY: "BUY", SELL: "SELL"}
+
+
 class StructureResolutionGate:
     """
     Emits raw structure break events.
     No state resolution, no levels, no failures.
     """
 
+    # last_high, last_low (NaN = not initialized)
+    STATE = struct.Struct("<dd")
+
     def __init__(self, failure_detector, cleanup_detector):
         self.failure_detector = failure_detector
         self.cleanup_detector = cleanup_detector
@@ -28,16 +43,7 @@ class StructureResolutionGate:
         # BUY structure break
         # -----------------------------
         if high > self.last_high:
-            # Emit to Failure + Cleanup
-            self.failure_detector.on_structure_break(
-                direction="BUY",
-                time=time
-            )
-
-            self.cleanup_detector.on_structure_break(
-                direction="BUY",
-                time=time
-            )
+            self.emit("BUY", time)
 
             self.last_high = high
 
@@ -45,15 +51,106 @@ class StructureResolutionGate:
         # SELL structure break
         # -----------------------------
         if low < self.last_low:
-            # Emit to Failure + Cleanup
-            self.failure_detector.on_structure_break(
-                direction="SELL",
-                time=time
-            )
-
-            self.cleanup_detector.on_structure_break(
-                direction="SELL",
-                time=time
-            )
+            self.emit("SELL", time)
 
             self.last_low = low
+
+    def on_candles(self, bars):
+        """
+        Batch on_candle over a whole array of closed bars (time/high/low
+        fields): same detector calls in the same order, one vectorized
+        pass for the break search.
+        """
+        index, direction, self.last_high, self.last_low = structure_breaks(
+            bars["high"], bars["low"], self.last_high, self.last_low
+        )
+
+        # Positional (a DataFrame slice keeps its row labels)
+        times = bars["time"]
+        if hasattr(times, "to_numpy"):
+            times = times.to_numpy(dtype=object)
+
+        for i, d in zip(index.tolist(), direction.tolist()):
+            self.emit(DIRECTION_NAMES[d], times[i])
+
+        return index, direction
+
+    def emit(self, direction: str, time):
+        """
+        One break to Failure + Cleanup.
+        """
+        self.failure_detector.on_structure_break(direction=direction, time=time)
+        self.cleanup_detector.on_structure_break(direction=direction, time=time)
+
+    # -----------------------------
+    # SNAPSHOT / RESTORE
+    # -----------------------------
+    def snapshot(self) -> bytes:
+        return self.STATE.pack(pack_float(self.last_high), pack_float(self.last_low))
+
+    def restore(self, data: bytes):
+        high, low = self.STATE.unpack(data)
+
+        self.last_high = unpack_float(high)
+        self.last_low = unpack_float(low)
+
+
+def structure_breaks(high, low, last_high=None, last_low=None):
+    """
+    Kernel of StructureResolutionGate.on_candle over whole arrays.
+
+    A BUY break is a high above every earlier high (and last_high),
+    a SELL break a low below every earlier low — a running max / min
+    compared against itself shifted by one bar.
+
+    Returns (index, direction, last_high, last_low):
+      index      int64 bar indices, ascending (BUY before SELL in a bar)
+      direction  int8, BUY = 1 / SELL = -1
+      last_*     gate state after the last bar
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)
+    if len(high) == 0:
+        return (*empty, last_high, last_low)
+
+    # Uninitialized gate: the first bar only sets the levels
+    start = 0
+    if last_high is None or last_low is None:
+        last_high, last_low = float(high[0]), float(low[0])
+        start = 1
+        if len(high) == 1:
+            return (*empty, last_high, last_low)
+
+    highs = high[start:]
+    lows = low[start:]
+
+    prior_high = np.empty_like(highs)
+    prior_high[0] = last_high
+    np.maximum.accumulate(highs[:-1], out=prior_high[1:])
+    np.maximum(prior_high, last_high, out=prior_high)
+
+    prior_low = np.empty_like(lows)
+    prior_low[0] = last_low
+    np.minimum.accumulate(lows[:-1], out=prior_low[1:])
+    np.minimum(prior_low, last_low, out=prior_low)
+
+    buys = np.flatnonzero(highs > prior_high)
+    sells = np.flatnonzero(lows < prior_low)
+
+    index = np.concatenate([buys, sells]) + start
+    direction = np.concatenate([
+        np.full(len(buys), BUY, dtype=np.int8),
+        np.full(len(sells), SELL, dtype=np.int8),
+    ])
+
+    # Bar order; BUY first within a bar (stable sort keeps buys ahead)
+    order = np.argsort(index, kind="stable")
+
+    return (
+        index[order],
+        direction[order],
+        max(last_high, float(highs.max())),
+        min(last_low, float(lows.min())),
+    )
@@ -0,0 +1,55 @@
+import struct
+
+from core.snapshot_codec import pack_time, unpack_time
+
+
+class BarCloseDispatcher:
+    """
+    Fires candle-closed handlers EXACTLY ONCE per completed bar.
+
+    Fed the latest bars of every poll (bars[-1] = still forming).
+    Remembers the last dispatched bar time, so a bar is delivered the
+    first poll after it closes and never again — the forming bar is
+    never delivered at all.
+    """
+
+    STATE = struct.Struct("<bq")  # last_closed_time
+
+    def __init__(self, handlers=None):
+        self.handlers = list(handlers or [])
+        self.last_closed_time = None
+
+    def subscribe(self, handler):
+        self.handlers.append(handler)
+
+    def dispatch(self, bars) -> int:
+        """
+        Delivers every newly closed bar in `bars`, oldest first.
+        Returns the number of bars delivered.
+        """
+        closed = bars[:-1]
+        if len(closed) == 0:
+            return 0
+
+        # First poll: start from the latest closed bar, don't replay history
+        if self.last_closed_time is None:
+            new = closed[-1:]
+        else:
+            new = [bar for bar in closed if bar["time"] > self.last_closed_time]
+
+        for bar in new:
+            for handler in self.handlers:
+                handler(bar)
+
+            self.last_closed_time = bar["time"]
+
+        return len(new)
+
+    # ─────────────────────────────────────────────
+    # SNAPSHOT / RESTORE
+    # ─────────────────────────────────────────────
+    def snapshot(self) -> bytes:
+        return self.STATE.pack(*pack_time(self.last_closed_time))
+
+    def restore(self, data: bytes):
+        self.last_closed_time = unpack_time(*self.STATE.unpack(data))
@@ -0,0 +1,211 @@
+from datetime import datetime, timezone
+
+from core import broker as mt5
+from core import clock
+import numpy as np
+
+
+# Pre-parsed bar record handed to the engines (time already UTC datetime64)
+BAR_DTYPE = np.dtype([
+    ("time", "datetime64[s]"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+])
+
+# Tick record handed to the engines (sweep checks need only these)
+TICK_DTYPE = np.dtype([
+    ("time_msc", "<i8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+])
+
+TICK_BATCH = 10_000  # ticks per copy_ticks_from call
+
+H1_SECONDS = 3600
+
+
+class MarketSnapshot:
+    """
+    Everything an engine needs from one poll for one symbol.
+    bars[-1] is the still-forming bar.
+    h1 holds the latest closed H1 bars when they were requested, else None.
+    ticks holds every tick since the previous poll (TICK_DTYPE, oldest
+    first) — just `tick` when no stream is available.
+    """
+
+    __slots__ = ("symbol", "tick", "bars", "h1", "ticks")
+
+    def __init__(self, symbol, tick, bars, h1=None, ticks=None):
+        self.symbol = symbol
+        self.tick = tick
+        self.bars = bars
+        self.h1 = h1
+        self.ticks = ticks if ticks is not None else single_tick(tick)
+
+
+class MarketDataGateway:
+    """
+    Fetches ticks + latest bars for ALL watched symbols in one pass.
+
+    - one tick + one copy_rates_from_pos per symbol per poll, plus every
+      H1 bar closed since the last one seen, for symbols whose close is due
+    - every tick since the previous poll, in copy_ticks_from batches,
+      so a wick between two polls is still seen
+    - the ONLY place the engines' market data touches MT5, so the whole
+      poll can run on a dedicated MT5 thread
+    - bars already seen closed are reused from the previous poll; only
+      new rows and the forming bar are converted
+    - every poll returns fresh arrays, so records kept by detectors
+      are never mutated afterwards
+    """
+
+    def __init__(self, symbols, timeframe=mt5.TIMEFRAME_M5, depth: int = 5):
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.depth = depth
+
+        self._bars = {}    # symbol → last converted bars
+        self._times = {}   # symbol → their raw epoch times
+        self._last_tick_msc = {}  # symbol → newest tick already delivered
+
+    def poll(self, h1_since=None) -> dict:
+        """
+        h1_since: {symbol: epoch of the last H1 bar it has seen (None =
+        none yet)} for the symbols whose H1 close is due. Every bar
+        closed after that is fetched, so a gap of any length is filled.
+        """
+        h1_since = h1_since or {}
+        snapshots = {}
+
+        for symbol in self.symbols:
+            raw = mt5.copy_rates_from_pos(symbol, self.timeframe, 0, self.depth)
+            if raw is None or len(raw) == 0:
+                continue
+
+            tick = mt5.symbol_info_tick(symbol)
+            if not tick:
+                continue
+
+            h1 = None
+            if symbol in h1_since:
+                h1 = self._h1_since(symbol, h1_since[symbol])
+
+            snapshots[symbol] = MarketSnapshot(
+                symbol, tick, self._update(symbol, raw), h1, self._ticks_since(symbol, tick)
+            )
+
+        return snapshots
+
+    def bars_since(self, symbol, since: datetime):
+        """
+        Every bar opened after `since` up to now (last one still forming).
+        Used once at startup to replay bars missed while down.
+        """
+        raw = mt5.copy_rates_range(
+            symbol, self.timeframe, since, clock.now()
+        )
+        if raw is None or len(raw) == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        return _convert(raw[raw["time"] > int(since.timestamp())])
+
+    # ─────────────────────────────────────────────
+    # INTERNAL
+    # ─────────────────────────────────────────────
+    def _h1_since(self, symbol, since: int | None):
+        """
+        Closed H1 bars newer than `since`; the last 3 when unknown.
+        """
+        if since is None:
+            return mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 1, 3)
+
+        now = clock.now()
+        raw = mt5.copy_rates_range(
+            symbol, mt5.TIMEFRAME_H1, datetime.fromtimestamp(since, timezone.utc), now
+        )
+        if raw is None or len(raw) == 0:
+            return None
+
+        times = raw["time"].astype(np.int64)
+        return raw[(times > since) & (times + H1_SECONDS <= int(now.timestamp()))]
+
+    def _ticks_since(self, symbol, tick):
+        """
+        Ticks newer than the last poll's. The first poll only has `tick`.
+        """
+        last = self._last_tick_msc.get(symbol)
+        self._last_tick_msc[symbol] = max(last or 0, tick.time_msc)
+
+        if last is None:
+            return single_tick(tick)
+
+        chunks = []
+        since = last
+        while True:
+            # copy_ticks_from is second-resolution: re-filter on time_msc
+            raw = mt5.copy_ticks_from(
+                symbol, datetime.fromtimestamp(since // 1000, timezone.utc), TICK_BATCH, mt5.COPY_TICKS_INFO
+            )
+            if raw is None or len(raw) == 0:
+                break
+
+            new = raw[raw["time_msc"] > since]
+            if len(new):
+                chunks.append(new)
+                since = int(new["time_msc"][-1])
+
+            if len(raw) < TICK_BATCH or len(new) == 0:
+                break
+
+        if not chunks:
+            return single_tick(tick) if tick.time_msc > last else np.empty(0, dtype=TICK_DTYPE)
+
+        self._last_tick_msc[symbol] = max(since, tick.time_msc)
+
+        ticks = np.empty(sum(len(c) for c in chunks), dtype=TICK_DTYPE)
+        for name in TICK_DTYPE.names:
+            ticks[name] = np.concatenate([c[name] for c in chunks])
+        return ticks
+
+    def _update(self, symbol, raw):
+        times = raw["time"].astype(np.int64)
+
+        prev = self._bars.get(symbol)
+        prev_times = self._times.get(symbol)
+
+        reused = 0
+        if prev is not None:
+            # Closed bars (all but the previous forming one) can be reused
+            start = int(np.searchsorted(prev_times, times[0]))
+            closed = prev_times[start:-1]
+            limit = min(len(closed), len(times))
+            while reused < limit and closed[reused] == times[reused]:
+                reused += 1
+
+        if reused:
+            bars = np.concatenate([prev[start:start + reused], _convert(raw[reused:])])
+        else:
+            bars = _convert(raw)
+
+        self._bars[symbol] = bars
+        self._times[symbol] = times
+        return bars
+
+
+def single_tick(tick):
+    ticks = np.empty(1, dtype=TICK_DTYPE)
+    ticks[0] = (tick.time_msc, tick.bid, tick.ask)
+    return ticks
+
+
+def _convert(raw):
+    bars = np.empty(len(raw), dtype=BAR_DTYPE)
+    bars["time"] = raw["time"].astype("datetime64[s]")
+
+    for name in ("open", "high", "low", "close", "tick_volume"):
+        bars[name] = raw[name]
+
+    return bars
@@ -0,0 +1,166 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core import clock
+from core.liquidity_event_state import LifecycleResolved
+from core.news_blackout import in_news_blackout
+from core.notifier import send
+from core.state_journal import StateJournal
+
+from live.market_data import MarketDataGateway
+from live.scheduler import LiveScheduler
+from live.symbol_engine import SymbolEngine
+
+
+class LiveRuntime:
+    """
+    Asyncio runtime for the live engines.
+
+    Tasks, connected by queues:
+      market   → polls ticks/bars on the MT5 thread, sleeps via LiveScheduler
+      detector → drives every SymbolEngine on each snapshot (pure CPU)
+      orders   → flip submission on the MT5 thread, resolution back on the loop
+      persist  → journal flushes on the I/O thread
+
+    Notifications need no task: core.notifier.send() only enqueues for
+    the background Telegram sender.
+
+    MetaTrader5 is not thread-safe: every MT5 call goes through the ONE
+    mt5 executor thread. Detector code and every engine's EventBus only
+    run on the event loop, so engines are never touched concurrently.
+    """
+
+    def __init__(self, symbols, scheduler: LiveScheduler | None = None):
+        self.symbols = list(symbols)
+        self.scheduler = scheduler or LiveScheduler()
+        self.market_data = MarketDataGateway(self.symbols)
+
+        self.mt5_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5")
+        self.io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persist")
+
+        # Journals record in memory on the loop; the persist task writes
+        self.journals = {
+            symbol: StateJournal(symbol, write_through=False, on_pending=self._persist_due)
+            for symbol in self.symbols
+        }
+
+        self.engines = {
+            symbol: SymbolEngine(
+                symbol,
+                notify=send,
+                journal=self.journals[symbol],
+                submit_flip=partial(self._submit_flip, symbol),
+            )
+            for symbol in self.symbols
+        }
+
+        # Created in run() — they must belong to the running loop
+        self.snapshots = None
+        self.orders = None
+        self.persist = None
+
+    # ─────────────────────────────────────────────
+    # ENTRY
+    # ─────────────────────────────────────────────
+    async def run(self):
+        self.snapshots = asyncio.Queue(maxsize=1)
+        self.orders = asyncio.Queue()
+        self.persist = asyncio.Event()
+
+        # Startup is allowed to block (state load + liquidity seed)
+        for engine in self.engines.values():
+            engine.start(self.market_data)
+
+        tasks = [
+            asyncio.create_task(self._market_task(), name="market"),
+            asyncio.create_task(self._detector_task(), name="detector"),
+            asyncio.create_task(self._order_task(), name="orders"),
+            asyncio.create_task(self._persist_task(), name="persist"),
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            for executor in (self.mt5_executor, self.io_executor):
+                executor.shutdown(wait=True)
+
+            for journal in self.journals.values():
+                journal.close()
+
+    # ─────────────────────────────────────────────
+    # HOOKS (called from engines, on the loop)
+    # ─────────────────────────────────────────────
+    def _persist_due(self):
+        if self.persist is not None:
+            self.persist.set()
+
+    def _submit_flip(self, symbol, ctx):
+        self.orders.put_nowait((symbol, ctx))
+
+    # ─────────────────────────────────────────────
+    # TASKS
+    # ─────────────────────────────────────────────
+    async def _market_task(self):
+        loop = asyncio.get_running_loop()
+        engines = list(self.engines.values())
+
+        while True:
+            if not in_news_blackout():
+                now = clock.now()
+                h1_due = {
+                    e.symbol: e.liquidity.last_bar_time
+                    for e in engines if e.liquidity.next_close_due(now)
+                }
+
+                snapshots = await loop.run_in_executor(
+                    self.mt5_executor, self.market_data.poll, h1_due
+                )
+                await self.snapshots.put((clock.now(), snapshots))
+
+            now = clock.now()
+            wakeup = self.scheduler.next_wakeup(now, engines)
+            await asyncio.sleep((wakeup - now).total_seconds())
+
+    async def _detector_task(self):
+        while True:
+            now, snapshots = await self.snapshots.get()
+
+            for symbol, engine in self.engines.items():
+                snapshot = snapshots.get(symbol)
+                if snapshot is None:
+                    continue
+
+                engine.poll(now, snapshot)
+
+    async def _order_task(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            symbol, ctx = await self.orders.get()
+            engine = self.engines[symbol]
+
+            reason = await loop.run_in_executor(
+                self.mt5_executor, engine.flip_executor.execute, ctx
+            )
+
+            if reason:
+                # Back on the loop, on THIS engine's bus
+                engine.bus.publish(LifecycleResolved(
+                    reason=reason,
+                    time=clock.utcnow()
+                ))
+
+    async def _persist_task(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await self.persist.wait()
+            self.persist.clear()
+
+            # Records queued while a flush runs are picked up by the next one
+            for journal in self.journals.values():
+                await loop.run_in_executor(self.io_executor, journal.flush)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+from core import clock
+from core.news_blackout import in_news_blackout, news_blackout_until
+from core.symbol_specs import get_spec
+from live.symbol_engine import SESSION_OPEN_UTC, STATUS_INTERVAL_SECONDS, is_trading_session
+
+
+# ─────────────────────────────────────────────
+# CADENCE
+# ─────────────────────────────────────────────
+CHECK_INTERVAL = 10         # tick cadence in session
+FAST_CHECK_INTERVAL = 1     # tick cadence with price near a level
+NEAR_LEVEL_PIPS = 5         # "near" = within this many of the symbol's pips
+
+M5_SECONDS = 300
+BAR_CLOSE_GRACE = 1         # let the broker open the next bar first
+
+
+def next_m5_close(now: datetime) -> datetime:
+    epoch = int(now.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % M5_SECONDS + M5_SECONDS, timezone.utc)
+
+
+def next_session_open(now: datetime) -> datetime:
+    open_today = datetime.combine(now.date(), SESSION_OPEN_UTC, tzinfo=timezone.utc)
+    return open_today if now < open_today else open_today + timedelta(days=1)
+
+
+class LiveScheduler:
+    """
+    Sleeps until the next instant the live loop has work to do:
+
+    - next M5 close (bar path, NY close)
+    - session open (sweeps resume)
+    - news blackout end
+    - engine status telemetry deadline
+    - tick cadence, in session only — fast when price is within
+      near_level_pips of an unmitigated level (in each symbol's own
+      pip size; a symbol without a spec never counts as near)
+    """
+
+    def __init__(
+        self,
+        check_interval: float = CHECK_INTERVAL,
+        fast_check_interval: float = FAST_CHECK_INTERVAL,
+        near_level_pips: float = NEAR_LEVEL_PIPS,
+    ):
+        self.check_interval = check_interval
+        self.fast_check_interval = fast_check_interval
+        self.near_level_pips = near_level_pips
+
+    def next_wakeup(self, now: datetime, engines) -> datetime:
+        if in_news_blackout():
+            end = news_blackout_until(now)
+            return end if end and end > now else now + timedelta(seconds=self.check_interval)
+
+        candidates = [next_m5_close(now) + timedelta(seconds=BAR_CLOSE_GRACE)]
+
+        for engine in engines:
+            if engine.last_status_log is not None:
+                candidates.append(
+                    engine.last_status_log + timedelta(seconds=STATUS_INTERVAL_SECONDS)
+                )
+
+        if is_trading_session(now):
+            near = any(self._near_level(engine) for engine in engines)
+            interval = self.fast_check_interval if near else self.check_interval
+            candidates.append(now + timedelta(seconds=interval))
+        else:
+            candidates.append(next_session_open(now))
+
+        return max(now, min(candidates))
+
+    def sleep(self, engines):
+        now = clock.now()
+        wakeup = self.next_wakeup(now, engines)
+
+        clock.sleep((wakeup - now).total_seconds())
+
+    def _near_level(self, engine) -> bool:
+        spec = get_spec(engine.symbol)
+        if spec is None:
+            return False
+
+        return engine.near_level(self.near_level_pips * spec.pip_size)
@@ -0,0 +1,426 @@
+import base64
+from datetime import datetime, timezone
+from datetime import time as dtime
+
+import numpy as np
+
+from core import clock
+from core.notifier import send
+from core.state_journal import StateJournal
+
+from core.h1_liquidity_builder import LiquidityLevel
+from core.h1_liquidity_tracker import H1LiquidityTracker
+from core.failure_detector import FailureDetector
+from core.cleanup_detector import CleanupDetector
+from core.origin_candle_locator import OriginLocator
+from core.entry_engine import EntryEngine
+from core.flip_executor import FlipContext, FlipExecutor
+
+from integration.structure_resolution_gate import StructureResolutionGate
+from core.event_bus import EventBus
+from core.event_log import get_logger
+from core.liquidity_event_state import (
+    CleanupConfirmed,
+    FailureConfirmed,
+    LifecycleResolved,
+    OriginConfirmed,
+    ProbeTriggered,
+)
+
+from live.bar_dispatcher import BarCloseDispatcher
+
+
+# ─────────────────────────────────────────────
+# SESSION CONSTANTS
+# ─────────────────────────────────────────────
+SESSION_OPEN_UTC = dtime(hour=7, minute=0)  # 07:00 UTC
+NY_CLOSE_UTC = dtime(hour=21, minute=0)  # 21:00 UTC
+
+# Same bounds in seconds of the UTC day — vectorized tick filter
+SESSION_OPEN_SECONDS = SESSION_OPEN_UTC.hour * 3600 + SESSION_OPEN_UTC.minute * 60
+NY_CLOSE_SECONDS = NY_CLOSE_UTC.hour * 3600 + NY_CLOSE_UTC.minute * 60
+
+STATUS_INTERVAL_SECONDS = 300  # 5 minutes
+
+log = get_logger("symbol_engine")
+
+# Sweep of downside stops = push DOWN, upside stops = push UP
+SWEEP_DIRECTION = {"SELL_SIDE": "SELL", "BUY_SIDE": "BUY"}
+
+# Components implementing snapshot() / restore() — journaled on change
+PIPELINE = (
+    "structure_gate",
+    "failure_detector",
+    "cleanup_detector",
+    "origin_locator",
+    "probe_engine",
+    "bar_close",
+)
+
+
+def is_trading_session(now_utc):
+    """
+    Only trade London + New York.
+    Asia is explicitly excluded.
+    """
+    return SESSION_OPEN_UTC <= now_utc.time() < NY_CLOSE_UTC
+
+
+class SymbolEngine:
+    """
+    The full event-driven pipeline for ONE symbol:
+    Sweep → Failure → Cleanup → Origin → Probe → Flip
+
+    Owns its liquidity, detectors, lifecycle lock, persisted state and
+    its own EventBus — several engines coexist in one process without
+    seeing each other's events.
+
+    Side effects go through hooks so a runtime can move them off the
+    detector path:
+      notify(message)                          — default core.notifier.send
+      journal                                  — default StateJournal(symbol)
+      submit_flip(ctx)                         — default FlipExecutor.run
+    """
+
+    def __init__(self, symbol: str, notify=None, journal=None, submit_flip=None):
+        self.symbol = symbol
+
+        self.liquidity = H1LiquidityTracker(symbol)
+        self.active_lifecycle = False
+        self.last_status_log = None
+        self.last_price = None
+
+        self.bus = EventBus()
+
+        self.failure_detector = FailureDetector(bus=self.bus)
+        self.cleanup_detector = CleanupDetector(bus=self.bus)
+        self.origin_locator = OriginLocator(bus=self.bus)
+        self.probe_engine = EntryEngine(bus=self.bus)
+        self.flip_executor = FlipExecutor(symbol, bus=self.bus)
+
+        self.notify = notify or send
+        self.journal = journal or StateJournal(symbol)
+        self.submit_flip = submit_flip or self.flip_executor.run
+
+        self.structure_gate = StructureResolutionGate(
+            failure_detector=self.failure_detector,
+            cleanup_detector=self.cleanup_detector
+        )
+
+        # Structure → Origin → Probe see each CLOSED M5 bar once
+        self.bar_close = BarCloseDispatcher([
+            self.structure_gate.on_candle,
+            self.origin_locator.on_candle_closed,
+            self.probe_engine.on_candle_closed,
+        ])
+
+        # Failure → Cleanup → Origin → Probe → Flip
+        self.bus.subscribe(FailureConfirmed, self.cleanup_detector.on_failure_confirmed)
+        self.bus.subscribe(CleanupConfirmed, self.origin_locator.on_cleanup_confirmed)
+        self.bus.subscribe(OriginConfirmed, self.probe_engine.on_origin_confirmed)
+        self.bus.subscribe(ProbeTriggered, self.on_probe_triggered)
+        self.bus.subscribe(LifecycleResolved, self.on_lifecycle_resolved)
+
+        self._journaled = {}  # component → last journaled snapshot
+
+    # ─────────────────────────────────────────────
+    # LIFECYCLE
+    # ─────────────────────────────────────────────
+    def start(self, market_data=None):
+        """
+        Load persisted state (same UTC day only) or build fresh liquidity.
+
+        A restore also brings back every pipeline component and, given a
+        MarketDataGateway, replays the M5 bars closed while we were down.
+        """
+        persisted = self.journal.load()
+
+        # Levels saved on a previous UTC day are stale — rebuild instead
+        if persisted and (
+            datetime.fromisoformat(persisted["saved_at"]).date()
+            != clock.now().date()
+        ):
+            persisted = None
+
+        if persisted:
+            self.notify(f"♻️ Restoring persisted state — {self.symbol}")
+
+            self.liquidity.seed(levels=_restore_levels(persisted["liquidity"]))
+            self.active_lifecycle = persisted["active_lifecycle"]
+
+            self._restore_pipeline(persisted.get("detectors", {}))
+            if market_data is not None:
+                self._catch_up(market_data)
+        else:
+            self.liquidity.seed()
+            self.active_lifecycle = False
+
+            self.journal.levels_loaded(self.liquidity.levels)
+            self.journal.lifecycle(False)
+
+    # ─────────────────────────────────────────────
+    # EVENT: Probe triggered → flip
+    # ─────────────────────────────────────────────
+    def on_probe_triggered(self, event: ProbeTriggered):
+        self.submit_flip(FlipContext.from_event(event))
+
+    # ─────────────────────────────────────────────
+    # EVENT: Lifecycle resolved (persistent)
+    # ─────────────────────────────────────────────
+    def on_lifecycle_resolved(self, event: LifecycleResolved):
+        self.active_lifecycle = False
+
+        self.journal.lifecycle(False)
+        self._journal_pipeline()
+
+        self.notify(
+            f"🔓 LIFECYCLE RESOLVED — {self.symbol}\n"
+            f"Reason: {event.reason}\n"
+            f"Time: {event.time}"
+        )
+
+    # ─────────────────────────────────────────────
+    # POLL
+    # ─────────────────────────────────────────────
+    def poll(self, now: datetime, snapshot):
+        """
+        snapshot: live.market_data.MarketSnapshot for this symbol.
+
+        Tick path (every poll): sweeps against every tick since the last poll.
+        Bar path (once per closed M5 bar): structure, origin, probe.
+        """
+        tick = snapshot.tick
+        self.last_price = tick.bid
+
+        # --------------------------------------------------
+        # NEW YORK CLOSE — FORCE LIFECYCLE RESOLUTION
+        # --------------------------------------------------
+        if self.active_lifecycle and now.time() >= NY_CLOSE_UTC:
+            self.bus.publish(LifecycleResolved(
+                reason="NY_SESSION_END",
+                time=now
+            ))
+
+            self.notify(
+                f"⏱️ NY SESSION CLOSED — {self.symbol}\n"
+                "Lifecycle auto-resolved\n"
+                "Engine unlocked for next London session"
+            )
+            return
+
+        # --------------------------------------------------
+        # H1 LIQUIDITY MAINTENANCE (INCREMENTAL)
+        # --------------------------------------------------
+        if snapshot.h1 is not None:
+            day = self.liquidity.today
+            changed = self.liquidity.ingest(snapshot.h1)
+
+            if self.liquidity.today != day:
+                self.journal.levels_loaded(self.liquidity.levels)
+            else:
+                for lvl in changed:
+                    self.journal.level_changed(lvl)
+
+        # --------------------------------------------------
+        # ENGINE STATUS TELEMETRY
+        # --------------------------------------------------
+        if (
+            self.last_status_log is None
+            or (now - self.last_status_log).total_seconds() >= STATUS_INTERVAL_SECONDS
+        ):
+            self.last_status_log = now
+            self._report_status(now, tick.bid)
+
+        # -----------------------------
+        # LIQUIDITY SWEEP (GLOBAL + SESSION + PERSISTENT)
+        # -----------------------------
+        if not self.active_lifecycle:
+            self._check_sweeps(snapshot.ticks)
+
+        # -----------------------------
+        # CLOSED BARS → STRUCTURE / ORIGIN / PROBE
+        # -----------------------------
+        self.bar_close.dispatch(snapshot.bars)
+
+        self._journal_pipeline()
+
+    def near_level(self, distance: float) -> bool:
+        """
+        True if the last seen price is within `distance` of the nearest
+        unmitigated level on either side (and a sweep could still fire).
+        """
+        if self.active_lifecycle or self.last_price is None:
+            return False
+
+        levels = self.liquidity.levels
+        price = self.last_price
+
+        above = levels.nearest_above("BUY_SIDE", price)
+        below = levels.nearest_below("SELL_SIDE", price)
+
+        return (
+            (above is not None and above.price - price <= distance)
+            or (below is not None and price - below.price <= distance)
+        )
+
+    # ─────────────────────────────────────────────
+    # PIPELINE SNAPSHOTS
+    # ─────────────────────────────────────────────
+    def _journal_pipeline(self):
+        for name in PIPELINE:
+            data = getattr(self, name).snapshot()
+
+            if data != self._journaled.get(name):
+                self._journaled[name] = data
+                self.journal.detector(name, base64.b64encode(data).decode("ascii"))
+
+    def _restore_pipeline(self, detectors: dict):
+        for name, encoded in detectors.items():
+            if name not in PIPELINE:
+                continue
+
+            data = base64.b64decode(encoded)
+            getattr(self, name).restore(data)
+            self._journaled[name] = data
+
+    def _catch_up(self, market_data):
+        last = self.bar_close.last_closed_time
+        if last is None:
+            return
+
+        since = datetime.fromtimestamp(
+            int(np.datetime64(last, "s").astype(np.int64)), timezone.utc
+        )
+
+        replayed = self.bar_close.dispatch(market_data.bars_since(self.symbol, since))
+        self._journal_pipeline()
+
+        if replayed:
+            self.notify(f"⏩ {self.symbol} replayed {replayed} missed M5 bars")
+
+    # ─────────────────────────────────────────────
+    # INTERNAL
+    # ─────────────────────────────────────────────
+    def _check_sweeps(self, ticks):
+        """
+        One min / max per batch against the price-indexed levels;
+        ticks are only scanned again to timestamp an actual sweep.
+
+        Per side the sweep is the crossed level nearest to price — the
+        first one crossed. Only the earliest sweep of the batch fires,
+        as tick by tick the lifecycle lock would block the later one.
+        """
+        seconds = (ticks["time_msc"] // 1000) % 86400
+        ticks = ticks[(seconds >= SESSION_OPEN_SECONDS) & (seconds < NY_CLOSE_SECONDS)]
+        if len(ticks) == 0:
+            return
+
+        levels = self.liquidity.levels
+        bids, asks = ticks["bid"], ticks["ask"]
+        sweeps = []
+
+        # SELL-SIDE liquidity (downside stops) — ascending, nearest is the highest
+        swept = levels.at_or_above("SELL_SIDE", float(bids.min()))
+
+        if swept:
+            lvl = swept[-1]
+            first = int(np.argmax(bids <= lvl.price))
+            sweeps.append((int(ticks["time_msc"][first]), "SELL_SIDE", lvl))
+
+        # BUY-SIDE liquidity (upside stops) — ascending, nearest is the lowest
+        swept = levels.at_or_below("BUY_SIDE", float(asks.max()))
+
+        if swept:
+            lvl = swept[0]
+            first = int(np.argmax(asks >= lvl.price))
+            sweeps.append((int(ticks["time_msc"][first]), "BUY_SIDE", lvl))
+
+        if not sweeps:
+            return
+
+        earliest = min(time_msc for time_msc, _, _ in sweeps)
+
+        for time_msc, side, lvl in sweeps:
+            if time_msc == earliest:
+                self._on_sweep(side, lvl, datetime.fromtimestamp(time_msc / 1000, timezone.utc))
+
+    def _on_sweep(self, side, lvl, sweep_time):
+        self.liquidity.mark_mitigated(lvl, sweep_time)
+        self.active_lifecycle = True
+
+        self.journal.level_changed(lvl)
+        self.journal.lifecycle(True)
+
+        log.info(
+            "liquidity_swept",
+            symbol=self.symbol,
+            side=side,
+            price=lvl.price,
+            day_tag=lvl.day_tag,
+            time=sweep_time,
+        )
+
+        self.failure_detector.on_liquidity_swept(
+            direction=SWEEP_DIRECTION[side],
+            time=sweep_time
+        )
+
+        self.notify(f"🌙 {self.symbol} {side.replace('_', '-')} liquidity swept @ {lvl.price}")
+
+    def _report_status(self, now, price):
+        session = "OUTSIDE"
+        if is_trading_session(now):
+            session = "LONDON/NY"
+
+        levels = self.liquidity.levels
+
+        # BUY_SIDE = upside stops, SELL_SIDE = downside stops
+        nearest_buy_side = levels.nearest_above("BUY_SIDE", price)
+        nearest_sell_side = levels.nearest_below("SELL_SIDE", price)
+
+        lines = [
+            f"📡 ENGINE STATUS — {self.symbol}",
+            "",
+            f"Lifecycle: {'ACTIVE' if self.active_lifecycle else 'IDLE'}",
+            f"Current Price: {price:.5f}",
+            f"Session: {session}",
+            "",
+        ]
+
+        if nearest_buy_side:
+            lines.append(
+                f"Nearest BUY-SIDE liquidity: {nearest_buy_side.price:.5f} ({nearest_buy_side.day_tag})"
+            )
+        else:
+            lines.append("Nearest BUY-SIDE liquidity: NONE")
+
+        if nearest_sell_side:
+            lines.append(
+                f"Nearest SELL-SIDE liquidity: {nearest_sell_side.price:.5f} ({nearest_sell_side.day_tag})"
+            )
+        else:
+            lines.append("Nearest SELL-SIDE liquidity: NONE")
+
+        self.notify("\n".join(lines))
+
+
+def _restore_levels(raw_liquidity):
+    levels = {"BUY_SIDE": [], "SELL_SIDE": []}
+
+    for side, raw_levels in raw_liquidity.items():
+        for raw in raw_levels:
+            levels[side].append(
+                LiquidityLevel(
+                    price=raw["price"],
+                    type=raw["type"],
+                    timestamp=datetime.fromisoformat(raw["timestamp"]),
+                    mitigated=raw["mitigated"],
+                    day_tag=raw["day_tag"],
+                    mitigated_at=(
+                        datetime.fromisoformat(raw["mitigated_at"])
+                        if raw.get("mitigated_at") else None
+                    ),
+                )
+            )
+
+    return levels
@@ -0,0 +1,66 @@
+import sys
+import os
+from datetime import datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pytest
+
+from core import broker, clock, symbol_specs
+from core.bar_store import RATES_DTYPE, TIMEFRAME_H1, TIMEFRAME_M5, BarStore
+from core.mt5_simulator import _resample as resample
+
+
+# Live-terminal script (places a real order), not a unit test
+collect_ignore = ["execution_smoke_test.py"]
+
+SYMBOL = "EURUSD"
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+M5_SECONDS = 300
+H1_SECONDS = 3600
+
+
+def random_rates(start: datetime, count: int, period: int, seed: int = 0, price: float = 1.1):
+    """
+    Random-walk bars (RATES_DTYPE), `period` seconds apart.
+    """
+    rng = np.random.default_rng(seed)
+
+    closes = price + np.cumsum(rng.normal(0, 0.0004, count))
+    opens = np.r_[price, closes[:-1]]
+    wicks = np.abs(rng.normal(0, 0.0003, (2, count)))
+
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates["time"] = int(start.timestamp()) + np.arange(count, dtype=np.int64) * period
+    rates["open"] = opens
+    rates["close"] = closes
+    rates["high"] = np.maximum(opens, closes) + wicks[0]
+    rates["low"] = np.minimum(opens, closes) - wicks[1]
+    rates["tick_volume"] = 1
+    return rates
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    BarStore with 14 days of SYMBOL M5 bars and the matching H1 bars.
+    """
+    m5 = random_rates(START, 14 * 288, M5_SECONDS, seed=3)
+
+    bars = BarStore(str(tmp_path / "bars"))
+    bars.write(SYMBOL, TIMEFRAME_M5, m5)
+    bars.write(SYMBOL, TIMEFRAME_H1, resample(m5, H1_SECONDS))
+    return bars
+
+
+@pytest.fixture(autouse=True)
+def reset_globals():
+    """
+    No test leaks its broker gateway, clock or cached specs.
+    """
+    yield
+    broker.set_gateway(None)
+    clock.set_clock(None)
+    symbol_specs.invalidate()
@@ -5,7 +5,7 @@ import time
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-import MetaTrader5 as mt5
+from core import broker as mt5
 
 from config.settings import SYMBOL
 from core.mt5_connector import connect
@@ -0,0 +1,84 @@
+import os
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from conftest import SYMBOL, START, M5_SECONDS, random_rates
+
+from core.bar_store import RATES_DTYPE, TIMEFRAME_M5, BarStore
+
+
+def test_one_file_per_field_per_month(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write(SYMBOL, TIMEFRAME_M5, random_rates(START, 40 * 288, M5_SECONDS))
+
+    month = tmp_path / SYMBOL / "M5" / "2025-01"
+
+    assert store.months(SYMBOL, TIMEFRAME_M5) == ["2025-01", "2025-02"]
+    assert sorted(os.listdir(month)) == sorted(f"{name}.npy" for name in RATES_DTYPE.names)
+    assert np.load(month / "close.npy").dtype == RATES_DTYPE["close"]
+
+
+def test_range_across_months_round_trips(tmp_path):
+    store = BarStore(str(tmp_path))
+    rates = random_rates(START, 40 * 288, M5_SECONDS)
+    store.write(SYMBOL, TIMEFRAME_M5, rates)
+
+    date_from = START + timedelta(days=29, hours=3)
+    date_to = START + timedelta(days=32)
+    inside = (rates["time"] >= date_from.timestamp()) & (rates["time"] <= date_to.timestamp())
+
+    out = store.copy_rates_range(SYMBOL, TIMEFRAME_M5, date_from, date_to)
+
+    assert out.dtype == RATES_DTYPE
+    np.testing.assert_array_equal(out, rates[inside])
+
+
+def test_copy_columns_reads_only_the_requested_fields(tmp_path):
+    store = BarStore(str(tmp_path))
+    rates = random_rates(START, 288, M5_SECONDS)
+    store.write(SYMBOL, TIMEFRAME_M5, rates)
+
+    columns = store.copy_columns(SYMBOL, TIMEFRAME_M5, START, START + timedelta(days=1), fields=["low", "high"])
+
+    assert list(columns) == ["time", "low", "high"]
+    np.testing.assert_array_equal(columns["high"], rates["high"])
+
+    with pytest.raises(ValueError):
+        store.copy_columns(SYMBOL, TIMEFRAME_M5, START, START, fields=["bid"])
+
+
+def test_newer_bars_win_on_merge(tmp_path):
+    store = BarStore(str(tmp_path))
+    rates = random_rates(START, 288, M5_SECONDS)
+    store.write(SYMBOL, TIMEFRAME_M5, rates)
+
+    patch = rates[10:12].copy()
+    patch["close"] = 2.0
+    store.write(SYMBOL, TIMEFRAME_M5, patch)
+
+    out = store.copy_rates_range(SYMBOL, TIMEFRAME_M5, START, START + timedelta(days=1))
+
+    assert len(out) == len(rates)
+    assert list(out["close"][10:12]) == [2.0, 2.0]
+    np.testing.assert_array_equal(out["close"][12:], rates["close"][12:])
+
+
+def test_single_file_months_are_read_and_converted(tmp_path):
+    store = BarStore(str(tmp_path))
+    rates = random_rates(START, 288, M5_SECONDS)
+
+    legacy = tmp_path / SYMBOL / "M5" / "2025-01.npy"
+    legacy.parent.mkdir(parents=True)
+    np.save(legacy, rates)
+
+    np.testing.assert_array_equal(
+        store.copy_rates_range(SYMBOL, TIMEFRAME_M5, START, START + timedelta(days=1)),
+        rates
+    )
+
+    store.write(SYMBOL, TIMEFRAME_M5, random_rates(START + timedelta(days=1), 288, M5_SECONDS))
+
+    assert not legacy.exists()
+    assert len(store.copy_rates_range(SYMBOL, TIMEFRAME_M5, START, START + timedelta(days=2))) == 2 * 288
@@ -0,0 +1,42 @@
+import sys
+import types
+
+import pytest
+
+from conftest import SYMBOL, START
+
+from core import broker
+from core.broker import BrokerGateway, MT5Gateway
+from core.mt5_simulator import MT5Simulator
+
+
+def test_incomplete_gateway_fails_at_construction():
+    class OnlyRates(BrokerGateway):
+        def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        OnlyRates()
+
+
+def test_mt5_gateway_forwards_to_the_terminal(monkeypatch):
+    terminal = types.SimpleNamespace(
+        symbol_info=lambda symbol: f"info:{symbol}",
+        positions_get=lambda **kwargs: kwargs,
+        terminal_info=lambda: "terminal",
+    )
+    monkeypatch.setitem(sys.modules, "MetaTrader5", terminal)
+
+    gateway = MT5Gateway()
+
+    assert isinstance(gateway, BrokerGateway)
+    assert gateway.symbol_info("EURUSD") == "info:EURUSD"
+    assert gateway.positions_get(ticket=7) == {"ticket": 7}
+    assert gateway.terminal_info() == "terminal"
+
+
+def test_module_calls_go_to_the_installed_gateway(store):
+    broker.set_gateway(MT5Simulator(store, [SYMBOL], START, START))
+
+    assert broker.symbol_info(SYMBOL).digits == 5
+    assert broker.TIMEFRAME_H1 == 16385
@@ -0,0 +1,61 @@
+import json
+from datetime import datetime, timezone
+
+from core import event_log
+from core.event_log import INFO, JsonLinesSink
+
+
+def _ts(day, hour):
+    return datetime(2025, 1, day, hour, tzinfo=timezone.utc).timestamp()
+
+
+def _events(path):
+    with open(path) as f:
+        return [json.loads(line)["event"] for line in f]
+
+
+def test_dated_path_rolls_on_the_utc_date(tmp_path):
+    sink = JsonLinesSink(str(tmp_path / "live_{date}.jsonl"))
+
+    for ts, event in ((_ts(1, 23), "a"), (_ts(2, 0), "b"), (_ts(2, 5), "c"), (_ts(3, 1), "d")):
+        sink._records.append((ts, INFO, "test", event, {}))
+    sink.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "live_20250101.jsonl", "live_20250102.jsonl", "live_20250103.jsonl"
+    ]
+    assert _events(tmp_path / "live_20250102.jsonl") == ["b", "c"]
+    assert sink.path == str(tmp_path / "live_20250103.jsonl")
+
+
+def test_plain_path_is_one_file(tmp_path):
+    path = tmp_path / "run.jsonl"
+
+    event_log.configure(path=str(path))
+    log = event_log.get_logger("test")
+    log.info("first")
+    log.debug("hidden")
+    event_log.flush()
+    event_log.shutdown()
+
+    assert _events(path) == ["first"]
+
+
+def test_configured_puts_the_callers_sink_back(tmp_path):
+    outer, inner = tmp_path / "outer.jsonl", tmp_path / "inner.jsonl"
+    log = event_log.get_logger("test")
+
+    event_log.configure(path=str(outer))
+    log.info("before")
+
+    with event_log.configured(path=str(inner)):
+        log.info("inside")
+
+    with event_log.configured(silent=True):
+        log.info("silenced")
+
+    log.info("after")
+    event_log.shutdown()
+
+    assert _events(inner) == ["inside"]
+    assert _events(outer) == ["before", "after"]
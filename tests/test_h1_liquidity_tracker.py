@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from conftest import SYMBOL, START, H1_SECONDS
+
+from core import broker, clock
+from core.clock import VirtualClock
+from core.h1_liquidity_builder import H1LiquidityBuilder
+from core.h1_liquidity_tracker import H1LiquidityTracker
+from core.mt5_simulator import MT5Simulator
+from core.persistence import level_payload
+from live.market_data import MarketDataGateway
+from live.symbol_engine import _restore_levels
+
+
+def _levels(book):
+    return {
+        side: sorted((lvl.price, lvl.day_tag, lvl.mitigated) for lvl in levels)
+        for side, levels in book.items()
+    }
+
+
+def _stream(tracker, store, since, until):
+    """
+    Feed every H1 bar closed in (since, until] one by one.
+    """
+    for bar in store.copy_rates_range(SYMBOL, broker.TIMEFRAME_H1, since, until):
+        if since.timestamp() <= bar["time"] and bar["time"] + H1_SECONDS <= until.timestamp():
+            tracker.on_h1_bar_closed(bar)
+
+
+def test_mid_day_seed_matches_a_tracker_running_since_midnight(store):
+    day = START + timedelta(days=8)
+    now = day + timedelta(hours=10, minutes=3)
+
+    clock.set_clock(VirtualClock(day))
+    reference = H1LiquidityTracker(SYMBOL, builder=H1LiquidityBuilder(SYMBOL, source=store))
+    reference.seed()
+    _stream(reference, store, day, now)
+
+    clock.set_clock(VirtualClock(now))
+    late = H1LiquidityTracker(SYMBOL, builder=H1LiquidityBuilder(SYMBOL, source=store))
+    late.seed()
+
+    # 00:00 is part of the window; 01:00 → 09:00 have closed since
+    assert len(late.day_bars) == 9
+    assert late.last_bar_time == reference.last_bar_time
+    assert _levels(late.levels) == _levels(reference.levels)
+
+
+def test_next_day_roll_after_mid_day_seed_matches_build(store):
+    day = START + timedelta(days=8)
+    now = day + timedelta(hours=10)
+
+    clock.set_clock(VirtualClock(now))
+    tracker = H1LiquidityTracker(SYMBOL, builder=H1LiquidityBuilder(SYMBOL, source=store))
+    tracker.seed()
+
+    next_day = day + timedelta(days=1)
+    _stream(tracker, store, now, next_day + timedelta(hours=1))
+
+    expected = H1LiquidityBuilder(SYMBOL, reference_date=next_day, source=store)
+
+    assert tracker.today == next_day.date()
+    assert len(tracker.window_rates) == len(expected.fetch_rates(next_day.date()))
+    assert _levels(tracker.levels) == _levels(expected.build())
+
+
+def test_poll_after_a_gap_returns_every_bar_closed_since(store):
+    start = START + timedelta(days=8)
+    simulator = MT5Simulator(store, [SYMBOL], start, start + timedelta(days=2))
+    broker.set_gateway(simulator)
+
+    now = start + timedelta(hours=7, minutes=30)
+    clock.set_clock(VirtualClock(now, on_advance=simulator.advance_to))
+    simulator.advance_to(now)
+
+    last_seen = int((start + timedelta(hours=1)).timestamp())
+    h1 = MarketDataGateway([SYMBOL]).poll({SYMBOL: last_seen})[SYMBOL].h1
+
+    # 02:00 → 06:00 closed; 07:00 is still forming
+    assert [int(t) for t in h1["time"]] == [
+        int((start + timedelta(hours=h)).timestamp()) for h in range(2, 7)
+    ]
+
+
+def test_restart_mitigates_persisted_levels_with_bars_closed_while_down(store):
+    day = START + timedelta(days=9)
+
+    clock.set_clock(VirtualClock(day + timedelta(hours=2)))
+    before = H1LiquidityTracker(SYMBOL, builder=H1LiquidityBuilder(SYMBOL, source=store))
+    before.seed()
+    persisted = {
+        side: [level_payload(lvl) for lvl in levels]
+        for side, levels in before.levels.items()
+    }
+
+    now = day + timedelta(hours=20)
+    clock.set_clock(VirtualClock(now))
+    fresh = H1LiquidityTracker(SYMBOL, builder=H1LiquidityBuilder(SYMBOL, source=store))
+    fresh.seed()
+
+    restored = H1LiquidityTracker(SYMBOL, builder=H1LiquidityBuilder(SYMBOL, source=store))
+    restored.seed(levels=_restore_levels(persisted))
+
+    # Something was crossed between the snapshot and the restart
+    assert _levels(before.levels) != _levels(fresh.levels)
+    assert _levels(restored.levels) == _levels(fresh.levels)
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from core.liquidity_clustering import cluster_levels
+
+
+TOLERANCE = 0.0005
+
+
+def _nested_loop(prices, tolerance):
+    """
+    The original clustering _cluster_first_fit replaced.
+    """
+    clusters = []
+
+    for p in prices:
+        found = False
+        for cluster in clusters:
+            if abs(cluster[0] - p) <= tolerance:
+                cluster.append(p)
+                found = True
+                break
+
+        if not found:
+            clusters.append([p])
+
+    return clusters
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_first_fit_matches_the_nested_loop(seed):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(1, 400))
+
+    # H1 highs / lows: a random walk, with every other sample snapped to
+    # a 1-pip grid so prices sit exactly on tolerance boundaries
+    prices = 1.1 + np.cumsum(rng.normal(0, 0.0006, count))
+    prices[::2] = np.round(prices[::2], 4)
+
+    expected = _nested_loop(prices.tolist(), TOLERANCE)
+    means, counts = cluster_levels(prices, TOLERANCE, first_fit=True)
+
+    assert counts.tolist() == [len(cluster) for cluster in expected]
+    assert means.tolist() == [sum(cluster) / len(cluster) for cluster in expected]
+
+
+def test_first_fit_on_empty_input():
+    means, counts = cluster_levels([], TOLERANCE, first_fit=True)
+
+    assert len(means) == 0 and len(counts) == 0
+
+
+# ─────────────────────────────────────────────
+# SORTED SWEEP (the builder's default)
+# ─────────────────────────────────────────────
+def _sorted_anchors(prices, tolerance):
+    """
+    Reference for the default mode: lowest unclustered price anchors
+    a cluster of everything within tolerance above it.
+    """
+    clusters = []
+
+    for p in sorted(prices):
+        if clusters and p - clusters[-1][0] <= tolerance:
+            clusters[-1].append(p)
+        else:
+            clusters.append([p])
+
+    return clusters
+
+
+def test_sorted_clusters_of_a_hand_built_array():
+    # Quarter steps are exact in binary: no rounding at the boundaries
+    means, counts = cluster_levels([3.0, 1.0, 1.5, 2.0, 1.25, 5.0, 5.0], 0.5)
+
+    assert means.tolist() == [1.25, 2.0, 3.0, 5.0]
+    assert counts.tolist() == [3, 1, 1, 2]
+
+
+def test_sorted_bands_do_not_chain():
+    # Each step is exactly one tolerance: 1.5 joins 1.0, but 2.0 is
+    # measured from the anchor 1.0, not from 1.5
+    means, counts = cluster_levels([1.0, 1.5, 2.0, 2.5, 3.0], 0.5)
+
+    assert means.tolist() == [1.25, 2.25, 3.0]
+    assert counts.tolist() == [2, 2, 1]
+
+
+def test_sorted_ignores_input_order():
+    prices = [1.0, 1.25, 1.5, 2.0, 3.0, 5.0, 5.0]
+    expected = cluster_levels(prices, 0.5)
+
+    for seed in range(5):
+        shuffled = np.random.default_rng(seed).permutation(prices)
+        means, counts = cluster_levels(shuffled, 0.5)
+
+        assert means.tolist() == expected[0].tolist()
+        assert counts.tolist() == expected[1].tolist()
+
+
+def test_sorted_duplicates_are_one_cluster():
+    means, counts = cluster_levels([1.1, 1.1, 1.1, 1.1], TOLERANCE)
+
+    assert counts.tolist() == [4]
+    assert means.tolist() == [pytest.approx(1.1)]
+
+
+def test_sorted_single_level():
+    means, counts = cluster_levels([1.2345], TOLERANCE)
+
+    assert means.tolist() == [1.2345]
+    assert counts.tolist() == [1]
+
+
+def test_sorted_on_empty_input():
+    means, counts = cluster_levels([], TOLERANCE)
+
+    assert len(means) == 0 and len(counts) == 0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sorted_matches_the_anchor_reference(seed):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(1, 400))
+
+    prices = 1.1 + np.cumsum(rng.normal(0, 0.0006, count))
+    prices[::2] = np.round(prices[::2], 4)
+
+    expected = _sorted_anchors(prices.tolist(), TOLERANCE)
+    means, counts = cluster_levels(prices, TOLERANCE)
+
+    assert counts.tolist() == [len(cluster) for cluster in expected]
+    assert means == pytest.approx([sum(cluster) / len(cluster) for cluster in expected], abs=1e-12)
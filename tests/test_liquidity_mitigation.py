@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from core.liquidity_mitigation import first_crossings
+
+
+H1 = 3600
+
+
+def _original_loop(times, extremes, start_times, prices, side):
+    """
+    The candles × levels loop first_crossings replaced, returning the
+    index of the bar that mitigated each level (-1 = never).
+    """
+    hits = [-1] * len(prices)
+
+    for i, (time, extreme) in enumerate(zip(times, extremes)):
+        for j, (start, price) in enumerate(zip(start_times, prices)):
+            if hits[j] < 0 and time > start:
+                if (extreme >= price) if side == "BUY_SIDE" else (extreme <= price):
+                    hits[j] = i
+
+    return hits
+
+
+@pytest.mark.parametrize("side", ["BUY_SIDE", "SELL_SIDE"])
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_the_original_loop(side, seed):
+    rng = np.random.default_rng(seed)
+    bars = int(rng.integers(1, 200))
+    count = int(rng.integers(1, 60))
+
+    # Ascending H1 times with weekend-like gaps
+    times = 1_735_689_600 + np.cumsum(rng.choice([H1, H1, H1, 49 * H1], bars))
+    extremes = np.round(1.1 + np.cumsum(rng.normal(0, 0.001, bars)), 4)
+
+    # Levels start on a bar, between bars, before the first and after
+    # the last; prices sit on bar extremes (ties) or beyond every bar
+    start_times = np.concatenate([
+        rng.choice(times, count),
+        rng.choice(times, count) + H1 // 2,
+        [times[0] - H1, times[-1], times[-1] + H1],
+    ])
+    prices = np.concatenate([
+        rng.choice(extremes, count),
+        np.round(rng.uniform(extremes.min() - 0.002, extremes.max() + 0.002, count), 4),
+        [extremes.max() + 0.01, extremes.min() - 0.01, extremes[-1]],
+    ])
+
+    hits = first_crossings(times, extremes, start_times, prices, side)
+
+    assert hits.tolist() == _original_loop(times.tolist(), extremes.tolist(), start_times.tolist(), prices.tolist(), side)
+
+
+@pytest.mark.parametrize("side", ["BUY_SIDE", "SELL_SIDE"])
+def test_levels_after_the_last_bar_are_never_crossed(side):
+    times = np.array([0, H1, 2 * H1])
+    extremes = np.array([1.1, 1.2, 1.0])
+
+    hits = first_crossings(times, extremes, [2 * H1, 5 * H1], [1.1, 1.1], side)
+
+    assert hits.tolist() == [-1, -1]
+
+
+def test_crossings_on_a_hand_built_series():
+    times = np.array([0, H1, 2 * H1, 3 * H1])
+    highs = np.array([1.1000, 1.1010, 1.1030, 1.1020])
+    lows = np.array([1.0990, 1.0980, 1.0995, 1.0970])
+
+    # The level's own bar never counts; ties cross
+    assert first_crossings(times, highs, [0, 0, H1, 0], [1.1010, 1.1030, 1.1020, 1.1040], "BUY_SIDE").tolist() == [1, 2, 2, -1]
+    assert first_crossings(times, lows, [0, 0, H1, 0], [1.0990, 1.0975, 1.0990, 1.0960], "SELL_SIDE").tolist() == [1, 3, 3, -1]
+
+
+def test_empty_inputs():
+    assert first_crossings([], [], [0], [1.1], "BUY_SIDE").tolist() == [-1]
+    assert first_crossings([0, H1], [1.1, 1.2], [], [], "SELL_SIDE").tolist() == []
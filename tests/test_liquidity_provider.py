@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from conftest import SYMBOL, START, M5_SECONDS, H1_SECONDS, random_rates, resample
+
+from core.bar_store import TIMEFRAME_H1, TIMEFRAME_M5, BarStore
+from core.h1_liquidity_builder import H1LiquidityBuilder
+from backtest.data_loader import load_data
+from backtest.liquidity_provider import PointInTimeLiquidity
+
+
+DAYS = 14
+
+
+def _levels(book):
+    return {
+        side: sorted((lvl.price, lvl.day_tag, lvl.mitigated) for lvl in levels)
+        for side, levels in book.items()
+    }
+
+
+@pytest.fixture(params=[(-0.00002, 0), (0.00002, 1), (0.00002, 2)], ids=["down", "up", "up-boundary"])
+def trending(request, tmp_path):
+    """
+    Drifting random walk — one side's levels survive the window's own
+    mitigation pass, so the comparison sees actual levels.
+    """
+    drift, seed = request.param
+
+    m5 = random_rates(START, DAYS * 288, M5_SECONDS, seed=seed)
+    for name in ("open", "high", "low", "close"):
+        m5[name] += drift * np.arange(len(m5))
+
+    store = BarStore(str(tmp_path / "bars"))
+    store.write(SYMBOL, TIMEFRAME_M5, m5)
+    store.write(SYMBOL, TIMEFRAME_H1, resample(m5, H1_SECONDS))
+    return store
+
+
+def test_matches_build_for_every_day(trending):
+    """
+    Walked bar by bar like run_backtest: at 00:00 the day's 00:00 bar
+    is still forming; from its close on, the levels are build()'s.
+    """
+    h1_df, _ = load_data(SYMBOL, START, START + timedelta(days=DAYS), source=trending)
+    builder = H1LiquidityBuilder(SYMBOL, source=trending)
+    liquidity = PointInTimeLiquidity(SYMBOL, h1_df, builder)
+
+    seen = 0
+
+    for offset in range(6, DAYS):
+        day = START + timedelta(days=offset)
+        start, end = builder.window(day.date())
+
+        closed = trending.copy_rates_range(SYMBOL, TIMEFRAME_H1, start, end - timedelta(seconds=1))
+        assert _levels(liquidity.at(day)) == _levels(builder.build_from_rates(closed, day.date()))
+
+        expected = _levels(H1LiquidityBuilder(SYMBOL, reference_date=day, source=trending).build())
+
+        for hours in (1, 12, 23):
+            book = liquidity.at(day + timedelta(hours=hours, minutes=55))
+
+            assert set(book.keys()) == {"BUY_SIDE", "SELL_SIDE"}
+            assert _levels(book) == expected, (day, hours)
+
+        seen += sum(map(len, expected.values()))
+
+    assert seen > 0
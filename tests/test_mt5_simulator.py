@@ -0,0 +1,215 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from conftest import SYMBOL, START, M5_SECONDS
+
+from core import broker as mt5
+from core.bar_store import RATES_DTYPE, TIMEFRAME_M5, BarStore
+from core.mt5_simulator import DEAL_ENTRY_IN, DEAL_ENTRY_OUT, MT5Simulator
+
+
+SPREAD = 0.0001     # DEFAULT_SPEC spread (10 points) on bars without one
+
+# time offset, open, high, low, close — ticks (bars_to_ticks) at +0, +75, +150, +225 s:
+#   0  bullish  1.1000 → 1.0990 → 1.1020 → 1.1010
+#   1  bearish  1.1010 → 1.1030 → 1.0980 → 1.0995
+#   2  bullish  1.0995 → 1.0970 → 1.1040 → 1.1005
+BARS = [
+    (0, 1.1000, 1.1020, 1.0990, 1.1010),
+    (1, 1.1010, 1.1030, 1.0980, 1.0995),
+    (2, 1.0995, 1.1040, 1.0970, 1.1005),
+]
+
+
+@pytest.fixture
+def sim(tmp_path):
+    rates = np.zeros(len(BARS), dtype=RATES_DTYPE)
+    for row, (i, open_, high, low, close) in zip(rates, BARS):
+        row["time"] = int(START.timestamp()) + i * M5_SECONDS
+        row["open"], row["high"], row["low"], row["close"] = open_, high, low, close
+        row["tick_volume"] = 4
+
+    store = BarStore(str(tmp_path / "bars"))
+    store.write(SYMBOL, TIMEFRAME_M5, rates)
+
+    simulator = MT5Simulator(store, [SYMBOL], START, START + timedelta(minutes=15))
+    simulator.advance_to(START + timedelta(seconds=10))
+    return simulator
+
+
+def _at(minutes=0, seconds=0):
+    return START + timedelta(minutes=minutes, seconds=seconds)
+
+
+def _market(sim, order_type, volume=0.1, sl=0.0, tp=0.0):
+    return sim.order_send({
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": SYMBOL,
+        "type": order_type,
+        "volume": volume,
+        "sl": sl,
+        "tp": tp,
+    })
+
+
+def test_market_buy_fills_at_the_ask(sim):
+    result = _market(sim, mt5.ORDER_TYPE_BUY)
+
+    assert result.retcode == mt5.TRADE_RETCODE_DONE
+    assert result.price == pytest.approx(1.1000 + SPREAD)
+
+    (position,) = sim.positions_get(symbol=SYMBOL)
+    assert position.ticket == result.order
+    assert position.type == mt5.POSITION_TYPE_BUY
+    assert position.price_open == pytest.approx(1.1000 + SPREAD)
+    assert position.price_current == pytest.approx(1.1000)
+
+    (deal,) = sim.deals
+    assert (deal.ticket, deal.entry, deal.position_id) == (result.deal, DEAL_ENTRY_IN, result.order)
+
+
+def test_closing_by_request_books_the_profit(sim):
+    opened = _market(sim, mt5.ORDER_TYPE_SELL)
+    sim.advance_to(_at(seconds=160))        # bid 1.1020
+
+    closed = sim.order_send({
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": SYMBOL,
+        "type": mt5.ORDER_TYPE_BUY,
+        "volume": 0.1,
+        "position": opened.order,
+    })
+
+    assert closed.retcode == mt5.TRADE_RETCODE_DONE
+    assert closed.price == pytest.approx(1.1020 + SPREAD)
+    assert sim.positions_get() == ()
+    assert sim.deals[-1].entry == DEAL_ENTRY_OUT
+    assert sim.balance == pytest.approx(100_000.0 - (0.0020 + SPREAD) / 0.00001 * 0.1)
+
+
+def test_buy_limit_fills_on_a_later_tick_at_its_price(sim):
+    placed = sim.order_send({
+        "action": mt5.TRADE_ACTION_PENDING,
+        "symbol": SYMBOL,
+        "type": mt5.ORDER_TYPE_BUY_LIMIT,
+        "price": 1.0985,
+        "volume": 0.1,
+    })
+    assert placed.retcode == mt5.TRADE_RETCODE_DONE
+
+    # Bar 0 never brings the ask down to 1.0985
+    sim.advance_to(_at(minutes=5))
+    assert sim.positions_get() == ()
+    assert [order.ticket for order in sim.orders_get()] == [placed.order]
+
+    # Bar 1's low (bid 1.0980) does
+    sim.advance_to(_at(minutes=10))
+    assert sim.orders_get() == ()
+
+    (position,) = sim.positions_get()
+    assert position.ticket == placed.order
+    assert position.price_open == pytest.approx(1.0985)
+    assert position.time_msc == int(_at(minutes=5, seconds=150).timestamp() * 1000)
+
+
+def test_sell_stop_fills_at_the_market_tick(sim):
+    sim.order_send({
+        "action": mt5.TRADE_ACTION_PENDING,
+        "symbol": SYMBOL,
+        "type": mt5.ORDER_TYPE_SELL_STOP,
+        "price": 1.0985,
+        "volume": 0.1,
+    })
+
+    sim.advance_to(_at(minutes=10))
+
+    # Stops fill at the tick that crossed them, not at their price
+    (position,) = sim.positions_get()
+    assert position.price_open == pytest.approx(1.0980)
+
+
+def test_pending_order_on_the_wrong_side_is_rejected(sim):
+    result = sim.order_send({
+        "action": mt5.TRADE_ACTION_PENDING,
+        "symbol": SYMBOL,
+        "type": mt5.ORDER_TYPE_BUY_LIMIT,
+        "price": 1.1050,
+        "volume": 0.1,
+    })
+
+    assert result.retcode == mt5.TRADE_RETCODE_INVALID_PRICE
+    assert sim.orders_get() == ()
+
+
+@pytest.mark.parametrize(
+    "opened, sl, tp, reason, price, closed",
+    [
+        # Bearish bar 1 reaches its high (TP) before its low (SL)
+        (_at(seconds=10), 1.0985, 1.1025, "TP", 1.1025, _at(minutes=5, seconds=75)),
+        # Bullish bar 2 reaches its low first: SL at the market tick, through the level
+        (_at(minutes=5, seconds=230), 1.0975, 1.1035, "SL", 1.0970, _at(minutes=10, seconds=75)),
+    ],
+    ids=["tp-first", "sl-first"],
+)
+def test_sl_and_tp_in_one_bar_resolve_in_tick_order(sim, opened, sl, tp, reason, price, closed):
+    sim.advance_to(opened)
+    assert _market(sim, mt5.ORDER_TYPE_BUY, sl=sl, tp=tp).retcode == mt5.TRADE_RETCODE_DONE
+
+    sim.advance_to(_at(minutes=15))
+
+    assert sim.positions_get() == ()
+    exit_deal = sim.deals[-1]
+    assert (exit_deal.entry, exit_deal.reason) == (DEAL_ENTRY_OUT, reason)
+    assert exit_deal.price == pytest.approx(price)
+    assert exit_deal.time_msc == int(closed.timestamp() * 1000)
+
+
+@pytest.mark.parametrize("volume", [0.0, 0.005, 0.015, 1000.0])
+def test_bad_volume_is_rejected(sim, volume):
+    market = _market(sim, mt5.ORDER_TYPE_BUY, volume=volume)
+    pending = sim.order_send({
+        "action": mt5.TRADE_ACTION_PENDING,
+        "symbol": SYMBOL,
+        "type": mt5.ORDER_TYPE_BUY_LIMIT,
+        "price": 1.0985,
+        "volume": volume,
+    })
+
+    assert market.retcode == pending.retcode == mt5.TRADE_RETCODE_INVALID_VOLUME
+    assert sim.positions_get() == () and sim.orders_get() == () and sim.deals == []
+
+
+def test_stops_on_the_wrong_side_are_rejected(sim):
+    result = _market(sim, mt5.ORDER_TYPE_BUY, sl=1.1010)
+
+    assert result.retcode == mt5.TRADE_RETCODE_INVALID_STOPS
+    assert sim.positions_get() == ()
+
+
+def test_copy_rates_from_pos_ends_with_the_forming_bar(sim):
+    # Bar 2 has printed 3 of its 4 ticks: open, low, high
+    sim.advance_to(_at(minutes=10, seconds=160))
+
+    bars = sim.copy_rates_from_pos(SYMBOL, TIMEFRAME_M5, 0, 3)
+
+    assert bars["time"].tolist() == [int(_at(minutes=m).timestamp()) for m in (0, 5, 10)]
+    assert bars["close"][:2].tolist() == [1.1010, 1.0995]
+
+    forming = bars[-1]
+    assert (forming["open"], forming["high"], forming["low"], forming["close"]) == (1.0995, 1.1040, 1.0970, 1.1040)
+    assert forming["tick_volume"] == 3
+
+    # start_pos=1 skips the forming bar
+    assert sim.copy_rates_from_pos(SYMBOL, TIMEFRAME_M5, 1, 2)["time"].tolist() == bars["time"][:2].tolist()
+
+
+def test_copy_rates_range_never_shows_the_future(sim):
+    sim.advance_to(_at(minutes=5, seconds=80))
+
+    bars = sim.copy_rates_range(SYMBOL, TIMEFRAME_M5, _at(), _at(minutes=15))
+
+    # Bar 1 so far: open and high only; bar 2 not at all
+    assert bars["time"].tolist() == [int(_at(minutes=m).timestamp()) for m in (0, 5)]
+    assert (bars[-1]["high"], bars[-1]["low"], bars[-1]["close"]) == (1.1030, 1.1010, 1.1030)
@@ -0,0 +1,193 @@
+import threading
+import time
+
+import pytest
+
+from core import notifier
+from core.notifier import MAX_MESSAGE_CHARS, SEPARATOR, TelegramNotifier
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.body = body or {}
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """
+    Rejects Markdown containing an unbalanced "_" like the Bot API does.
+    """
+
+    def __init__(self, errors=(), responses=(), gate=None):
+        self.posts = []
+        self.errors = list(errors)
+        self.responses = list(responses)    # served before the normal rules
+        self.gate = gate                    # threading.Event each post waits on
+
+    def post(self, url, json, timeout):
+        self.posts.append((json["text"], json.get("parse_mode")))
+
+        if self.gate is not None:
+            self.gate.wait(5)
+
+        if self.errors:
+            raise self.errors.pop(0)
+
+        if self.responses:
+            return self.responses.pop(0)
+
+        if json.get("parse_mode") and json["text"].count("_") % 2:
+            return FakeResponse(400, {"description": "Bad Request: can't parse entities"})
+        return FakeResponse(200)
+
+
+@pytest.fixture
+def telegram(monkeypatch):
+    monkeypatch.setattr(notifier, "COALESCE_SECONDS", 0.2)
+
+    bot = TelegramNotifier("token", "chat")
+    bot.session = FakeSession()
+    return bot
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Records (and skips) the worker's backoff sleeps; flush() still sleeps.
+    """
+    recorded = []
+    sleep = time.sleep
+
+    def fake_sleep(seconds):
+        if threading.current_thread().name == "telegram":
+            recorded.append(seconds)
+        else:
+            sleep(seconds)
+
+    monkeypatch.setattr(notifier.time, "sleep", fake_sleep)
+    return recorded
+
+
+def test_burst_is_coalesced_into_one_post(telegram):
+    for i in range(5):
+        telegram.enqueue(f"m{i}")
+    telegram.flush()
+
+    assert telegram.session.posts == [(SEPARATOR.join(f"m{i}" for i in range(5)), "Markdown")]
+    assert telegram.sent == 1
+
+
+def test_messages_after_the_window_go_in_a_new_post(telegram):
+    telegram.enqueue("first")
+    time.sleep(0.4)
+    telegram.enqueue("second")
+    telegram.flush()
+
+    assert [text for text, _ in telegram.session.posts] == ["first", "second"]
+
+
+def test_batches_split_before_the_message_limit(telegram):
+    chunk = "x" * 1500
+    for _ in range(5):
+        telegram.enqueue(chunk)
+    telegram.flush()
+
+    posts = [text for text, _ in telegram.session.posts]
+
+    # 2 chunks + separator fit in 4096, a 3rd does not
+    assert posts == [SEPARATOR.join([chunk] * 2)] * 2 + [chunk]
+    assert all(len(text) <= MAX_MESSAGE_CHARS for text in posts)
+
+
+def test_429_waits_telegrams_retry_after(telegram, sleeps):
+    telegram.session.responses = [FakeResponse(429, {"parameters": {"retry_after": 7}})]
+
+    telegram.enqueue("hello")
+    telegram.flush()
+
+    assert sleeps == [7]
+    assert [text for text, _ in telegram.session.posts] == ["hello", "hello"]
+    assert (telegram.sent, telegram.failed) == (1, 0)
+
+
+def test_5xx_backs_off_exponentially_then_gives_up(telegram, sleeps):
+    telegram.session.responses = [FakeResponse(502)] * notifier.MAX_RETRIES
+
+    telegram.enqueue("hello")
+    telegram.flush()
+
+    assert sleeps == [1.0, 2.0, 4.0]
+    assert len(telegram.session.posts) == notifier.MAX_RETRIES
+    assert (telegram.sent, telegram.failed) == (0, 1)
+
+
+def test_5xx_then_success_is_sent(telegram, sleeps):
+    telegram.session.responses = [FakeResponse(503), FakeResponse(500)]
+
+    telegram.enqueue("hello")
+    telegram.flush()
+
+    assert sleeps == [1.0, 2.0]
+    assert (telegram.sent, telegram.failed) == (1, 0)
+
+
+def test_overflow_is_dropped_and_counted(monkeypatch):
+    monkeypatch.setattr(notifier, "COALESCE_SECONDS", 0.0)
+    gate = threading.Event()
+
+    bot = TelegramNotifier("token", "chat", queue_size=2)
+    bot.session = FakeSession(gate=gate)
+
+    # The worker holds "first" in a blocked post; the queue then fills
+    bot.enqueue("first")
+    deadline = time.monotonic() + 5
+    while not bot.session.posts and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    for message in ("second", "third", "fourth"):
+        bot.enqueue(message)
+
+    gate.set()
+    bot.flush()
+
+    assert bot.dropped == 1
+    assert [text for text, _ in bot.session.posts] == ["first", "second", "third"]
+
+
+def test_rejected_batch_is_resent_one_by_one(telegram):
+    telegram.enqueue("*ok*")
+    telegram.enqueue("EUR_USD")
+    telegram.flush()
+
+    assert telegram.session.posts == [
+        ("*ok*" + SEPARATOR + "EUR_USD", "Markdown"),
+        ("*ok*", "Markdown"),
+        ("EUR_USD", "Markdown"),
+        ("EUR_USD", None),
+    ]
+    assert (telegram.sent, telegram.failed) == (2, 0)
+
+
+def test_single_rejected_message_falls_back_to_plain_text(telegram):
+    telegram.enqueue("GBP_JPY")
+    telegram.flush()
+
+    assert telegram.session.posts == [("GBP_JPY", "Markdown"), ("GBP_JPY", None)]
+    assert telegram.sent == 1
+
+
+def test_worker_survives_unexpected_errors(telegram):
+    telegram.session.errors = [RuntimeError("boom")]
+
+    telegram.enqueue("first")
+    telegram.flush()
+    telegram.enqueue("second")
+    telegram.flush()
+
+    assert telegram._thread.is_alive()
+    assert telegram.queue.unfinished_tasks == 0
+    assert (telegram.sent, telegram.failed) == (1, 1)
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from conftest import SYMBOL, START
+
+from core import clock
+from backtest.replay import ReplayRuntime
+
+
+DAY = START + timedelta(days=8)
+
+
+def _replay(store, skip_idle):
+    replay = ReplayRuntime(
+        [SYMBOL],
+        DAY + timedelta(hours=12, minutes=45),
+        DAY + timedelta(hours=18),
+        store=store,
+        skip_idle=skip_idle,
+    )
+
+    # Swept at 12:45 — random bars rarely run the whole chain on their own
+    engine = replay.engines[SYMBOL]
+    start = engine.start
+
+    def swept(market_data):
+        start(market_data)
+        engine.active_lifecycle = True
+        engine.failure_detector.on_liquidity_swept("SELL", clock.utcnow())
+
+    engine.start = swept
+    return replay, replay.run()
+
+
+def test_skipping_idle_wakeups_changes_nothing_but_the_poll_count(store):
+    skipped, fast = _replay(store, skip_idle=True)
+    every, slow = _replay(store, skip_idle=False)
+
+    # The flip filled and closed inside the window
+    assert fast["trades"] == 1
+
+    assert fast["deals"] == slow["deals"]
+    assert (fast["profit"], fast["balance"]) == (slow["profit"], slow["balance"])
+    assert skipped.notifications == every.notifications
+
+    assert fast["polls"] < slow["polls"]
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+
+from conftest import SYMBOL, START
+
+from core import broker, event_log
+from core.entry_engine import EntryEngine
+from core.h1_liquidity_builder import H1LiquidityBuilder
+from core.mt5_simulator import MT5Simulator
+from backtest.data_loader import load_data
+from backtest.run_backtest import run_backtest
+
+
+PIP = 0.0001
+
+
+@pytest.fixture
+def frames(store):
+    h1_df, m5_df = load_data(SYMBOL, START, START + timedelta(days=14), source=store)
+
+    # First 6 days are the H1 lookback only
+    m5_df = m5_df[m5_df["time"] >= START + timedelta(days=6)].reset_index(drop=True)
+    return h1_df, m5_df
+
+
+@pytest.fixture
+def open_levels(monkeypatch):
+    """
+    Every built level starts unmitigated — far more sweeps (and trades)
+    than build()'s own mitigation pass leaves on random data.
+    """
+    build = H1LiquidityBuilder.build_from_rates
+
+    def unmitigated(self, rates, today, include_mitigated=False):
+        levels = build(self, rates, today, include_mitigated=True)
+        for side in levels.values():
+            for lvl in side:
+                lvl.mitigated = False
+                lvl.mitigated_at = None
+        return levels
+
+    monkeypatch.setattr(H1LiquidityBuilder, "build_from_rates", unmitigated)
+
+
+def _trades(history):
+    return [tuple(vars(position).items()) for position in history]
+
+
+def test_columnar_loop_matches_iloc_loop(frames, open_levels):
+    h1_df, m5_df = frames
+
+    columnar = run_backtest(SYMBOL, m5_df, h1_df=h1_df, columnar=True, pip_size=PIP)
+    rows = run_backtest(SYMBOL, m5_df, h1_df=h1_df, columnar=False, pip_size=PIP)
+
+    assert len(columnar) > 0
+    assert _trades(columnar) == _trades(rows)
+
+
+def test_trades_follow_flip_prices(frames, open_levels):
+    h1_df, m5_df = frames
+
+    for trade in run_backtest(SYMBOL, m5_df, h1_df=h1_df, pip_size=PIP, rr_ratio=2.0):
+        risk = abs(trade.entry - trade.sl)
+
+        assert trade.result in ("TP", "SL")
+        assert trade.tp == pytest.approx(trade.entry + (2.0 * risk if trade.direction == "BUY" else -2.0 * risk))
+        assert trade.open_time <= trade.close_time
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_empty_frame_has_no_trades(frames, columnar):
+    h1_df, m5_df = frames
+
+    assert run_backtest(SYMBOL, m5_df.iloc[:0], pip_size=PIP, columnar=columnar) == []
+    assert run_backtest(SYMBOL, m5_df.iloc[:0], h1_df=h1_df, pip_size=PIP, columnar=columnar) == []
+
+
+def test_callers_event_log_survives_a_run(frames, tmp_path):
+    h1_df, m5_df = frames
+    path = tmp_path / "caller.jsonl"
+
+    event_log.configure(path=str(path))
+    run_backtest(SYMBOL, m5_df.iloc[:288], h1_df=h1_df, pip_size=PIP)
+    event_log.get_logger("caller").info("still logging")
+    event_log.shutdown()
+
+    assert "still logging" in path.read_text()
+
+
+def test_pip_size_comes_from_the_gateway_spec(frames, store):
+    h1_df, m5_df = frames
+    broker.set_gateway(MT5Simulator(store, [SYMBOL], START, START))
+
+    assert isinstance(run_backtest(SYMBOL, m5_df, h1_df=h1_df), list)
+
+
+def test_without_gateway_or_pip_size_it_says_so(frames, monkeypatch):
+    h1_df, m5_df = frames
+    monkeypatch.setattr("backtest.run_backtest.get_spec", lambda symbol: None)
+
+    with pytest.raises(RuntimeError, match="pip_size"):
+        run_backtest(SYMBOL, m5_df, h1_df=h1_df)
+
+
+def test_probe_timeout_is_a_parameter(frames, monkeypatch):
+    h1_df, m5_df = frames
+    engines = []
+
+    class Recording(EntryEngine):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            engines.append(self)
+
+    monkeypatch.setattr("backtest.run_backtest.EntryEngine", Recording)
+    run_backtest(SYMBOL, m5_df, h1_df=h1_df, pip_size=PIP, timeout_minutes=45)
+
+    assert [engine.timeout for engine in engines] == [timedelta(minutes=45)]
+
+
+def test_min_rr_filters_flips_without_room_to_opposing_liquidity(frames, open_levels):
+    h1_df, m5_df = frames
+
+    every = run_backtest(SYMBOL, m5_df, h1_df=h1_df, pip_size=PIP)
+    loose = run_backtest(SYMBOL, m5_df, h1_df=h1_df, pip_size=PIP, min_rr=0.0)
+    strict = run_backtest(SYMBOL, m5_df, h1_df=h1_df, pip_size=PIP, min_rr=1000.0)
+
+    assert len(every) > 0
+    assert len(loose) <= len(every)
+    assert strict == []
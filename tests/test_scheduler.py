@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.symbol_specs import SymbolSpec
+from live.scheduler import FAST_CHECK_INTERVAL, CHECK_INTERVAL, LiveScheduler
+
+
+NOW = datetime(2025, 1, 6, 10, 2, 30, tzinfo=timezone.utc)   # in session, no bar close within 10 s
+
+SPECS = {
+    "EURUSD": SymbolSpec("EURUSD", 5, 0.00001, 0.00001, 1.0, 100000, 0.01, 100, 0.01, "USD"),
+    "USDJPY": SymbolSpec("USDJPY", 3, 0.001, 0.001, 0.7, 100000, 0.01, 100, 0.01, "USD"),
+    "XAUUSD": SymbolSpec("XAUUSD", 2, 0.01, 0.01, 1.0, 100, 0.01, 100, 0.01, "USD"),
+}
+
+
+class Engine:
+    """
+    Price `gap` away from the nearest unmitigated level.
+    """
+
+    def __init__(self, symbol, gap):
+        self.symbol = symbol
+        self.gap = gap
+        self.last_status_log = None
+
+    def near_level(self, distance):
+        return self.gap <= distance
+
+
+@pytest.fixture(autouse=True)
+def specs(monkeypatch):
+    monkeypatch.setattr("live.scheduler.get_spec", SPECS.get)
+    monkeypatch.setattr("live.scheduler.in_news_blackout", lambda: False)
+
+
+def _interval(*engines):
+    return (LiveScheduler().next_wakeup(NOW, engines) - NOW).total_seconds()
+
+
+@pytest.mark.parametrize("symbol, near, far", [
+    ("EURUSD", 0.0004, 0.0006),
+    ("USDJPY", 0.04, 0.06),
+    ("XAUUSD", 0.04, 0.06),
+])
+def test_near_level_distance_is_in_the_symbols_pips(symbol, near, far):
+    assert _interval(Engine(symbol, near)) == FAST_CHECK_INTERVAL
+    assert _interval(Engine(symbol, far)) == CHECK_INTERVAL
+
+
+def test_one_engine_near_a_level_speeds_up_the_loop():
+    assert _interval(Engine("EURUSD", 0.01), Engine("USDJPY", 0.03)) == FAST_CHECK_INTERVAL
+
+
+def test_symbol_without_a_spec_is_never_near():
+    assert _interval(Engine("UNKNOWN", 0.0)) == CHECK_INTERVAL
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from conftest import SYMBOL, START
+
+from core import broker, clock
+from core.cleanup_detector import CleanupDetector
+from core.clock import VirtualClock
+from core.entry_engine import EntryEngine
+from core.failure_detector import FailureDetector
+from core.liquidity_event_state import CleanupConfirmed, FailureConfirmed, OriginConfirmed
+from core.mt5_simulator import MT5Simulator
+from core.origin_candle_locator import OriginLocator
+from core.snapshot_codec import pack_time, unpack_time
+from core.state_journal import StateJournal
+from integration.structure_resolution_gate import StructureResolutionGate
+from live.bar_dispatcher import BarCloseDispatcher
+from live.market_data import MarketDataGateway
+from live.symbol_engine import PIPELINE, SymbolEngine
+
+
+AWARE = datetime(2025, 1, 9, 10, 15, 0, 123456, tzinfo=timezone.utc)
+NAIVE = AWARE.replace(tzinfo=None)
+DATETIME64 = np.datetime64("2025-01-09T10:15:00", "s")
+
+
+def _components():
+    failure, cleanup = FailureDetector(), CleanupDetector()
+    return {
+        "failure_detector": failure,
+        "cleanup_detector": cleanup,
+        "origin_locator": OriginLocator(),
+        "probe_engine": EntryEngine(),
+        "structure_gate": StructureResolutionGate(failure, cleanup),
+        "bar_close": BarCloseDispatcher(),
+    }
+
+
+def _round_trip(component):
+    copy = _components()[_name(component)]
+    copy.restore(component.snapshot())
+    return copy
+
+
+def _name(component):
+    return next(name for name, c in _components().items() if type(c) is type(component))
+
+
+@pytest.mark.parametrize("value", [None, AWARE, NAIVE, DATETIME64], ids=["none", "aware", "naive", "datetime64"])
+def test_times_round_trip_with_their_type(value):
+    restored = unpack_time(*pack_time(value))
+
+    assert type(restored) is type(value)
+    assert restored == value
+    if isinstance(value, datetime):
+        assert restored.tzinfo == value.tzinfo
+
+
+def test_datetime64_keeps_its_instant_across_units():
+    restored = unpack_time(*pack_time(np.datetime64("2025-01-09T10:15:00.250", "ms")))
+
+    assert restored == np.datetime64("2025-01-09T10:15:00.250", "ms")
+
+
+@pytest.mark.parametrize("name", list(_components()))
+def test_empty_context_round_trips(name):
+    component = _components()[name]
+    restored = _round_trip(component)
+
+    assert restored.snapshot() == component.snapshot()
+    assert vars(restored).get("context", None) is None
+    assert getattr(restored, "attempt", None) is None
+
+
+@pytest.mark.parametrize("time", [AWARE, NAIVE, DATETIME64], ids=["aware", "naive", "datetime64"])
+def test_armed_components_round_trip(time):
+    failure = FailureDetector()
+    failure.on_liquidity_swept("SELL", time)
+
+    cleanup = CleanupDetector()
+    cleanup.on_failure_confirmed(FailureConfirmed(direction="BUY", sweep_time=time, failure_time=time))
+
+    origin = OriginLocator()
+    origin.on_cleanup_confirmed(CleanupConfirmed(failure_direction="SELL", failure_time=time, cleanup_time=time))
+
+    clock.set_clock(VirtualClock(AWARE))
+    probe = EntryEngine()
+    probe.on_origin_confirmed(OriginConfirmed(
+        direction="BUY",
+        candle={"time": time, "open": 1.1000, "high": 1.1010, "low": 1.0990, "close": 1.1005},
+        cleanup_time=time,
+    ))
+
+    gate = StructureResolutionGate(failure, cleanup)
+    gate.last_high, gate.last_low = 1.1010, 1.0990
+
+    bar_close = BarCloseDispatcher()
+    bar_close.last_closed_time = time
+
+    for component in (failure, cleanup, origin, probe, gate, bar_close):
+        restored = _round_trip(component)
+        assert restored.snapshot() == component.snapshot()
+
+    assert _round_trip(failure).attempt == failure.attempt
+    assert _round_trip(failure).last_sweep_time == time
+    assert (_round_trip(cleanup).failure_direction, _round_trip(cleanup).failure_time) == ("BUY", time)
+    assert _round_trip(origin).context == origin.context
+    assert _round_trip(probe).context == probe.context
+    assert (_round_trip(gate).last_high, _round_trip(gate).last_low) == (1.1010, 1.0990)
+    assert _round_trip(bar_close).last_closed_time == time
+
+
+def test_same_day_restart_restores_the_pipeline_and_replays_missed_bars(store, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    day = START + timedelta(days=8)
+    simulator = MT5Simulator(store, [SYMBOL], day, day + timedelta(days=1))
+    broker.set_gateway(simulator)
+    virtual = VirtualClock(day + timedelta(hours=12, minutes=45), on_advance=simulator.advance_to)
+    clock.set_clock(virtual)
+    simulator.advance_to(virtual.now())
+
+    def run(engine, market_data, until):
+        # One poll just after every M5 close
+        while virtual.now() < until:
+            epoch = int(virtual.now().timestamp())
+            virtual.advance_to(datetime.fromtimestamp(epoch - epoch % 300 + 301, timezone.utc))
+            engine.poll(virtual.now(), market_data.poll()[SYMBOL])
+
+    def engine(flips):
+        return SymbolEngine(
+            SYMBOL,
+            notify=messages.append,
+            journal=StateJournal(SYMBOL),
+            submit_flip=flips.append,
+        )
+
+    messages, reference_flips, restarted_flips = [], [], []
+
+    # Swept at 12:45; the lifecycle lock keeps ticks from sweeping again
+    reference = engine(reference_flips)
+    market_data = MarketDataGateway([SYMBOL])
+    reference.start(market_data)
+
+    reference.active_lifecycle = True
+    reference.journal.lifecycle(True)
+    reference.failure_detector.on_liquidity_swept("SELL", virtual.now())
+    run(reference, market_data, day + timedelta(hours=12, minutes=55))
+
+    # Down from 12:55: the journal stops, the reference keeps running
+    reference.journal.close()
+    reference.journal = StateJournal("REFERENCE")
+    run(reference, market_data, day + timedelta(hours=13, minutes=40))
+
+    messages.clear()
+    restarted = engine(restarted_flips)
+    restarted.start(MarketDataGateway([SYMBOL]))
+
+    assert restarted.active_lifecycle and reference.active_lifecycle
+    assert restarted.bar_close.last_closed_time == np.datetime64(day.replace(tzinfo=None) + timedelta(hours=13, minutes=35))
+    assert "⏩ EURUSD replayed 9 missed M5 bars" in messages
+
+    # The lifecycle went through failure → cleanup → origin → probe while down
+    assert len(reference_flips) == 1
+    assert restarted_flips == reference_flips
+
+    for name in PIPELINE:
+        assert getattr(restarted, name).snapshot() == getattr(reference, name).snapshot(), name
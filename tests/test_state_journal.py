@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from core import persistence
+from core.h1_liquidity_builder import LiquidityLevel
+from core.persistence import level_payload, state_file
+from core.state_journal import StateJournal, journal_file
+
+
+SYMBOL = "EURUSD"
+DAY = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def _level(price, side="BUY_SIDE"):
+    return LiquidityLevel(price=price, type=side, timestamp=DAY, day_tag="D-1")
+
+
+def _records():
+    with open(journal_file(SYMBOL)) as f:
+        return [json.loads(line) for line in f]
+
+
+def _write_legacy(liquidity, active_lifecycle):
+    """
+    A state file from before the journal: no seq, no detectors.
+    """
+    os.makedirs("state", exist_ok=True)
+    with open(state_file(SYMBOL), "w") as f:
+        json.dump({
+            "active_lifecycle": active_lifecycle,
+            "liquidity": {side: [level_payload(lvl) for lvl in levels] for side, levels in liquidity.items()},
+            "saved_at": DAY.isoformat(),
+        }, f)
+
+
+def _snapshot():
+    with open(state_file(SYMBOL)) as f:
+        return json.load(f)
+
+
+def test_load_replays_the_snapshot_and_newer_records():
+    journal = StateJournal(SYMBOL, compact_every=3)
+    level = _level(1.1050)
+
+    journal.levels_loaded({"BUY_SIDE": [level], "SELL_SIDE": [_level(1.0950, "SELL_SIDE")]})
+    journal.lifecycle(True)
+    journal.detector("failure_detector", "AAA=")         # seq 3 → snapshot
+
+    level.mitigated = True
+    journal.level_changed(level)
+    journal.lifecycle(False)
+    journal.close()
+
+    assert _snapshot()["seq"] == 3
+    assert [record["seq"] for record in _records()] == [4, 5]
+
+    state = StateJournal(SYMBOL).load()
+
+    assert state["active_lifecycle"] is False
+    assert state["detectors"] == {"failure_detector": "AAA="}
+    assert [lvl["mitigated"] for lvl in state["liquidity"]["BUY_SIDE"]] == [True]
+    assert len(state["liquidity"]["SELL_SIDE"]) == 1
+
+
+def test_records_the_snapshot_already_covers_are_skipped():
+    journal = StateJournal(SYMBOL, compact_every=1000)
+    journal.lifecycle(True)
+    journal.lifecycle(False)
+    journal.close()
+
+    # Snapshot written (seq 2) but the journal was never truncated
+    _write_legacy({"BUY_SIDE": [], "SELL_SIDE": []}, False)
+    snapshot = _snapshot()
+    snapshot["seq"] = 2
+    with open(state_file(SYMBOL), "w") as f:
+        json.dump(snapshot, f)
+
+    with open(journal_file(SYMBOL), "a") as f:
+        f.write(json.dumps({"seq": 3, "op": "lifecycle", "active": True, "at": DAY.isoformat()}) + "\n")
+
+    loaded = StateJournal(SYMBOL)
+    state = loaded.load()
+
+    assert state["active_lifecycle"] is True
+    assert loaded.seq == 3
+
+
+def test_torn_last_line_is_ignored():
+    journal = StateJournal(SYMBOL, compact_every=1000)
+    journal.lifecycle(True)
+    journal.detector("origin_locator", "BBB=")
+    journal.close()
+
+    # Crash mid-write of a third record
+    with open(journal_file(SYMBOL), "a") as f:
+        f.write('{"seq": 3, "op": "lifecycle", "act')
+
+    loaded = StateJournal(SYMBOL)
+    state = loaded.load()
+
+    assert state["active_lifecycle"] is True
+    assert state["detectors"] == {"origin_locator": "BBB="}
+    assert loaded.seq == 2
+
+    # load() compacted: the torn tail is gone, numbering carries on
+    loaded.lifecycle(False)
+    loaded.close()
+    assert [record["seq"] for record in _records()] == [3]
+
+
+def test_compaction_writes_the_snapshot_before_truncating(monkeypatch):
+    steps = []
+
+    replace = os.replace
+    monkeypatch.setattr(persistence.os, "replace", lambda src, dst: (steps.append(("replace", dst)), replace(src, dst)))
+
+    truncate = StateJournal._truncate
+
+    def recording_truncate(self):
+        # The snapshot must already be in place when the journal empties
+        steps.append(("truncate", _snapshot()["seq"]))
+        truncate(self)
+
+    monkeypatch.setattr(StateJournal, "_truncate", recording_truncate)
+
+    journal = StateJournal(SYMBOL, compact_every=2)
+    journal.lifecycle(True)
+    journal.lifecycle(False)
+    journal.close()
+
+    assert steps == [("replace", state_file(SYMBOL)), ("truncate", 2)]
+
+
+def test_crash_between_snapshot_and_truncate_loads_the_same_state(monkeypatch):
+    def crash(self):
+        raise OSError("killed")
+
+    journal = StateJournal(SYMBOL, compact_every=2)
+    journal.lifecycle(True)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(StateJournal, "_truncate", crash)
+
+        with pytest.raises(OSError):
+            journal.detector("entry_engine", "CCC=")
+
+    # Snapshot (seq 2) and the untruncated journal (seq 1, 2) overlap
+    assert _snapshot()["seq"] == 2
+    assert [record["seq"] for record in _records()] == [1, 2]
+
+    state = StateJournal(SYMBOL).load()
+    assert state["active_lifecycle"] is True
+    assert state["detectors"] == {"entry_engine": "CCC="}
+
+
+def test_legacy_state_file_loads_as_sequence_zero():
+    _write_legacy({"BUY_SIDE": [_level(1.1050)], "SELL_SIDE": []}, True)
+
+    journal = StateJournal(SYMBOL)
+    state = journal.load()
+
+    assert journal.seq == 0
+    assert state["active_lifecycle"] is True
+    assert [lvl["price"] for lvl in state["liquidity"]["BUY_SIDE"]] == [1.1050]
+
+    journal.lifecycle(False)
+    journal.close()
+
+    assert [record["seq"] for record in _records()] == [1]
+    assert StateJournal(SYMBOL).load()["active_lifecycle"] is False
+
+
+def test_flush_fsyncs_the_journal(monkeypatch):
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr("core.state_journal.os.fsync", lambda fd: (synced.append(fd), fsync(fd)))
+
+    journal = StateJournal(SYMBOL, write_through=False)
+    journal.lifecycle(True)
+    journal.detector("failure_detector", "AAA=")
+    assert synced == []
+
+    journal.flush()
+    assert len(synced) == 1
+
+    # Nothing pending → no disk work at all
+    journal.flush()
+    assert len(synced) == 1
+    journal.close()
+
+
+def test_flush_on_another_thread_while_recording():
+    pending = threading.Event()
+    stop = threading.Event()
+
+    journal = StateJournal(SYMBOL, compact_every=7, write_through=False, on_pending=pending.set)
+
+    def io_thread():
+        while not stop.is_set():
+            if pending.wait(0.01):
+                pending.clear()
+                journal.flush()
+
+    worker = threading.Thread(target=io_thread)
+    worker.start()
+
+    for i in range(500):
+        journal.detector("failure_detector", str(i))
+        journal.lifecycle(i % 2 == 0)
+
+    stop.set()
+    worker.join()
+    journal.close()
+
+    loaded = StateJournal(SYMBOL)
+    state = loaded.load()
+
+    assert loaded.seq == 1000
+    assert state["detectors"] == {"failure_detector": "499"}
+    assert state["active_lifecycle"] is False
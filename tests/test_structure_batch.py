@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import START, M5_SECONDS, random_rates
+
+from core.bar_store import RATES_DTYPE
+from core.break_tracker import BreakTracker
+from core.failure_tracker import Failure
+from backtest.liquidity_provider import PointInTimeLiquidity
+from backtest.run_backtest import BacktestEngine
+from backtest.virtual_executor import VirtualExecutor
+from integration.structure_resolution_gate import StructureResolutionGate
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def on_structure_break(self, direction, time):
+        self.calls.append((direction, time))
+
+
+def _frame(count, seed):
+    rates = random_rates(START, count, M5_SECONDS, seed=seed)
+    return pd.DataFrame({
+        "time": pd.to_datetime(rates["time"], unit="s", utc=True),
+        **{name: rates[name] for name in ("open", "high", "low", "close")},
+    })
+
+
+def _gate():
+    return StructureResolutionGate(failure_detector=Recorder(), cleanup_detector=Recorder())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_gate_batch_matches_streaming(seed):
+    df = _frame(500, seed)
+
+    streaming = _gate()
+    for i in range(len(df)):
+        streaming.on_candle(df.iloc[i])
+
+    # Chunked, so the gate state carries across batches
+    batch = _gate()
+    for lo in range(0, len(df), 137):
+        batch.on_candles(df.iloc[lo:lo + 137])
+
+    assert len(streaming.failure_detector.calls) > 0
+    assert batch.failure_detector.calls == streaming.failure_detector.calls
+    assert batch.cleanup_detector.calls == streaming.cleanup_detector.calls
+    assert batch.snapshot() == streaming.snapshot()
+
+
+def test_backtest_engine_dispatches_the_same_breaks(monkeypatch):
+    df = _frame(300, 1)
+
+    def record(engine):
+        calls = []
+        monkeypatch.setattr(engine.structure_gate, "emit", lambda direction, time: calls.append((direction, time)))
+        return calls
+
+    streaming = BacktestEngine(PointInTimeLiquidity("EURUSD", np.empty(0, dtype=RATES_DTYPE)), VirtualExecutor(), 0.0001)
+    precomputed = BacktestEngine(PointInTimeLiquidity("EURUSD", np.empty(0, dtype=RATES_DTYPE)), VirtualExecutor(), 0.0001)
+    expected, got = record(streaming), record(precomputed)
+
+    precomputed.precompute_structure(df["high"].to_numpy(), df["low"].to_numpy())
+
+    for i in range(len(df)):
+        candle = df.iloc[i]
+        streaming.structure_gate.on_candle(candle)
+        precomputed._dispatch_breaks(i, candle["time"])
+
+    assert len(expected) > 0
+    assert got == expected
+
+
+def _events(events):
+    return [(e.break_number, e.level, e.candle_index, e.candle_time) for e in events]
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("direction", ["BUY", "SELL"])
+def test_break_tracker_batch_matches_streaming(seed, direction):
+    df = _frame(400, seed)
+
+    # Defensive levels just beyond the first close, the older one further out
+    sign = 1 if direction == "BUY" else -1
+    first = float(df["close"].iloc[0])
+    failures = [
+        Failure(defensive_level=first + sign * 0.0030, time=START, direction=direction),
+        Failure(defensive_level=first + sign * 0.0010, time=START, direction=direction),
+    ]
+
+    streaming = BreakTracker()
+    streaming.arm(failures)
+    expected = []
+    for i in range(1, len(df)):
+        event = streaming.update(df.iloc[: i + 1])
+        if event is not None:
+            expected.append(event)
+
+    batch = BreakTracker()
+    batch.arm(failures)
+
+    assert _events(batch.update_batch(df)) == _events(expected)
+    assert (batch.break_count, batch.active) == (streaming.break_count, streaming.active)
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+
+from conftest import SYMBOL, START
+
+from core import broker
+from core.mt5_simulator import MT5Simulator
+from backtest.data_loader import load_data
+from backtest.metrics import summarize
+from backtest.run_backtest import run_backtest
+from backtest.sweep import expand_grid, run_sweep
+
+
+GRID = {"rr_ratio": [2.0, 3.0], "min_touches": [2, 3]}
+
+
+def test_grid_keys_must_be_tunables():
+    assert len(expand_grid(GRID)) == 4
+    assert len(expand_grid({"min_rr": [3, 5], "timeout_minutes": [60, 120, 240]})) == 6
+
+    for key in ("log_path", "columnar", "source", "pip_size", "no_such_option"):
+        with pytest.raises(ValueError, match=key):
+            expand_grid({key: [None]})
+
+
+def test_workers_match_a_serial_run(store):
+    h1_df, m5_df = load_data(SYMBOL, START, START + timedelta(days=14), source=store)
+    m5_df = m5_df[m5_df["time"] >= START + timedelta(days=6)].reset_index(drop=True)
+
+    results = run_sweep(SYMBOL, m5_df, h1_df, GRID, workers=2, store=store)
+
+    broker.set_gateway(MT5Simulator(store, [SYMBOL], START, START))
+    for row in results.to_dict("records"):
+        params = {key: row[key] for key in GRID}
+        history = run_backtest(SYMBOL, m5_df, h1_df=h1_df, source=store, **params)
+
+        assert row == {**params, **summarize([trade.result for trade in history])}
+
+    assert len(results) == 4
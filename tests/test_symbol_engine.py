@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.bar_store import RATES_DTYPE
+from core.h1_liquidity_builder import LiquidityLevel
+from core.liquidity_book import LiquidityBook
+from core.mt5_simulator import TICK_DTYPE, bars_to_ticks
+from live.symbol_engine import SymbolEngine
+from backtest.liquidity_provider import PointInTimeLiquidity
+from backtest.run_backtest import BacktestEngine
+from backtest.virtual_executor import VirtualExecutor
+
+
+DAY = datetime(2025, 1, 6, tzinfo=timezone.utc)
+SPREAD = 0.00010
+
+
+class FakeJournal:
+    def level_changed(self, level):
+        pass
+
+    def lifecycle(self, active):
+        pass
+
+
+def _engine(buy_side=(), sell_side=()):
+    engine = SymbolEngine("EURUSD", notify=lambda message: None, journal=FakeJournal())
+    engine.liquidity.levels = LiquidityBook({
+        "BUY_SIDE": [LiquidityLevel(price=p, type="BUY_SIDE", timestamp=DAY) for p in buy_side],
+        "SELL_SIDE": [LiquidityLevel(price=p, type="SELL_SIDE", timestamp=DAY) for p in sell_side],
+    })
+
+    engine.swept = []
+    engine.failure_detector.on_liquidity_swept = (
+        lambda direction, time: engine.swept.append((direction, time))
+    )
+    return engine
+
+
+def _ticks(bids, start=DAY + timedelta(hours=10)):
+    ticks = np.zeros(len(bids), dtype=TICK_DTYPE)
+    ticks["time_msc"] = int(start.timestamp() * 1000) + np.arange(len(bids)) * 1000
+    ticks["time"] = ticks["time_msc"] // 1000
+    ticks["bid"] = bids
+    ticks["ask"] = np.asarray(bids) + SPREAD
+    return ticks
+
+
+def test_sell_side_sweep_takes_the_first_level_crossed():
+    engine = _engine(sell_side=[1.0950, 1.0970, 1.0990])
+
+    engine._check_sweeps(_ticks([1.1000, 1.0985, 1.0960, 1.0940]))
+
+    assert [lvl.price for lvl in engine.liquidity.levels["SELL_SIDE"] if lvl.mitigated] == [1.0990]
+    assert engine.swept == [("SELL", DAY + timedelta(hours=10, seconds=1))]
+
+
+def test_buy_side_sweep_takes_the_first_level_crossed():
+    engine = _engine(buy_side=[1.1010, 1.1030, 1.1050])
+
+    # The ask gaps through 1.1010 and 1.1030 on the same tick
+    engine._check_sweeps(_ticks([1.1000, 1.1005, 1.1040, 1.1060]))
+
+    assert [lvl.price for lvl in engine.liquidity.levels["BUY_SIDE"] if lvl.mitigated] == [1.1010]
+    assert engine.swept == [("BUY", DAY + timedelta(hours=10, seconds=2))]
+
+
+def test_only_the_earliest_sweep_of_a_batch_fires():
+    engine = _engine(buy_side=[1.1010], sell_side=[1.0990])
+
+    engine._check_sweeps(_ticks([1.1000, 1.0985, 1.1000, 1.1015]))
+
+    assert engine.swept == [("SELL", DAY + timedelta(hours=10, seconds=1))]
+    assert not engine.liquidity.levels["BUY_SIDE"][0].mitigated
+    assert engine.active_lifecycle
+
+
+def test_no_sweep_outside_the_session():
+    engine = _engine(sell_side=[1.0990])
+
+    engine._check_sweeps(_ticks([1.1000, 1.0980], start=DAY + timedelta(hours=22)))
+
+    assert engine.swept == []
+
+
+@pytest.mark.parametrize("bar", [
+    (1.1000, 1.1005, 1.0940, 1.1002),   # bullish: low first, through every SELL_SIDE level
+    (1.1000, 1.1060, 1.0995, 1.0998),   # bearish: high first, through every BUY_SIDE level
+    (1.1000, 1.1060, 1.0940, 1.1001),   # both sides crossed, the low is reached first
+    (1.1000, 1.1060, 1.0940, 1.0999),   # both sides crossed, the high is reached first
+], ids=["sell-side", "buy-side", "both-low-first", "both-high-first"])
+def test_backtest_sweep_leaves_the_same_book_as_live(bar):
+    buy_side, sell_side = [1.1010, 1.1030, 1.1050], [1.0950, 1.0970, 1.0990]
+
+    rates = np.zeros(1, dtype=RATES_DTYPE)
+    rates["time"] = int((DAY + timedelta(hours=10)).timestamp())
+    rates["open"], rates["high"], rates["low"], rates["close"] = bar
+
+    live = _engine(buy_side=buy_side, sell_side=sell_side)
+    live._check_sweeps(bars_to_ticks(rates, 300, {"spread": 0, "point": 0.00001}))
+
+    backtest = BacktestEngine(PointInTimeLiquidity("EURUSD", rates[:0]), VirtualExecutor(), 0.0001)
+    backtest.failure_detector.on_liquidity_swept = lambda direction, time: None
+    levels = _engine(buy_side=buy_side, sell_side=sell_side).liquidity.levels
+    candle = {"time": DAY + timedelta(hours=10), **dict(zip(("open", "high", "low", "close"), bar))}
+    backtest._check_sweeps(levels, candle)
+
+    def mitigated(book):
+        return {side: [lvl.price for lvl in side_levels if lvl.mitigated] for side, side_levels in book.items()}
+
+    assert sum(map(len, mitigated(levels).values())) == 1
+    assert mitigated(levels) == mitigated(live.liquidity.levels)
+    assert backtest.active_lifecycle and live.active_lifecycle
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+import pytest
+
+from conftest import SYMBOL, START
+
+from core import broker, clock, symbol_specs
+from core.clock import VirtualClock
+from core.flip_origin_candle_locator import FlipOriginCandle
+from core.h1_liquidity_builder import LiquidityLevel
+from core.mt5_simulator import MT5Simulator
+from core.risk_manager import RiskManager
+from core.symbol_specs import SymbolSpec, get_spec, lot_size
+from integration.flip_entry_adapter import FlipEntryAdapter
+
+
+JPY = {"digits": 3, "point": 0.001, "trade_tick_size": 0.001, "trade_tick_value": 0.67}
+
+
+def _spec(**overrides):
+    fields = dict(
+        symbol=SYMBOL, digits=5, point=0.00001, tick_size=0.00001, tick_value=1.0,
+        contract_size=100_000.0, volume_min=0.01, volume_max=100.0, volume_step=0.01,
+        currency="USD",
+    )
+    return SymbolSpec(**{**fields, **overrides})
+
+
+class CountingSimulator(MT5Simulator):
+    calls = 0
+
+    def symbol_info(self, symbol):
+        self.calls += 1
+        return super().symbol_info(symbol)
+
+
+# ─────────────────────────────────────────────
+# LOT CALCULATOR
+# ─────────────────────────────────────────────
+@pytest.mark.parametrize("risk, stop, expected", [
+    (3000, 0.0020, 15.0),        # 20 pips, $10 / pip / lot
+    (1000, 0.0030, 3.33),        # rounded DOWN to the step, never above the risk
+    (1, 0.0100, 0.01),           # clamped to volume_min
+    (10_000_000, 0.0010, 100.0), # clamped to volume_max
+    (3000, 0.0, 0.0),            # no stop, no trade
+])
+def test_lot_size(risk, stop, expected):
+    assert lot_size(_spec(), risk, stop) == expected
+
+
+def test_lot_size_follows_the_volume_step():
+    assert lot_size(_spec(volume_step=0.25, volume_min=0.25), 1000, 0.0030) == 3.25
+    assert lot_size(_spec(volume_step=1.0, volume_min=1.0), 1000, 0.0030) == 3.0
+
+
+@pytest.mark.parametrize("digits, point, pip", [(5, 0.00001, 0.0001), (3, 0.001, 0.01), (2, 0.01, 0.01)])
+def test_pip_size(digits, point, pip):
+    assert _spec(digits=digits, point=point).pip_size == pytest.approx(pip)
+
+
+# ─────────────────────────────────────────────
+# CACHE
+# ─────────────────────────────────────────────
+def test_spec_is_fetched_once_per_ttl(store):
+    simulator = CountingSimulator(store, [SYMBOL], START, START)
+    broker.set_gateway(simulator)
+    virtual = VirtualClock(START)
+    clock.set_clock(virtual)
+
+    assert get_spec(SYMBOL) is get_spec(SYMBOL)
+    assert simulator.calls == 1
+
+    virtual.advance_to(START + timedelta(seconds=symbol_specs.TTL_SECONDS))
+    get_spec(SYMBOL)
+
+    assert simulator.calls == 2
+
+
+def test_new_gateway_drops_the_cache(store):
+    broker.set_gateway(MT5Simulator(store, [SYMBOL], START, START))
+    assert get_spec(SYMBOL).digits == 5
+
+    broker.set_gateway(MT5Simulator(store, [SYMBOL], START, START, specs={SYMBOL: JPY}))
+    assert get_spec(SYMBOL).digits == 3
+
+    broker.set_gateway(MT5Simulator(store, ["USDJPY"], START, START))
+    assert get_spec(SYMBOL) is None
+
+
+# ─────────────────────────────────────────────
+# FLIP ENTRY ADAPTER
+# ─────────────────────────────────────────────
+class FakeExecutor:
+    def __init__(self):
+        self.orders = []
+
+    def place_limit(self, direction, lot, entry, sl, tp, is_flip=False):
+        self.orders.append((direction, lot, entry, sl, tp))
+        return len(self.orders)
+
+
+def test_flip_sl_buffer_uses_the_symbol_pip(store):
+    broker.set_gateway(MT5Simulator(store, ["USDJPY"], START, START, specs={"USDJPY": JPY}))
+
+    executor = FakeExecutor()
+    adapter = FlipEntryAdapter(executor, RiskManager("USDJPY"), notifier=lambda message: None)
+    origin = FlipOriginCandle(index=5, time=START, open=150.10, high=150.30, low=150.00, close=150.20)
+    liquidity = {
+        "BUY_SIDE": [LiquidityLevel(price=151.00, type="BUY_SIDE", timestamp=START)],
+        "SELL_SIDE": [],
+    }
+
+    assert adapter.execute("BUY", origin, liquidity) == 1
+
+    direction, lot, entry, sl, tp = executor.orders[0]
+    assert (entry, tp) == (150.10, 151.00)
+    assert sl == pytest.approx(149.98)  # 2 pips of 0.01, not 0.0002
+    assert lot > 0
+
+
+def test_flip_sl_buffer_is_tunable(store):
+    broker.set_gateway(MT5Simulator(store, ["USDJPY"], START, START, specs={"USDJPY": JPY}))
+
+    executor = FakeExecutor()
+    adapter = FlipEntryAdapter(executor, RiskManager("USDJPY"), notifier=lambda message: None, sl_buffer_pips=5)
+    origin = FlipOriginCandle(index=5, time=START, open=150.10, high=150.30, low=150.00, close=150.20)
+    liquidity = {
+        "BUY_SIDE": [LiquidityLevel(price=151.00, type="BUY_SIDE", timestamp=START)],
+        "SELL_SIDE": [],
+    }
+
+    assert adapter.execute("BUY", origin, liquidity) == 1
+    assert executor.orders[0][3] == pytest.approx(149.95)
+
+
+def test_flip_without_symbol_spec_is_cancelled(store):
+    broker.set_gateway(MT5Simulator(store, [SYMBOL], START, START))
+    messages = []
+
+    adapter = FlipEntryAdapter(FakeExecutor(), RiskManager("USDJPY"), notifier=messages.append)
+    origin = FlipOriginCandle(index=5, time=START, open=150.10, high=150.30, low=150.00, close=150.20)
+
+    assert adapter.execute("BUY", origin, {"BUY_SIDE": [], "SELL_SIDE": []}) is None
+    assert adapter.used
+    assert "no symbol spec" in messages[0]
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.h1_liquidity_builder import LiquidityLevel
+from core.liquidity_book import LiquidityBook
+from execution.target_resolver import TargetResolver
+
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _level(price, side, mitigated=False):
+    return LiquidityLevel(price=price, type=side, timestamp=T0, mitigated=mitigated)
+
+
+def _book():
+    return LiquidityBook({
+        "BUY_SIDE": [_level(1.1100, "BUY_SIDE"), _level(1.1050, "BUY_SIDE", mitigated=True)],
+        "SELL_SIDE": [_level(1.0900, "SELL_SIDE"), _level(1.0950, "SELL_SIDE", mitigated=True)],
+    })
+
+
+def test_targets_nearest_level_beyond_entry_mitigated_included():
+    resolver = TargetResolver(min_rr=2.0)
+
+    assert resolver.resolve("SELL", 1.1000, 1.1010, _book()) == 1.0950
+    assert resolver.resolve("BUY", 1.1000, 1.0990, _book()) == 1.1050
+
+
+def test_rejects_targets_below_min_rr():
+    assert TargetResolver(min_rr=10.0).resolve("SELL", 1.1000, 1.1010, _book()) is None
+
+
+def test_plain_map_is_wrapped():
+    book = {side: list(levels) for side, levels in _book().items()}
+
+    assert TargetResolver(min_rr=2.0).resolve("BUY", 1.1000, 1.0990, book) == 1.1050
+
+
+def test_unknown_side_keys_raise():
+    legacy = {"BUY": [_level(1.09, "BUY")], "SELL": [_level(1.11, "SELL")]}
+
+    with pytest.raises(KeyError):
+        TargetResolver().resolve("SELL", 1.1000, 1.1010, legacy)
+
+    with pytest.raises(ValueError):
+        TargetResolver().resolve("LONG", 1.1000, 1.0990, _book())
+
+
+def test_book_keeps_mitigated_levels_queryable():
+    book = _book()
+    level = _level(1.1020, "BUY_SIDE")
+    book.add("BUY_SIDE", level)
+    book.mark_mitigated("BUY_SIDE", level, T0)
+
+    assert book.nearest_above("BUY_SIDE", 1.1000).price == 1.1100
+    assert book.nearest_above("BUY_SIDE", 1.1000, include_mitigated=True) is level
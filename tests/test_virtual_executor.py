@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SYMBOL, START
+
+from core.bar_store import RATES_DTYPE, TIMEFRAME_M1, BarStore
+from core.mt5_simulator import TICK_DTYPE
+from backtest.virtual_executor import VirtualExecutor
+
+
+T0 = pd.Timestamp(START)
+BAR = pd.Timedelta(minutes=5)
+
+
+def _candle(i, open_, high, low, close):
+    return {"time": T0 + i * BAR, "open": open_, "high": high, "low": low, "close": close}
+
+
+def _m1(bar, rows):
+    """
+    Five M1 bars (open, high, low, close) inside M5 bar `bar`.
+    """
+    rates = np.zeros(len(rows), dtype=RATES_DTYPE)
+    rates["time"] = int((T0 + bar * BAR).timestamp()) + 60 * np.arange(len(rows))
+    for name, column in zip(("open", "high", "low", "close"), np.array(rows).T):
+        rates[name] = column
+    return rates
+
+
+@pytest.fixture
+def m1_store(tmp_path):
+    return BarStore(str(tmp_path / "bars"))
+
+
+# SELL 1.1000, SL 1.1020, TP 1.0960 — bar 1 touches both exits
+AMBIGUOUS = _candle(1, 1.1000, 1.1025, 1.0955, 1.1000)
+
+
+def _short(executor):
+    executor.place_market("SELL", 1.1000, 1.1020, 1.0960, T0)
+    return executor
+
+
+def test_without_intrabar_data_sl_wins():
+    executor = _short(VirtualExecutor(SYMBOL))
+
+    assert executor.on_candle(AMBIGUOUS) == "SL"
+    assert executor.intrabar_bars == 0
+
+
+def test_m1_path_decides_sl_vs_tp(m1_store):
+    # Drops to the TP in the 2nd minute, spikes to the SL in the 4th
+    m1_store.write(SYMBOL, TIMEFRAME_M1, _m1(1, [
+        (1.1000, 1.1005, 1.0990, 1.0995),
+        (1.0995, 1.0998, 1.0955, 1.0970),
+        (1.0970, 1.0990, 1.0965, 1.0985),
+        (1.0985, 1.1025, 1.0980, 1.1010),
+        (1.1010, 1.1012, 1.0995, 1.1000),
+    ]))
+    executor = _short(VirtualExecutor(SYMBOL, intrabar_source=m1_store))
+
+    assert executor.on_candle(AMBIGUOUS) == "TP"
+    assert executor.intrabar_bars == 1
+    assert executor.history[0].close_time == (T0 + BAR + pd.Timedelta(minutes=1, seconds=30)).to_pydatetime()
+
+
+def test_ticks_take_precedence_over_m1(m1_store):
+    start = int((T0 + BAR).timestamp() * 1000)
+
+    ticks = np.zeros(3, dtype=TICK_DTYPE)
+    ticks["time_msc"] = [start + 1_000, start + 2_000, start + 3_000]
+    ticks["bid"] = [1.1010, 1.1021, 1.0950]
+
+    executor = _short(VirtualExecutor(SYMBOL, intrabar_source=m1_store, ticks=ticks))
+
+    assert executor.on_candle(AMBIGUOUS) == "SL"
+    assert executor.history[0].close_time == (T0 + BAR + pd.Timedelta(seconds=2)).to_pydatetime()
+
+
+def test_fast_path_skips_intrabar_lookup(m1_store):
+    executor = _short(VirtualExecutor(SYMBOL, intrabar_source=m1_store))
+
+    assert executor.on_candle(_candle(1, 1.1000, 1.1010, 1.0950, 1.0960)) == "TP"
+    assert executor.intrabar_bars == 0
+
+
+def test_limit_never_fills_on_the_bar_it_was_placed():
+    executor = VirtualExecutor(SYMBOL)
+    executor.place_limit("BUY", 1.0990, 1.0970, 1.1050, T0)
+
+    assert executor.on_candle(_candle(0, 1.1000, 1.1000, 1.0980, 1.0985)) is None
+    assert executor.position.fill_time is None
+
+    executor.on_candle(_candle(1, 1.0985, 1.0995, 1.0985, 1.0990))
+
+    assert executor.position.fill_time == T0 + BAR
+    assert executor.position.fill_price == 1.0985  # gapped below the limit
+
+
+def test_fill_then_tp_on_one_bar(m1_store):
+    # Fills at 1.0990 in the 1st minute, TP 1.1010 in the 3rd
+    m1_store.write(SYMBOL, TIMEFRAME_M1, _m1(1, [
+        (1.1000, 1.1002, 1.0988, 1.0992),
+        (1.0992, 1.1000, 1.0991, 1.0998),
+        (1.0998, 1.1012, 1.0997, 1.1008),
+        (1.1008, 1.1009, 1.1001, 1.1004),
+        (1.1004, 1.1006, 1.1000, 1.1003),
+    ]))
+    bar = _candle(1, 1.1000, 1.1012, 1.0988, 1.1003)
+
+    with_path = VirtualExecutor(SYMBOL, intrabar_source=m1_store)
+    with_path.place_limit("BUY", 1.0990, 1.0980, 1.1010, T0)
+
+    assert with_path.on_candle(bar) == "TP"
+
+    # Without a path the TP may have traded before the fill: still open
+    without = VirtualExecutor(SYMBOL)
+    without.place_limit("BUY", 1.0990, 1.0980, 1.1010, T0)
+
+    assert without.on_candle(bar) is None
+    assert without.positions and without.position.fill_time == bar["time"]